@@ -0,0 +1,145 @@
+import java.io.BufferedInputStream;
+import java.io.BufferedOutputStream;
+import java.io.ByteArrayInputStream;
+import java.io.ByteArrayOutputStream;
+import java.io.DataInputStream;
+import java.io.DataOutputStream;
+import java.io.EOFException;
+import java.io.FileDescriptor;
+import java.io.FileInputStream;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.PrintStream;
+import java.lang.management.ManagementFactory;
+import java.lang.management.ThreadMXBean;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.net.URL;
+import java.net.URLClassLoader;
+import java.nio.file.Paths;
+
+/*
+ * 1 つの JVM で、解答の main() を入力ごとに実行する（java_runner.py の JvmServer が起動する）
+ *
+ *   java -cp <このクラス> JvmHarness <解答の class_dir> <abc439.A>
+ *
+ * 入力ごとに新しい URLClassLoader で解答を読み込むので、static 変数は毎回初期化される。
+ * System.in / System.out / System.err は JUnit のテストと同じように差し替える
+ *
+ * 要求（標準入力）: int 入力のバイト数, 入力
+ * 応答（標準出力）: int status, long wall_ns, long cpu_ns,
+ *                   int stdout のバイト数, int stderr のバイト数, stdout, stderr
+ *   status: 0 = 正常終了, 1 = 例外, 2 = System.exit()（終了コードはプロセスの終了コード）
+ * 数値はビッグエンディアン（DataInputStream / DataOutputStream）
+ */
+public class JvmHarness {
+
+    static final int OK = 0;
+    static final int EXCEPTION = 1;
+    static final int EXIT = 2;
+
+    // AtCoder と同じくらいの main スレッドのスタック
+    static final long STACK_SIZE = 512L * 1024 * 1024;
+
+    static DataOutputStream response;
+
+    // System.exit() されたときに shutdown hook から応答するための、実行中のケース
+    static volatile ByteArrayOutputStream currentOut;
+    static volatile ByteArrayOutputStream currentErr;
+    static volatile long currentStarted;
+
+    public static void main(String[] args) throws Exception {
+        URL[] classPath = { Paths.get(args[0]).toUri().toURL() };
+        String mainClass = args[1];
+
+        DataInputStream request = new DataInputStream(
+            new BufferedInputStream(new FileInputStream(FileDescriptor.in)));
+        response = new DataOutputStream(
+            new BufferedOutputStream(new FileOutputStream(FileDescriptor.out)));
+        PrintStream originalErr = System.err;
+
+        Runtime.getRuntime().addShutdownHook(new Thread(() -> {
+            if (currentOut != null) {
+                System.out.flush();
+                System.err.flush();
+                respond(EXIT, System.nanoTime() - currentStarted, 0,
+                        currentOut, currentErr);
+            }
+        }));
+
+        ThreadMXBean threads = ManagementFactory.getThreadMXBean();
+        while (true) {
+            int length;
+            try {
+                length = request.readInt();
+            } catch (EOFException e) {
+                break;
+            }
+            byte[] input = new byte[length];
+            request.readFully(input);
+
+            ByteArrayOutputStream out = new ByteArrayOutputStream();
+            ByteArrayOutputStream err = new ByteArrayOutputStream();
+            PrintStream outStream = new PrintStream(out, false);
+            PrintStream errStream = new PrintStream(err, true);
+            InputStream inStream = new ByteArrayInputStream(input);
+
+            int[] status = { OK };
+            long[] cpu = { 0 };
+            try (URLClassLoader loader = new URLClassLoader(
+                    classPath, JvmHarness.class.getClassLoader())) {
+                Runnable task = () -> {
+                    try {
+                        Method method = Class.forName(mainClass, true, loader)
+                            .getMethod("main", String[].class);
+                        method.invoke(null, (Object) new String[0]);
+                    } catch (InvocationTargetException e) {
+                        status[0] = EXCEPTION;
+                        errStream.print("Exception in thread \"main\" ");
+                        e.getCause().printStackTrace(errStream);
+                    } catch (Throwable e) {
+                        status[0] = EXCEPTION;
+                        e.printStackTrace(errStream);
+                    } finally {
+                        cpu[0] = threads.getCurrentThreadCpuTime();
+                    }
+                };
+
+                System.setIn(inStream);
+                System.setOut(outStream);
+                System.setErr(errStream);
+                currentOut = out;
+                currentErr = err;
+                currentStarted = System.nanoTime();
+
+                Thread thread = new Thread(null, task, "main", STACK_SIZE);
+                thread.start();
+                thread.join();
+                long wall = System.nanoTime() - currentStarted;
+
+                outStream.flush();
+                currentOut = null;
+                System.setErr(originalErr);
+                respond(status[0], wall, cpu[0], out, err);
+            }
+        }
+    }
+
+    static synchronized void respond(int status, long wall, long cpu,
+                                     ByteArrayOutputStream out,
+                                     ByteArrayOutputStream err) {
+        try {
+            response.writeInt(status);
+            response.writeLong(wall);
+            response.writeLong(cpu);
+            response.writeInt(out.size());
+            response.writeInt(err.size());
+            out.writeTo(response);
+            err.writeTo(response);
+            response.flush();
+        } catch (IOException e) {
+            // python 側が先に終了した
+        }
+    }
+}
@@ -0,0 +1,315 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+cplib/ の実装と、よくある書き方（オブジェクトのリスト・再帰・タプルのヒープ）を比べる
+
+    python bench_cplib.py                              # N = Q = 2×10^5
+    python bench_cplib.py -n 100000 --interpreters python3,pypy3
+
+  - unionfind: 頂点ごとの Node オブジェクト        / cplib.UnionFind
+  - fenwick:   __slots__ もローカル変数も使わない版 / cplib.Fenwick
+  - segtree:   Node オブジェクトの再帰セグメント木  / cplib.SegTree
+  - dijkstra:  (距離, 頂点) のタプルのヒープ        / cplib.dijkstra
+
+cplib 側は bundle.py で埋め込んだ、提出するのと同じコードで測る。
+時間はスクリプトの中で処理の部分だけを測る（起動とデータの生成は含まない）
+"""
+
+import argparse
+import shutil
+import tempfile
+from pathlib import Path
+
+from bundle import inline_library
+from runner import run_measured
+
+# データの生成（両方で同じ乱数列）
+PRELUDE = """\
+import random
+import sys
+import time
+
+sys.setrecursionlimit(10 ** 6)
+N = Q = {n}
+rng = random.Random(0)
+"""
+
+# 処理の時間と、結果が一致することを確かめるためのチェックサムを出力する
+REPORT = """
+started = time.perf_counter()
+checksum = run()
+print(checksum, time.perf_counter() - started)
+"""
+
+CASES = {
+    "unionfind": {
+        "data": "ops = [(rng.randrange(N), rng.randrange(N)) "
+                "for _ in range(Q)]\n",
+        "naive": """
+class Node:
+    def __init__(self):
+        self.parent = self
+        self.size = 1
+
+
+def find(node):
+    while node.parent is not node:
+        node.parent = node.parent.parent
+        node = node.parent
+    return node
+
+
+def run():
+    nodes = [Node() for _ in range(N)]
+    total = 0
+    for a, b in ops:
+        ra, rb = find(nodes[a]), find(nodes[b])
+        if ra is not rb:
+            if ra.size < rb.size:
+                ra, rb = rb, ra
+            rb.parent = ra
+            ra.size += rb.size
+        total += find(nodes[a]).size
+    return total
+""",
+        "cplib": """
+from cplib import UnionFind
+
+
+def run():
+    uf = UnionFind(N)
+    total = 0
+    for a, b in ops:
+        uf.union(a, b)
+        total += uf.size(a)
+    return total
+""",
+    },
+    "fenwick": {
+        "data": "ops = [(rng.randrange(N), rng.randrange(N + 1), "
+                "rng.randint(1, 10 ** 9)) for _ in range(Q)]\n",
+        "naive": """
+class BIT:
+    def __init__(self, n):
+        self.n = n
+        self.tree = [0] * (n + 1)
+
+    def add(self, i, x):
+        i += 1
+        while i <= self.n:
+            self.tree[i] += x
+            i += i & -i
+
+    def sum(self, r):
+        s = 0
+        while r > 0:
+            s += self.tree[r]
+            r -= r & -r
+        return s
+
+
+def run():
+    bit = BIT(N)
+    total = 0
+    for i, r, x in ops:
+        bit.add(i, x)
+        total += bit.sum(r)
+    return total
+""",
+        "cplib": """
+from cplib import Fenwick
+
+
+def run():
+    ft = Fenwick(N)
+    total = 0
+    for i, r, x in ops:
+        ft.add(i, x)
+        total += ft.prefix_sum(r)
+    return total
+""",
+    },
+    "segtree": {
+        "data": "A = [rng.randint(1, 10 ** 9) for _ in range(N)]\n"
+                "ops = []\n"
+                "for _ in range(Q):\n"
+                "    l, r = sorted((rng.randrange(N + 1), "
+                "rng.randrange(N + 1)))\n"
+                "    ops.append((rng.randrange(N), "
+                "rng.randint(1, 10 ** 9), l, r))\n",
+        "naive": """
+INF = 1 << 62
+
+
+class Node:
+    def __init__(self, lo, hi):
+        self.lo = lo
+        self.hi = hi
+        self.left = self.right = None
+        self.value = INF
+
+
+def build(lo, hi):
+    node = Node(lo, hi)
+    if hi - lo == 1:
+        node.value = A[lo]
+    else:
+        mid = (lo + hi) // 2
+        node.left = build(lo, mid)
+        node.right = build(mid, hi)
+        node.value = min(node.left.value, node.right.value)
+    return node
+
+
+def update(node, i, x):
+    if node.hi - node.lo == 1:
+        node.value = x
+        return
+    update(node.left if i < node.left.hi else node.right, i, x)
+    node.value = min(node.left.value, node.right.value)
+
+
+def query(node, l, r):
+    if r <= node.lo or node.hi <= l:
+        return INF
+    if l <= node.lo and node.hi <= r:
+        return node.value
+    return min(query(node.left, l, r), query(node.right, l, r))
+
+
+def run():
+    root = build(0, N)
+    total = 0
+    for i, x, l, r in ops:
+        update(root, i, x)
+        v = query(root, l, r)
+        total += v if v < INF else 0
+    return total
+""",
+        "cplib": """
+from cplib import SegTree
+
+INF = 1 << 62
+
+
+def run():
+    st = SegTree(A, min, INF)
+    total = 0
+    for i, x, l, r in ops:
+        st.set(i, x)
+        v = st.prod(l, r)
+        total += v if v < INF else 0
+    return total
+""",
+    },
+    "dijkstra": {
+        "data": "adj = [[] for _ in range(N)]\n"
+                "for v in range(1, N):\n"
+                "    adj[rng.randrange(v)].append("
+                "(v, rng.randint(1, 10 ** 9)))\n"
+                "for _ in range(2 * N):\n"
+                "    adj[rng.randrange(N)].append((rng.randrange(N), "
+                "rng.randint(1, 10 ** 9)))\n",
+        "naive": """
+from heapq import heappop, heappush
+
+INF = float("inf")
+
+
+def run():
+    dist = [INF] * N
+    dist[0] = 0
+    heap = [(0, 0)]
+    while heap:
+        d, u = heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, w in adj[u]:
+            if d + w < dist[v]:
+                dist[v] = d + w
+                heappush(heap, (d + w, v))
+    return sum(d for d in dist if d < INF)
+""",
+        "cplib": """
+from cplib import dijkstra
+
+
+def run():
+    return sum(d for d in dijkstra(adj, 0) if d >= 0)
+""",
+    },
+}
+
+
+def script(case: dict, kind: str, n: int) -> str:
+    code = PRELUDE.format(n=n) + case["data"] + case[kind] + REPORT
+    if kind == "cplib":
+        code, _ = inline_library(code)
+    return code
+
+
+def measure(cmd: list[str], repeat: int) -> dict:
+    best = None
+    for _ in range(repeat):
+        r = run_measured(cmd, "")
+        if r["returncode"] != 0:
+            return {"error": (r["stderr"].strip().splitlines() or ["?"])[-1]}
+        checksum, elapsed = r["stdout"].split()
+        if best is None or float(elapsed) < best["elapsed"]:
+            best = {"checksum": checksum, "elapsed": float(elapsed)}
+    return best
+
+
+def bench(interpreters: list[str], names: list[str], n: int, repeat: int,
+          workdir: Path) -> None:
+    for interp in interpreters:
+        if shutil.which(interp) is None:
+            print(f"  {interp:<10} (not found)")
+            continue
+        for name in names:
+            results = {}
+            for kind in ("naive", "cplib"):
+                path = workdir / f"{name}_{kind}.py"
+                path.write_text(script(CASES[name], kind, n),
+                                encoding="utf-8")
+                results[kind] = measure([interp, str(path)], repeat)
+
+            naive, lib = results["naive"], results["cplib"]
+            if "error" in naive or "error" in lib:
+                print(f"  {interp:<10} {name:<10} 💥 "
+                      f"{naive.get('error') or lib.get('error')}")
+                continue
+            mark = "" if naive["checksum"] == lib["checksum"] \
+                else "  ❌ checksum differs"
+            print(f"  {Path(interp).name:<10} {name:<10} "
+                  f"{naive['elapsed'] * 1000:8.0f} ms "
+                  f"{lib['elapsed'] * 1000:8.0f} ms   "
+                  f"x{naive['elapsed'] / lib['elapsed']:.1f}{mark}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="compare cplib with typical hand-written implementations"
+    )
+    parser.add_argument("names", nargs="*",
+                        help=f"default: all ({', '.join(CASES)})")
+    parser.add_argument("-n", type=int, default=2 * 10 ** 5,
+                        help="N and Q (default: 200000)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per implementation, the fastest is shown "
+                             "(default: 3)")
+    parser.add_argument("--interpreters", default="python3",
+                        help="comma separated (default: python3)")
+    args = parser.parse_args()
+    for name in args.names:
+        if name not in CASES:
+            parser.error(f"unknown name: {name} (choose from "
+                         f"{', '.join(CASES)})")
+
+    print(f"📏 N = Q = {args.n} (fastest of {args.repeat}, "
+          "excluding startup and data generation)")
+    print(f"  {'':<10} {'':<10} {'naive':>11} {'cplib':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        bench([i.strip() for i in args.interpreters.split(",") if i.strip()],
+              args.names or list(CASES), args.n, args.repeat, Path(tmp))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+gradle test で 1 問のテスト結果が出るまでの時間を、cold / warm で比べる
+
+    python bench_gradle.py ABC439 A -n 5
+
+  - cold:          デーモンを止め、build/ と設定キャッシュを消した状態（新しいコンテストの最初のテスト）
+  - warm:          デーモン・設定キャッシュ・コンパイル結果・AppCDS アーカイブがある状態
+  - warm, no CDS:  warm から AppCDS だけ無効にした状態（-PnoCds）
+
+注意: cold の計測のために gradle --stop で全てのデーモンを止め、build/ を削除する
+"""
+
+import argparse
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from statistics import median
+
+
+def gradle_command(contest_dir: Path) -> str:
+    return "./gradlew" if (contest_dir / "gradlew").exists() else "gradle"
+
+
+def time_test(contest_dir: Path, problem: str, extra=()) -> float:
+    # cleanTest: テストが UP-TO-DATE で飛ばされないようにする
+    cmd = [gradle_command(contest_dir), "cleanTest", "test",
+           "--tests", f"{problem}Test", "--console=plain", *extra]
+    started = time.perf_counter()
+    subprocess.run(cmd, cwd=contest_dir, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def make_cold(contest_dir: Path) -> None:
+    subprocess.run([gradle_command(contest_dir), "--stop"], cwd=contest_dir,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    shutil.rmtree(contest_dir / "build", ignore_errors=True)
+    shutil.rmtree(contest_dir / ".gradle" / "configuration-cache",
+                  ignore_errors=True)
+
+
+def bench(contest_dir: Path, problem: str, n: int) -> None:
+    make_cold(contest_dir)
+    cold = time_test(contest_dir, problem)
+
+    # 1 回目は AppCDS アーカイブを作る回なので捨てる
+    time_test(contest_dir, problem)
+    warm = median(time_test(contest_dir, problem) for _ in range(n))
+    no_cds = median(time_test(contest_dir, problem, ["-PnoCds"])
+                    for _ in range(n))
+
+    print(f"⏱️  gradle test --tests {problem}Test in {contest_dir.name} "
+          f"(warm: median of {n})")
+    for name, t in (("cold", cold), ("warm", warm), ("warm, no CDS", no_cds)):
+        print(f"  {name:<14} {t * 1000:8.0f} ms   x{cold / t:.1f}")
+    if not (contest_dir / "build" / "cds" / "test.jsa").exists():
+        print("  (no AppCDS archive was written: JDK 13 or later is "
+              "needed, or build.gradle predates it)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="time-to-result of gradle test, cold vs warm"
+    )
+    parser.add_argument("contest", help="contest dir (e.g. ABC439)")
+    parser.add_argument("problem", help="problem (e.g. A)")
+    parser.add_argument("-n", type=int, default=5,
+                        help="number of warm runs (default: 5)")
+    args = parser.parse_args()
+
+    contest_dir = Path(args.contest)
+    if not contest_dir.is_dir():
+        contest_dir = Path(args.contest.upper())
+    if not (contest_dir / "build.gradle").exists():
+        parser.error(f"build.gradle not found in {contest_dir}")
+    bench(contest_dir, args.problem[:1].upper() + args.problem[1:], args.n)
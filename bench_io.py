@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+入力の読み方ごとの速さを、数 MB の入力で比べる
+
+    python bench_io.py                      # 10^6 個の整数（約 10 MB）
+    python bench_io.py -n 200000 --interpreters python3,pypy3
+
+  - Python: input() / sys.stdin.readline / template_main_fastio.py の読み方
+  - Java:   Scanner / BufferedReader + StringTokenizer /
+            template_main_fastio.java の FastReader（javac がある場合）
+
+入力は 2 通り: 1 行に N 個（"line"）と、1 行に 1 個ずつ N 行（"lines"）
+fastio の読み方はテンプレートから取り出して使うので、テンプレートを変えると結果に反映される
+"""
+
+import argparse
+import random
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+from runner import run_measured
+
+TEMPLATES = Path(__file__).resolve().parent / "templates"
+
+
+# -----------------------------
+# 読み方
+# -----------------------------
+
+
+def python_fastio_reader() -> str:
+    """
+    template_main_fastio.py の _tokens〜read_str を取り出す
+    """
+    text = (TEMPLATES / "template_main_fastio.py").read_text(encoding="utf-8")
+    start = text.index("_tokens = ")
+    end = text.index("# remove or comment out")
+    return "import sys\nfrom itertools import islice\n\n" + text[start:end]
+
+
+def python_readers() -> dict[str, tuple[str, tuple[str, ...]]]:
+    """
+    名前 -> (合計を出力するスクリプト, 使える入力の形)
+    """
+    return {
+        "input()": (
+            "N = int(input())\n"
+            "A = list(map(int, input().split()))\n"
+            "print(sum(A))\n",
+            ("line",),
+        ),
+        "input() per line": (
+            "N = int(input())\n"
+            "A = [int(input()) for _ in range(N)]\n"
+            "print(sum(A))\n",
+            ("lines",),
+        ),
+        "sys.stdin.readline": (
+            "import sys\n"
+            "input = sys.stdin.readline\n"
+            "N = int(input())\n"
+            "A = [int(input()) for _ in range(N)]\n"
+            "print(sum(A))\n",
+            ("lines",),
+        ),
+        "fastio template": (
+            python_fastio_reader()
+            + "\nN = read_int()\nA = read_ints(N)\nprint(sum(A))\n",
+            ("line", "lines"),
+        ),
+    }
+
+
+def java_fast_reader() -> str:
+    """
+    template_main_fastio.java の FastReader クラスを取り出す
+    """
+    text = (TEMPLATES / "template_main_fastio.java").read_text(
+        encoding="utf-8")
+    start = text.index("    static final class FastReader")
+    end = text.rindex("}")  # 外側のクラスの閉じ括弧
+    return text[start:end]
+
+
+def java_readers() -> dict[str, tuple[str, str]]:
+    """
+    名前 -> (クラス名, ソース)
+    """
+    imports = ("import java.io.*;\n"
+               "import java.util.*;\n\n")
+    return {
+        "Scanner": ("BenchScanner", imports + """
+public class BenchScanner {
+    public static void main(String[] args) {
+        Scanner sc = new Scanner(System.in);
+        int n = sc.nextInt();
+        long sum = 0;
+        for (int i = 0; i < n; i++) sum += sc.nextLong();
+        System.out.println(sum);
+    }
+}
+"""),
+        "BufferedReader": ("BenchBuffered", imports + """
+public class BenchBuffered {
+    public static void main(String[] args) throws IOException {
+        BufferedReader br = new BufferedReader(new InputStreamReader(System.in));
+        StringTokenizer st = new StringTokenizer("");
+        int n = -1;
+        long sum = 0;
+        for (int i = -1; i < n; i++) {
+            while (!st.hasMoreTokens()) st = new StringTokenizer(br.readLine());
+            long x = Long.parseLong(st.nextToken());
+            if (i < 0) n = (int) x; else sum += x;
+        }
+        System.out.println(sum);
+    }
+}
+"""),
+        "fastio template": ("BenchFast", imports + """
+public class BenchFast {
+    public static void main(String[] args) {
+        FastReader in = new FastReader(System.in);
+        int n = in.nextInt();
+        long sum = 0;
+        for (int i = 0; i < n; i++) sum += in.nextLong();
+        System.out.println(sum);
+    }
+
+""" + java_fast_reader() + "}\n"),
+    }
+
+
+# -----------------------------
+# 計測
+# -----------------------------
+
+
+def make_inputs(n: int, seed: int) -> tuple[dict[str, str], int]:
+    rng = random.Random(seed)
+    values = [rng.randint(1, 10 ** 9) for _ in range(n)]
+    body = list(map(str, values))
+    inputs = {
+        "line": f"{n}\n" + " ".join(body) + "\n",
+        "lines": f"{n}\n" + "\n".join(body) + "\n",
+    }
+    return inputs, sum(values)
+
+
+def measure(cmd: list[str], data: str, expected: int, repeat: int) -> dict:
+    best = None
+    for _ in range(repeat):
+        r = run_measured(cmd, data)
+        if r["returncode"] != 0 or r["stdout"].strip() != str(expected):
+            return {"error": (r["stderr"].strip().splitlines() or
+                              [f"wrong sum: {r['stdout'].strip()}"])[-1]}
+        if best is None or r["wall"] < best["wall"]:
+            best = r
+    return best
+
+
+def print_row(lang: str, name: str, layout: str, size: int, r: dict):
+    if "error" in r:
+        print(f"  {lang:<10} {name:<20} {layout:<6} 💥 {r['error']}")
+        return
+    print(f"  {lang:<10} {name:<20} {layout:<6} {r['wall'] * 1000:8.0f} ms "
+          f"{size / r['wall'] / 1e6:8.1f} MB/s")
+
+
+def bench_python(inputs, expected, interpreters, repeat, workdir):
+    readers = python_readers()
+    for interp in interpreters:
+        if shutil.which(interp) is None:
+            print(f"  {interp:<10} (not found)")
+            continue
+        for name, (code, layouts) in readers.items():
+            script = workdir / f"{re.sub(r'[^a-z]+', '_', name.lower())}.py"
+            script.write_text(code, encoding="utf-8")
+            for layout in layouts:
+                data = inputs[layout]
+                print_row(Path(interp).name, name, layout, len(data),
+                          measure([interp, str(script)], data, expected,
+                                  repeat))
+
+
+def bench_java(inputs, expected, repeat, workdir):
+    if shutil.which("javac") is None or shutil.which("java") is None:
+        print("  java       (javac not found)")
+        return
+    from java_runner import compile_java, java_command
+
+    for name, (cls, source) in java_readers().items():
+        path = workdir / f"{cls}.java"
+        path.write_text(source, encoding="utf-8")
+        compiled = compile_java(path)
+        if not compiled["ok"]:
+            print_row("java", name, "-", 0, {"error": compiled["output"]})
+            continue
+        for layout in ("line", "lines"):
+            data = inputs[layout]
+            print_row("java", name, layout, len(data),
+                      measure(java_command(compiled), data, expected,
+                              repeat))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="compare input reading throughput on generated inputs"
+    )
+    parser.add_argument("-n", type=int, default=10 ** 6,
+                        help="number of integers (default: 1000000)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per reader, the fastest is shown "
+                             "(default: 3)")
+    parser.add_argument("--interpreters", default="python3",
+                        help="comma separated (default: python3)")
+    parser.add_argument("--no-java", action="store_true",
+                        help="skip the Java readers")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    inputs, expected = make_inputs(args.n, args.seed)
+    print(f"📏 {args.n} integers: line {len(inputs['line']) / 1e6:.1f} MB, "
+          f"lines {len(inputs['lines']) / 1e6:.1f} MB "
+          f"(fastest of {args.repeat}, including startup)")
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_python(inputs, expected,
+                     [i.strip() for i in args.interpreters.split(",")
+                      if i.strip()], args.repeat, Path(tmp))
+        if not args.no_java:
+            bench_java(inputs, expected, args.repeat, Path(tmp))
@@ -0,0 +1,499 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+提出用のコピーを submit/ に作る
+
+    python ../bundle.py A.py                          # -> submit/A.py
+    python ../bundle.py src/main/java/abc439/A.java   # -> submit/A.java
+
+Python:
+  - debug(...) の呼び出しを取り除く（引数の評価も含めて、提出したコードでは何も実行されない）
+  - DEBUG が有効なときだけ実行される if ブロック（else の無いもの）を取り除く
+      if DEBUG: ... / if os.environ.get("DEBUG"): ... / if __debug__: ...
+    （if not DEBUG: のような否定の条件はそのまま残す）
+  - 使われなくなった def debug と、そのためだけの import を取り除く
+  空になったブロックには pass を入れる。AST で場所を調べて元のソースから切り取るので、
+  残りのコードのコメントや書式はそのまま
+  - from cplib import ... を、使っている定義（とそれが参照する定義）だけのコピーに置き換える
+    （AtCoder には 1 つのファイルしか提出できない）
+
+Java（bookmarklet.js と同じ）:
+  - package 行を取り除き、public class を Main にする
+"""
+
+import argparse
+import ast
+import re
+import sys
+from pathlib import Path
+
+DEBUG_FUNCTION = "debug"
+DEBUG_NAMES = {"DEBUG", "__debug__"}
+
+
+# -----------------------------
+# Python: 取り除く文を探す
+# -----------------------------
+
+
+def is_debug_call(stmt: ast.stmt) -> bool:
+    return (isinstance(stmt, ast.Expr)
+            and isinstance(stmt.value, ast.Call)
+            and isinstance(stmt.value.func, ast.Name)
+            and stmt.value.func.id == DEBUG_FUNCTION)
+
+
+def _is_debug_value(expr: ast.expr) -> bool:
+    """
+    DEBUG / __debug__ / os.environ.get("DEBUG") / os.getenv("DEBUG") /
+    os.environ["DEBUG"]
+    """
+    if isinstance(expr, ast.Name):
+        return expr.id in DEBUG_NAMES
+    if isinstance(expr, ast.Call) and expr.args:
+        return isinstance(expr.func, ast.Attribute) and \
+            expr.func.attr in ("get", "getenv") and \
+            _is_constant(expr.args[0], "DEBUG")
+    if isinstance(expr, ast.Subscript):
+        return _is_constant(expr.slice, "DEBUG")
+    return False
+
+
+def _is_constant(expr: ast.expr, value) -> bool:
+    return isinstance(expr, ast.Constant) and expr.value == value
+
+
+def _truthy_constants(expr: ast.expr) -> bool:
+    if isinstance(expr, ast.Constant):
+        return bool(expr.value)
+    if isinstance(expr, (ast.Tuple, ast.List, ast.Set)):
+        return bool(expr.elts) and all(
+            isinstance(e, ast.Constant) and e.value for e in expr.elts)
+    return False
+
+
+def is_debug_test(expr: ast.expr) -> bool:
+    """
+    DEBUG が有効なときだけ真になる条件か
+      DEBUG / os.environ.get("DEBUG") など、それを真の定数と比べたもの
+      （== "1" / in ("1", "true") / is True）、"DEBUG" in os.environ、
+      そのどれかを含む and
+    not・or・!= などは、DEBUG が無効なときに真になりうるので取り除かない
+    """
+    if _is_debug_value(expr):
+        return True
+    if isinstance(expr, ast.BoolOp) and isinstance(expr.op, ast.And):
+        return any(is_debug_test(v) for v in expr.values)
+    if isinstance(expr, ast.Compare) and len(expr.ops) == 1:
+        op, right = expr.ops[0], expr.comparators[0]
+        if isinstance(op, ast.In) and _is_constant(expr.left, "DEBUG"):
+            return True
+        return isinstance(op, (ast.Eq, ast.Is, ast.In)) and \
+            _is_debug_value(expr.left) and _truthy_constants(right)
+    return False
+
+
+def is_debug_block(stmt: ast.stmt) -> bool:
+    return isinstance(stmt, ast.If) and not stmt.orelse \
+        and is_debug_test(stmt.test)
+
+
+def _bodies(stmt: ast.stmt):
+    for field in ("body", "orelse", "finalbody"):
+        body = getattr(stmt, field, None)
+        if isinstance(body, list) and body and isinstance(body[0], ast.stmt):
+            yield body
+    for handler in getattr(stmt, "handlers", []):
+        yield handler.body
+    for case in getattr(stmt, "cases", []):
+        yield case.body
+
+
+def find_debug_statements(tree: ast.Module) -> dict[int, str]:
+    """
+    取り除く文の {id(文): 種類}（"call" / "block"）
+    """
+    found = {}
+
+    def visit(body):
+        for stmt in body:
+            if is_debug_call(stmt):
+                found[id(stmt)] = "call"
+            elif is_debug_block(stmt):
+                found[id(stmt)] = "block"
+            else:
+                for child in _bodies(stmt):
+                    visit(child)
+
+    visit(tree.body)
+    return found
+
+
+def used_names(tree: ast.AST, skip: set[int]) -> set[str]:
+    """
+    skip の文の中を除いて、読まれている名前
+    """
+    names = set()
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if id(node) in skip:
+            continue
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        stack.extend(ast.iter_child_nodes(node))
+    return names
+
+
+def _bound_names(stmt) -> list[str]:
+    return [(a.asname or a.name).split(".")[0] for a in stmt.names]
+
+
+def find_removals(tree: ast.Module) -> dict[int, str]:
+    removals = find_debug_statements(tree)
+    before = used_names(tree, set())
+
+    # debug() が残っていなければ def debug も要らない
+    for stmt in tree.body:
+        if isinstance(stmt, ast.FunctionDef) and \
+                stmt.name == DEBUG_FUNCTION:
+            if DEBUG_FUNCTION not in used_names(
+                    tree, set(removals) | {id(stmt)}):
+                removals[id(stmt)] = "def"
+
+    # 取り除いた文のためだけの import（例: debug() の中の os）
+    after = used_names(tree, set(removals))
+    for stmt in tree.body:
+        if isinstance(stmt, (ast.Import, ast.ImportFrom)):
+            names = _bound_names(stmt)
+            if "*" in names:
+                continue
+            if all(n not in after for n in names) and \
+                    any(n in before for n in names):
+                removals[id(stmt)] = "import"
+    return removals
+
+
+# -----------------------------
+# Python: ソースから切り取る
+# -----------------------------
+
+
+def _offsets(source: bytes) -> list[int]:
+    starts = [0]
+    for i, b in enumerate(source):
+        if b == 0x0A:
+            starts.append(i + 1)
+    return starts
+
+
+def _first_line(stmt) -> int:
+    # デコレータ付きの def は @ の行から
+    return min([stmt.lineno] + [d.lineno
+                                for d in getattr(stmt, "decorator_list", [])])
+
+
+def strip_debug(source: str) -> tuple[str, dict[str, int]]:
+    """
+    debug の呼び出し・ブロック・定義を取り除いたソースと、種類ごとの件数を返す
+    """
+    tree = ast.parse(source)
+    removals = find_removals(tree)
+    counts = {"call": 0, "block": 0, "def": 0, "import": 0}
+    if not removals:
+        return source, counts
+
+    data = source.encode("utf-8")
+    starts = _offsets(data)
+    edits = []  # (開始, 終了, 置き換え)
+
+    def line_end(lineno: int) -> int:
+        return starts[lineno] if lineno < len(starts) else len(data)
+
+    def remove(stmt, needs_pass: bool, indent: bytes):
+        first = _first_line(stmt)
+        start = starts[first - 1] + (stmt.col_offset if first == stmt.lineno
+                                     else 0)
+        end = starts[stmt.end_lineno - 1] + stmt.end_col_offset
+        head = data[starts[first - 1]:start]
+        tail = data[end:line_end(stmt.end_lineno)].strip()
+        whole_lines = not head.strip() and \
+            (not tail or tail.startswith(b"#"))
+
+        if whole_lines:
+            start, end = starts[first - 1], line_end(stmt.end_lineno)
+            # def debug の直前のコメント（"remove ... before upload" など）も消す
+            if removals[id(stmt)] == "def":
+                line = first - 1
+                while line >= 1 and data[starts[line - 1]:
+                                         line_end(line)].strip() \
+                        .startswith(b"#"):
+                    line -= 1
+                    start = starts[line]
+            replacement = indent + b"pass\n" if needs_pass else b""
+        else:
+            # "x = 1; debug(x)" や "if c: debug(x)" は同じ行に pass を置く
+            replacement = b"pass"
+        edits.append((start, end, replacement))
+
+    def visit(body, is_module):
+        marked = [s for s in body if id(s) in removals]
+        # ブロックが空になるなら最初の 1 つを pass にする
+        empty = not is_module and len(marked) == len(body)
+        for i, stmt in enumerate(marked):
+            indent = data[starts[stmt.lineno - 1]:
+                          starts[stmt.lineno - 1] + stmt.col_offset]
+            remove(stmt, empty and i == 0, indent)
+            counts[removals[id(stmt)]] += 1
+        for stmt in body:
+            if id(stmt) not in removals:
+                for child in _bodies(stmt):
+                    visit(child, False)
+
+    visit(tree.body, True)
+
+    for start, end, replacement in sorted(edits, reverse=True):
+        data = data[:start] + replacement + data[end:]
+    result = data.decode("utf-8")
+    # 念のため、構文が壊れていないことを確かめる
+    compile(result, "<bundle>", "exec")
+    return result, counts
+
+
+# -----------------------------
+# Python: cplib を埋め込む
+# -----------------------------
+
+LIBRARY = "cplib"
+LIBRARY_DIR = Path(__file__).resolve().parent / LIBRARY
+
+_modules: dict[str, dict] = {}
+
+
+def _is_library(module: str | None) -> bool:
+    return module == LIBRARY or (module or "").startswith(LIBRARY + ".")
+
+
+def load_module(module: str) -> dict:
+    """
+    cplib のモジュールのトップレベルの定義
+
+    return: {"source", "defs": {名前: 文}, "imports": {名前: import 文},
+             "reexports": {名前: (モジュール, 元の名前)}}
+    """
+    if module in _modules:
+        return _modules[module]
+    parts = module.split(".")[1:]
+    path = LIBRARY_DIR.joinpath(*parts)
+    path = path / "__init__.py" if path.is_dir() else path.with_suffix(".py")
+    if not path.is_file():
+        raise ValueError(f"{module} not found in {LIBRARY_DIR}")
+    source = path.read_text(encoding="utf-8")
+    info = {"source": source, "defs": {}, "imports": {}, "reexports": {}}
+    for stmt in ast.parse(source, filename=str(path)).body:
+        if isinstance(stmt, (ast.FunctionDef, ast.ClassDef)):
+            info["defs"][stmt.name] = stmt
+        elif isinstance(stmt, (ast.Assign, ast.AnnAssign)):
+            targets = stmt.targets if isinstance(stmt, ast.Assign) \
+                else [stmt.target]
+            for t in targets:
+                if isinstance(t, ast.Name) and t.id != "__all__":
+                    info["defs"][t.id] = stmt
+        elif isinstance(stmt, ast.ImportFrom) and _is_library(stmt.module):
+            for a in stmt.names:
+                info["reexports"][a.asname or a.name] = (stmt.module, a.name)
+        elif isinstance(stmt, (ast.Import, ast.ImportFrom)):
+            for name in _bound_names(stmt):
+                info["imports"][name] = stmt
+    _modules[module] = info
+    return info
+
+
+def resolve(module: str, name: str) -> tuple[str, str]:
+    """
+    (モジュール, 名前) を定義している場所までたどる（__init__.py の再エクスポートなど）
+    """
+    seen = set()
+    while (module, name) not in seen:
+        seen.add((module, name))
+        info = load_module(module)
+        if name in info["defs"]:
+            return module, name
+        if name not in info["reexports"]:
+            break
+        module, name = info["reexports"][name]
+    raise ValueError(f"cannot import {name} from {module}")
+
+
+def _segment(source: str, stmt) -> str:
+    lines = source.splitlines(keepends=True)
+    return "".join(lines[_first_line(stmt) - 1:stmt.end_lineno])
+
+
+def collect_definitions(
+        wanted: list[tuple[str, str]]) -> tuple[list[str], list[str]]:
+    """
+    wanted と、それらが参照する cplib の定義を、参照される側が先になる順に集める
+
+    return: (import 文, 定義) のソースのリスト
+    """
+    imports, definitions = [], []
+    done = set()
+
+    def visit(module: str, name: str):
+        module, name = resolve(module, name)
+        if (module, name) in done:
+            return
+        done.add((module, name))
+        info = load_module(module)
+        stmt = info["defs"][name]
+        for ref in sorted(used_names(stmt, set())):
+            if ref in info["imports"]:
+                text = _segment(info["source"], info["imports"][ref])
+                if text not in imports:
+                    imports.append(text)
+            elif (ref in info["defs"] and ref != name) or \
+                    ref in info["reexports"]:
+                visit(module, ref)
+        text = _segment(info["source"], stmt)
+        if text not in definitions:  # a = b = ... のような 1 つの文で複数の名前
+            definitions.append(text)
+
+    for module, name in wanted:
+        visit(module, name)
+    return imports, definitions
+
+
+def inline_library(source: str) -> tuple[str, list[str]]:
+    """
+    from cplib... import ... を、使っている定義だけのコピーに置き換える
+
+    return: (ソース, 埋め込んだ名前)
+    """
+    tree = ast.parse(source)
+    statements = [s for s in ast.walk(tree)
+                  if isinstance(s, ast.ImportFrom) and _is_library(s.module)]
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import) and \
+                any(_is_library(a.name) for a in node.names):
+            raise ValueError(f"line {node.lineno}: use 'from {LIBRARY} "
+                             f"import ...' instead of 'import {LIBRARY}'")
+    if not statements:
+        return source, []
+    for stmt in statements:
+        if stmt not in tree.body:
+            raise ValueError(f"line {stmt.lineno}: {LIBRARY} must be "
+                             "imported at the top level")
+
+    wanted, aliases = [], []
+    for stmt in statements:
+        for a in stmt.names:
+            if a.name == "*":
+                raise ValueError(f"line {stmt.lineno}: "
+                                 f"'from {stmt.module} import *' "
+                                 "cannot be inlined")
+            wanted.append((stmt.module, a.name))
+            if a.asname and a.asname != a.name:
+                original = resolve(stmt.module, a.name)[1]
+                aliases.append(f"{a.asname} = {original}\n")
+    imports, definitions = collect_definitions(wanted)
+
+    block = (f"# ---- {LIBRARY} (bundle.py) ----\n"
+             + "".join(imports) + "\n\n"
+             + "\n\n".join(definitions) + "\n\n"
+             + "".join(aliases)
+             + f"# ---- {LIBRARY} end ----\n")
+
+    lines = source.splitlines(keepends=True)
+    for i, stmt in enumerate(sorted(statements, key=lambda s: s.lineno,
+                                    reverse=True)):
+        first = i == len(statements) - 1
+        lines[stmt.lineno - 1:stmt.end_lineno] = [block] if first else []
+    return "".join(lines), [name for _, name in wanted]
+
+
+# -----------------------------
+# Java
+# -----------------------------
+
+
+def normalize_java(source: str) -> str:
+    """
+    package 行を取り除き、public class を Main にする（bookmarklet.js と同じ）
+    """
+    source = re.sub(r"^\s*package\s+.*;\s*$\n?", "", source, count=1,
+                    flags=re.M)
+    if not re.search(r"public\s+(final\s+)?class\s+Main\b", source):
+        source = re.sub(r"public\s+(final\s+)?class\s+[A-Za-z_]\w*\s*\{",
+                        lambda m: f"public {m.group(1) or ''}class Main {{",
+                        source, count=1)
+    return source
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+
+
+def submit_dir_of(path: Path) -> Path:
+    """
+    コンテストのディレクトリの submit/
+    """
+    from validate import contest_dir_of_source
+
+    return contest_dir_of_source(path) / "submit"
+
+
+def bundle(path: Path) -> tuple[str, str]:
+    """
+    return: (提出用のソース, 何をしたかの説明)
+    """
+    source = path.read_text(encoding="utf-8")
+    if path.suffix == ".java":
+        return normalize_java(source), "package removed, class renamed to Main"
+
+    source, inlined = inline_library(source)
+    result, counts = strip_debug(source)
+    parts = [f"{counts['call']} debug() call(s)"]
+    if counts["block"]:
+        parts.append(f"{counts['block']} debug block(s)")
+    if counts["def"]:
+        parts.append("def debug")
+    if counts["import"]:
+        parts.append(f"{counts['import']} import(s)")
+    summary = "removed " + ", ".join(parts)
+    if inlined:
+        summary = f"inlined {', '.join(inlined)}; " + summary
+    return result, summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="write a submission-ready copy to submit/ "
+                    "(debug() removed / Java class renamed to Main)"
+    )
+    parser.add_argument("filename", help="A.py or src/main/java/.../A.java")
+    parser.add_argument("--stdout", action="store_true",
+                        help="print the bundle instead of writing submit/")
+    args = parser.parse_args()
+
+    path = Path(args.filename)
+    if path.suffix not in (".py", ".java"):
+        parser.error("only .py and .java are supported")
+    try:
+        code, summary = bundle(path)
+    except (SyntaxError, ValueError) as e:
+        print(f"💥 {path.name}: {e}", file=sys.stderr)
+        raise SystemExit(1)
+
+    if args.stdout:
+        sys.stdout.write(code)
+        raise SystemExit(0)
+
+    out = submit_dir_of(path) / path.name
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(code, encoding="utf-8")
+    print(f"📦 {out}: {summary} "
+          f"({len(path.read_bytes()) / 1024:.1f} KB -> "
+          f"{len(code.encode('utf-8')) / 1024:.1f} KB)")
@@ -0,0 +1,477 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+コンテスト・問題のキャッシュを 1 つの SQLite ファイルにまとめて保存する
+
+- 全コンテスト共通のストア（既定: <tools>/.cache/atcoder.sqlite3）
+- WAL モード + トランザクションで書き込みはアトミック
+- CACHE_VERSION が変わったエントリ・ttl を過ぎたエントリは読まない
+- 合計サイズ（エントリ + 圧縮した HTML）が max_bytes を超えたら、
+  最後に読まれた（HTML は取得した）時刻が古い順に削除する
+  （問題・問題一覧などは消さない。実行結果は別の上限の中だけで消す）
+- ダウンロードした HTML は圧縮して内容のハッシュで保存する（pages / blobs）
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# zstd があれば使い、無ければ gzip で圧縮する
+try:
+    import zstandard
+
+    _zstd_c = zstandard.ZstdCompressor(level=10)
+    _zstd_d = zstandard.ZstdDecompressor()
+except ImportError:
+    zstandard = None
+
+# 保存形式を変えたら上げる（古いエントリは読み捨てる）
+CACHE_VERSION = 1
+
+DEFAULT_PATH = Path(__file__).resolve().parent / ".cache" / "atcoder.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# 自分だけの上限を持つ namespace（超えたらその中だけで古い順に消す）
+NAMESPACE_MAX_BYTES = {
+    "result": 128 * 1024 * 1024,
+}
+
+# サイズの上限では消さない namespace（setup-python.py などが必ず読む）
+PINNED_NAMESPACES = ("contest", "tasks", "problem")
+
+# namespace ごとの有効期限（秒）。過ぎたら取り直す（問題文の修正などを拾う）
+DAY = 24 * 3600
+DEFAULT_TTL = {
+    "tasks": 7 * DAY,
+    "problem": 7 * DAY,
+    "http": 30 * DAY,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace   TEXT NOT NULL,
+    contest     TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    version     INTEGER NOT NULL,
+    value       TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, contest, key)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+
+CREATE TABLE IF NOT EXISTS blobs (
+    hash    TEXT PRIMARY KEY,
+    codec   TEXT NOT NULL,
+    size    INTEGER NOT NULL,
+    data    BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url         TEXT PRIMARY KEY,
+    contest     TEXT NOT NULL,
+    kind        TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    hash        TEXT NOT NULL,
+    fetched_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_contest ON pages (contest, kind);
+"""
+
+
+def compress(data: bytes) -> tuple[str, bytes]:
+    if zstandard is not None:
+        return "zstd", _zstd_c.compress(data)
+    return "gzip", gzip.compress(data, compresslevel=6)
+
+
+def decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read this page")
+        return _zstd_d.decompress(data)
+    if codec == "gzip":
+        return gzip.decompress(data)
+    raise ValueError(f"unknown codec: {codec}")
+
+
+class CacheStore:
+    """
+    (namespace, contest, key) をキーに JSON 値を保存する
+
+    namespace の例:
+      - "contest": コンテストのメタ情報（key = "meta"）
+      - "tasks":   問題一覧（key = "list"）
+      - "problem": 問題ごとのタイトル・入力例（key = "A" など）
+      - "http":    ETag / Last-Modified（contest = "", key = URL）
+      - "result":  解答の実行結果（result_cache.py）
+
+    ページ本文は entries ではなく put_page / get_page で pages・blobs に保存する
+    """
+
+    def __init__(self, path=None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 namespace_max_bytes: dict[str, int] | None = None):
+        self.path = Path(path or os.environ.get("ATCODER_CACHE_DB")
+                         or DEFAULT_PATH)
+        self.max_bytes = max_bytes
+        self.namespace_max_bytes = dict(
+            NAMESPACE_MAX_BYTES if namespace_max_bytes is None
+            else namespace_max_bytes
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path),
+            timeout=30,
+            isolation_level=None,       # BEGIN / COMMIT は自分で書く
+            check_same_thread=False,    # scrape のスレッドからも使う
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # -----------------------------
+    # 読み書き
+    # -----------------------------
+
+    def get(self, namespace: str, contest: str, key: str,
+            ttl: float | None = None):
+        """
+        値を返す。無い・古い（version 違い / ttl 切れ）場合は None
+
+        ttl 切れのエントリは消さずに残す（取り直しに失敗しても、
+        ttl を指定しない読み出しでは使える）。次の put で置き換わる
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, value, created_at FROM entries "
+                "WHERE namespace = ? AND contest = ? AND key = ?",
+                (namespace, contest, key),
+            ).fetchone()
+            if row is None:
+                return None
+
+            version, value, created_at = row
+            if version != CACHE_VERSION:
+                self._conn.execute(
+                    "DELETE FROM entries "
+                    "WHERE namespace = ? AND contest = ? AND key = ?",
+                    (namespace, contest, key),
+                )
+                return None
+            if ttl is not None and now - created_at > ttl:
+                return None
+
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? "
+                "WHERE namespace = ? AND contest = ? AND key = ?",
+                (now, namespace, contest, key),
+            )
+        return json.loads(value)
+
+    def put(self, namespace: str, contest: str, key: str, value) -> None:
+        """
+        値を保存する（同じキーは置き換え）
+        """
+        text = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries "
+                    "(namespace, contest, key, version, value, size, "
+                    " created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (namespace, contest, key, CACHE_VERSION, text,
+                     len(text.encode("utf-8")), now, now),
+                )
+                self._evict_locked(namespace)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, namespace: str | None = None,
+               contest: str | None = None) -> int:
+        """
+        namespace / contest に一致するエントリを削除し、削除数を返す
+        """
+        where, params = self._where(namespace, contest)
+        with self._lock:
+            cur = self._conn.execute(f"DELETE FROM entries{where}", params)
+        return cur.rowcount
+
+    def keys(self, namespace: str, contest: str) -> list[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM entries WHERE namespace = ? AND contest = ? "
+                "ORDER BY key",
+                (namespace, contest),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def stats(self) -> list[tuple]:
+        """
+        コンテストごとの (contest, エントリ数, バイト数)
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT contest, COUNT(*), SUM(size) FROM entries "
+                "GROUP BY contest ORDER BY contest"
+            ).fetchall()
+
+    # -----------------------------
+    # 生 HTML（内容アドレス + 圧縮）
+    # -----------------------------
+
+    def put_page(self, url: str, contest: str, kind: str, key: str,
+                 body: str) -> str:
+        """
+        ページ本文を圧縮して保存し、内容のハッシュを返す
+        同じ内容の本文は 1 回だけ保存される
+        """
+        raw = body.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                exists = self._conn.execute(
+                    "SELECT 1 FROM blobs WHERE hash = ?", (digest,)
+                ).fetchone()
+                if not exists:
+                    codec, data = compress(raw)
+                    self._conn.execute(
+                        "INSERT INTO blobs (hash, codec, size, data) "
+                        "VALUES (?, ?, ?, ?)",
+                        (digest, codec, len(raw), data),
+                    )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pages "
+                    "(url, contest, kind, key, hash, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, contest, kind, key, digest, time.time()),
+                )
+                # どのページからも参照されなくなった本文を消す
+                self._conn.execute(
+                    "DELETE FROM blobs WHERE hash NOT IN "
+                    "(SELECT hash FROM pages)"
+                )
+                self._evict_locked()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return digest
+
+    def get_page(self, url: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT b.codec, b.data FROM pages p "
+                "JOIN blobs b ON b.hash = p.hash WHERE p.url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        return decompress(row[0], row[1]).decode("utf-8")
+
+    def pages(self, contest: str | None = None,
+              kind: str | None = None) -> list[dict]:
+        """
+        保存済みページの一覧（本文は含まない）
+        """
+        where, params = self._where(kind, contest, name="kind")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, contest, kind, key, hash FROM pages"
+                f"{where} ORDER BY contest, kind, key",
+                params,
+            ).fetchall()
+        return [
+            {"url": r[0], "contest": r[1], "kind": r[2], "key": r[3],
+             "hash": r[4]}
+            for r in rows
+        ]
+
+    # -----------------------------
+    # 削除（サイズ上限）
+    # -----------------------------
+
+    def _evict_locked(self, namespace: str | None = None) -> None:
+        """
+        エントリと圧縮した HTML の合計が max_bytes を超えたら、
+        上限の 9 割まで古い順に消す（エントリは最後に読まれた時刻、
+        ページは取得した時刻で比べる）
+
+        namespace_max_bytes にある namespace はその中だけで数えて消し、
+        PINNED_NAMESPACES のエントリは消さない
+        """
+        if namespace in self.namespace_max_bytes:
+            self._evict_namespace_locked(namespace)
+            return
+
+        sizes = self._conn.execute(
+            "SELECT namespace, SUM(size) FROM entries GROUP BY namespace"
+        ).fetchall()
+        total = sum(size for ns, size in sizes
+                    if ns not in self.namespace_max_bytes)
+        total += self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        target = self.max_bytes * 9 // 10
+        skip = set(self.namespace_max_bytes) | set(PINNED_NAMESPACES)
+        candidates = [
+            (accessed_at, "entry", rowid, size)
+            for rowid, ns, size, accessed_at in self._conn.execute(
+                "SELECT rowid, namespace, size, accessed_at FROM entries"
+            )
+            if ns not in skip
+        ]
+        candidates += [
+            (fetched_at, "page", url, digest)
+            for url, digest, fetched_at in self._conn.execute(
+                "SELECT url, hash, fetched_at FROM pages"
+            )
+        ]
+        candidates.sort(key=lambda c: c[0])
+
+        # 本文は同じ内容のページで共有しているので、最後の参照が消えたときに減らす
+        blob_bytes = dict(self._conn.execute(
+            "SELECT hash, LENGTH(data) FROM blobs"
+        ))
+        refs = dict(self._conn.execute(
+            "SELECT hash, COUNT(*) FROM pages GROUP BY hash"
+        ))
+
+        entries, pages = [], []
+        for _, kind, ident, extra in candidates:
+            if total <= target:
+                break
+            if kind == "entry":
+                entries.append((ident,))
+                total -= extra
+                continue
+            pages.append((ident,))
+            refs[extra] -= 1
+            if refs[extra] == 0:
+                total -= blob_bytes.get(extra, 0)
+        self._conn.executemany("DELETE FROM entries WHERE rowid = ?", entries)
+        if pages:
+            self._conn.executemany("DELETE FROM pages WHERE url = ?", pages)
+            self._conn.execute(
+                "DELETE FROM blobs WHERE hash NOT IN (SELECT hash FROM pages)"
+            )
+
+    def _evict_namespace_locked(self, namespace: str) -> None:
+        limit = self.namespace_max_bytes[namespace]
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries WHERE namespace = ?",
+            (namespace,),
+        ).fetchone()[0]
+        if total <= limit:
+            return
+
+        target = limit * 9 // 10
+        rows = self._conn.execute(
+            "SELECT rowid, size FROM entries WHERE namespace = ? "
+            "ORDER BY accessed_at",
+            (namespace,),
+        ).fetchall()
+        victims = []
+        for rowid, size in rows:
+            if total <= target:
+                break
+            victims.append((rowid,))
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE rowid = ?", victims)
+
+    @staticmethod
+    def _where(namespace, contest, name="namespace"):
+        clauses, params = [], []
+        if namespace is not None:
+            clauses.append(f"{name} = ?")
+            params.append(namespace)
+        if contest is not None:
+            clauses.append("contest = ?")
+            params.append(contest)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return where, params
+
+
+_store: CacheStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> CacheStore:
+    """
+    プロセス内で共有するストアを返す
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CacheStore()
+    return _store
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="inspect the cache store")
+    parser.add_argument(
+        "--clear",
+        metavar="CONTEST",
+        help="delete all entries of the contest (e.g. abc438)"
+    )
+    parser.add_argument(
+        "--vacuum",
+        action="store_true",
+        help="compact the database file"
+    )
+    args = parser.parse_args()
+
+    store = get_store()
+    if args.clear:
+        n = store.delete(contest=args.clear.lower())
+        print(f"🗑️  deleted {n} entries of {args.clear.lower()}")
+        with store._lock:
+            store._conn.execute(
+                "DELETE FROM pages WHERE contest = ?", (args.clear.lower(),)
+            )
+            store._conn.execute(
+                "DELETE FROM blobs WHERE hash NOT IN (SELECT hash FROM pages)"
+            )
+    if args.vacuum:
+        with store._lock:
+            store._conn.execute("VACUUM")
+        print("🧹 vacuumed")
+
+    print(f"📦 {store.path}")
+    for contest, count, size in store.stats():
+        print(f"  {contest or '(shared)':<12} {count:6d} entries "
+              f"{size / 1024:10.1f} KiB")
+    with store._lock:
+        n_pages, raw, packed = store._conn.execute(
+            "SELECT (SELECT COUNT(*) FROM pages), "
+            "COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) "
+            "FROM blobs"
+        ).fetchone()
+    print(f"  raw pages: {n_pages} ({raw / 1024:.1f} KiB -> "
+          f"{packed / 1024:.1f} KiB compressed)")
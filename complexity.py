@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+入力サイズと実行時間の組から計算量を推定する
+
+各モデル f について t = a + b·f(n) を当てはめ（a は起動時間など
+サイズに依らない時間）、相対誤差が最も小さいものを選ぶ。
+誤差がほぼ同じなら単純なモデル（O(n) より O(1)）を選ぶ
+"""
+
+import math
+
+# 単純な順に並べる
+MODELS = {
+    "O(1)": lambda n: 0.0,
+    "O(log n)": lambda n: math.log(n),
+    "O(n)": lambda n: float(n),
+    "O(n log n)": lambda n: n * math.log(n),
+    "O(n^2)": lambda n: float(n) ** 2,
+    "O(n^3)": lambda n: float(n) ** 3,
+}
+
+# 最良のモデルとの相対誤差の差がこれ以内なら、単純な方を選ぶ
+TOLERANCE = 0.02
+
+
+def fit(points: list[tuple[int, float]], f) -> dict:
+    """
+    t = a + b·f(n) を重み 1/t^2 の最小二乗で当てはめる（a, b >= 0）
+
+    return: {"a": 秒, "b": 係数, "error": 相対誤差（二乗平均平方根）}
+    """
+    xs = [f(n) for n, _ in points]
+    ys = [t for _, t in points]
+    ws = [1 / max(t, 1e-9) ** 2 for t in ys]
+
+    s = sum(ws)
+    sx = sum(w * x for w, x in zip(ws, xs))
+    sy = sum(w * y for w, y in zip(ws, ys))
+    sxx = sum(w * x * x for w, x in zip(ws, xs))
+    sxy = sum(w * x * y for w, x, y in zip(ws, xs, ys))
+
+    det = s * sxx - sx * sx
+    if det <= 1e-12 * max(s * sxx, 1e-300):
+        a, b = sy / s, 0.0
+    else:
+        b = (s * sxy - sx * sy) / det
+        a = (sy - b * sx) / s
+        if b < 0:
+            a, b = sy / s, 0.0
+        elif a < 0:
+            a, b = 0.0, sxy / sxx
+
+    error = math.sqrt(
+        sum(w * (y - a - b * x) ** 2 for w, x, y in zip(ws, xs, ys))
+        / len(points)
+    )
+    return {"a": a, "b": b, "error": error}
+
+
+def estimate(points: list[tuple[int, float]]) -> list[dict]:
+    """
+    全モデルを当てはめて、良い順に並べて返す（先頭が推定結果）
+
+    return: [{"model": "O(n log n)", "a": ..., "b": ..., "error": ...}, ...]
+    """
+    if len(points) < 2:
+        raise ValueError("need at least two input sizes")
+
+    fits = [{"model": name, **fit(points, f)} for name, f in MODELS.items()]
+    best = min(r["error"] for r in fits)
+    order = list(MODELS)
+    # 誤差が TOLERANCE 以内のうち最も単純なものを先頭にする
+    fits.sort(key=lambda r: (
+        r["error"] > best + TOLERANCE,
+        order.index(r["model"]) if r["error"] <= best + TOLERANCE
+        else r["error"],
+    ))
+    return fits
+
+
+def predict(result: dict, n: int) -> float:
+    """
+    当てはめたモデルで、サイズ n の実行時間（秒）を予測する
+    """
+    return result["a"] + result["b"] * MODELS[result["model"]](n)
+
+
+def loglog_slope(points: list[tuple[int, float]]) -> float | None:
+    """
+    大きい方 2 つのサイズでの log t / log n の傾き（n^k の k の目安）
+    """
+    pts = sorted(points)[-2:]
+    if len(pts) < 2 or pts[0][0] == pts[1][0] or min(t for _, t in pts) <= 0:
+        return None
+    (n0, t0), (n1, t1) = pts
+    return math.log(t1 / t0) / math.log(n1 / n0)
@@ -0,0 +1,15 @@
+"""
+コンテスト用のライブラリ
+
+    from cplib import UnionFind, Fenwick, SegTree, dijkstra
+
+setup-python.py がコンテストのディレクトリにリンクを作るので、A.py などからそのまま import できる。
+提出するときは bundle.py が使っている定義だけを 1 つのファイルに埋め込む
+"""
+
+from cplib.dijkstra import dijkstra
+from cplib.fenwick import Fenwick
+from cplib.segtree import SegTree
+from cplib.unionfind import UnionFind
+
+__all__ = ["Fenwick", "SegTree", "UnionFind", "dijkstra"]
@@ -0,0 +1,33 @@
+"""
+Dijkstra 法（辺の重みは 0 以上）
+
+    adj = [[] for _ in range(N)]
+    adj[u].append((v, w))
+    dist = dijkstra(adj, s)          # 届かない頂点は -1
+
+ヒープには (距離, 頂点) のタプルではなく 距離 * N + 頂点 の整数 1 つを入れる
+（タプルを作らず、比較も整数 1 回で済む）。
+PyPy では 距離 * N が 2^63 未満のときに整数が速いまま扱われる
+"""
+
+from heapq import heappop, heappush
+
+
+def dijkstra(adj: list[list[tuple[int, int]]], start: int) -> list[int]:
+    n = len(adj)
+    dist = [-1] * n
+    dist[start] = 0
+    heap = [start]
+    done = [False] * n
+    while heap:
+        item = heappop(heap)
+        d, u = divmod(item, n)
+        if done[u]:
+            continue
+        done[u] = True
+        for v, w in adj[u]:
+            nd = d + w
+            if dist[v] < 0 or nd < dist[v]:
+                dist[v] = nd
+                heappush(heap, nd * n + v)
+    return dist
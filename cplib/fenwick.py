@@ -0,0 +1,68 @@
+"""
+Fenwick 木（Binary Indexed Tree）: 1 点に加算・区間の和
+
+    ft = Fenwick(N)            # 0 で初期化
+    ft = Fenwick.build(A)      # A で初期化（O(N)）
+    ft.add(i, x)
+    ft.sum(l, r)               # A[l] + ... + A[r - 1]
+
+添字は 0 始まり、区間は半開区間。内部の配列は 1 始まりの平らなリスト
+"""
+
+
+class Fenwick:
+    __slots__ = ("n", "tree")
+
+    def __init__(self, n: int):
+        self.n = n
+        self.tree = [0] * (n + 1)
+
+    @classmethod
+    def build(cls, values: list[int]) -> "Fenwick":
+        ft = cls(len(values))
+        tree = ft.tree
+        tree[1:] = values
+        n = ft.n
+        for i in range(1, n + 1):
+            j = i + (i & -i)
+            if j <= n:
+                tree[j] += tree[i]
+        return ft
+
+    def add(self, i: int, x: int) -> None:
+        tree = self.tree
+        n = self.n
+        i += 1
+        while i <= n:
+            tree[i] += x
+            i += i & -i
+
+    def prefix_sum(self, r: int) -> int:
+        """
+        A[0] + ... + A[r - 1]
+        """
+        tree = self.tree
+        s = 0
+        while r > 0:
+            s += tree[r]
+            r &= r - 1
+        return s
+
+    def sum(self, l: int, r: int) -> int:
+        return self.prefix_sum(r) - self.prefix_sum(l)
+
+    def lower_bound(self, w: int) -> int:
+        """
+        A[0] + ... + A[i] >= w となる最小の i（全て 0 以上のとき。無ければ n）
+        """
+        tree = self.tree
+        n = self.n
+        i = 0
+        step = 1 << n.bit_length()
+        while step:
+            j = i + step
+            if j <= n and tree[j] < w:
+                w -= tree[j]
+                i = j
+            step >>= 1
+        return i
@@ -0,0 +1,90 @@
+"""
+セグメント木: 1 点の更新・区間の積（モノイド）
+
+    st = SegTree(A, max, -INF)          # 区間最大
+    st = SegTree([0] * N, operator.add, 0)
+    st.set(i, x)
+    st.prod(l, r)                       # op(A[l], ..., A[r - 1])
+    st.max_right(l, lambda v: v < K)
+
+区間は半開区間。葉の数を 2 のべきにした平らなリストで持ち、再帰せず下から計算する
+"""
+
+
+class SegTree:
+    __slots__ = ("n", "size", "op", "e", "data")
+
+    def __init__(self, values: list, op, e):
+        n = len(values)
+        size = 1
+        while size < n:
+            size <<= 1
+        self.n = n
+        self.size = size
+        self.op = op
+        self.e = e
+        # data[1] が根、data[size + i] が A[i]
+        data = [e] * (2 * size)
+        data[size:size + n] = values
+        for i in range(size - 1, 0, -1):
+            data[i] = op(data[2 * i], data[2 * i + 1])
+        self.data = data
+
+    def set(self, i: int, x) -> None:
+        data = self.data
+        op = self.op
+        i += self.size
+        data[i] = x
+        i >>= 1
+        while i:
+            data[i] = op(data[2 * i], data[2 * i + 1])
+            i >>= 1
+
+    def get(self, i: int):
+        return self.data[i + self.size]
+
+    def prod(self, l: int, r: int):
+        data = self.data
+        op = self.op
+        left = right = self.e
+        l += self.size
+        r += self.size
+        while l < r:
+            if l & 1:
+                left = op(left, data[l])
+                l += 1
+            if r & 1:
+                r -= 1
+                right = op(data[r], right)
+            l >>= 1
+            r >>= 1
+        return op(left, right)
+
+    def all_prod(self):
+        return self.data[1]
+
+    def max_right(self, l: int, f) -> int:
+        """
+        f(op(A[l], ..., A[r - 1])) が True となる最大の r（f(e) は True であること）
+        """
+        if l == self.n:
+            return self.n
+        data = self.data
+        op = self.op
+        size = self.size
+        l += size
+        acc = self.e
+        while True:
+            while l % 2 == 0:
+                l >>= 1
+            if not f(op(acc, data[l])):
+                while l < size:
+                    l *= 2
+                    if f(op(acc, data[l])):
+                        acc = op(acc, data[l])
+                        l += 1
+                return l - size
+            acc = op(acc, data[l])
+            l += 1
+            if l & -l == l:
+                return self.n
@@ -0,0 +1,56 @@
+"""
+Union-Find（素集合データ構造）
+
+    uf = UnionFind(N)
+    uf.union(a, b)
+    if uf.same(a, b): ...
+    uf.size(a)
+
+親の配列 1 本だけで持つ（根は -(要素数)）。find はループで経路を縮める（再帰しない）
+"""
+
+
+class UnionFind:
+    __slots__ = ("n", "parent")
+
+    def __init__(self, n: int):
+        self.n = n
+        # 根なら -(集合の要素数)、それ以外は親
+        self.parent = [-1] * n
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        root = x
+        while parent[root] >= 0:
+            root = parent[root]
+        while parent[x] >= 0 and parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        """
+        return: 別の集合だったものを繋いだら True
+        """
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return False
+        parent = self.parent
+        # 小さい方を大きい方に繋ぐ
+        if parent[a] > parent[b]:
+            a, b = b, a
+        parent[a] += parent[b]
+        parent[b] = a
+        return True
+
+    def same(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+    def size(self, x: int) -> int:
+        return -self.parent[self.find(x)]
+
+    def groups(self) -> list[list[int]]:
+        members = [[] for _ in range(self.n)]
+        for x in range(self.n):
+            members[self.find(x)].append(x)
+        return [m for m in members if m]
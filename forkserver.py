@@ -0,0 +1,344 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+よく使うモジュールを import 済みの Python プロセスを常駐させ、
+テストケースごとに fork して解答プログラムを実行する
+
+インタプリタの起動と import の時間を毎回払わずに済む。
+fork した子プロセスで実行するので、分離の度合いは subprocess と同じ
+（標準入出力・環境変数・カレントディレクトリ・sys.modules は子ごとに独立）
+
+    with ForkServer() as server:
+        result = server.run("A.py", "3\n1 2 3\n", timeout=2.0)
+
+result の形式は runner.run_measured と同じ
+"""
+
+import json
+import os
+import select
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from runner import OUTPUT_PREVIEW, read_output
+
+# サーバ起動時に import しておくモジュール（無いものは飛ばす）
+PRELOAD = (
+    "array", "bisect", "collections", "copy", "decimal", "fractions",
+    "functools", "heapq", "itertools", "math", "operator", "random", "re",
+    "string", "typing",
+    # AtCoder の Python 環境にあるもの
+    "numpy", "sortedcontainers", "more_itertools",
+)
+
+_HEADER = struct.Struct("!I")
+
+
+def _send(sock, obj) -> None:
+    data = json.dumps(obj).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock, n: int) -> bytes | None:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            return None
+        buf += chunk
+    return bytes(buf)
+
+
+def _recv(sock):
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    data = _recv_exact(sock, _HEADER.unpack(header)[0])
+    if data is None:
+        return None
+    return json.loads(data.decode("utf-8"))
+
+
+# -----------------------------
+# クライアント
+# -----------------------------
+
+
+class ForkServer:
+    """
+    常駐プロセスを 1 つ起動して、run() のたびに fork させる
+    1 つのサーバは同時に 1 ケースだけ実行する（並列にするなら複数起動する）
+    """
+
+    def __init__(self, python: str | None = None, preload=PRELOAD):
+        self.python = python or sys.executable
+        parent, child = socket.socketpair()
+        self._proc = subprocess.Popen(
+            [self.python, os.path.abspath(__file__),
+             "--serve", str(child.fileno()), ",".join(preload)],
+            pass_fds=(child.fileno(),),
+            stdin=subprocess.DEVNULL,
+        )
+        child.close()
+        self._sock = parent
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        script: str,
+        input_data: str,
+        timeout: float | None = None,
+        env: dict[str, str] | None = None,
+        argv: list[str] | None = None,
+        cwd: str | None = None,
+        memory_limit_mb: int | None = None,
+        stdout_path: str | None = None,
+    ) -> dict:
+        """
+        runner.run_measured と同じ形の結果を返す（stdout_path も同じ意味）
+        """
+        request = {
+            "script": os.path.abspath(script),
+            "input": input_data,
+            "timeout": timeout,
+            "env": env,
+            "argv": argv or [],
+            "cwd": cwd,
+            "memory_limit_mb": memory_limit_mb,
+            "stdout_path": stdout_path and os.path.abspath(stdout_path),
+        }
+        with self._lock:
+            _send(self._sock, request)
+            result = _recv(self._sock)
+        if result is None:
+            raise RuntimeError("fork server terminated unexpectedly")
+        return result
+
+    def close(self) -> None:
+        self._sock.close()
+        try:
+            self._proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -----------------------------
+# サーバ
+# -----------------------------
+
+
+def _preload(modules) -> None:
+    for name in modules:
+        if not name:
+            continue
+        try:
+            __import__(name)
+        except Exception:
+            pass
+
+
+def _exec_child(request, f_in, f_out, f_err):
+    """
+    fork した子プロセス側：標準入出力を差し替えてスクリプトを実行する
+    （この関数からは戻らない）
+    """
+    import runpy
+    import traceback
+
+    code = 0
+    try:
+        os.dup2(f_in.fileno(), 0)
+        os.dup2(f_out.fileno(), 1)
+        os.dup2(f_err.fileno(), 2)
+        sys.stdin = sys.__stdin__ = open(
+            0, "r", encoding="utf-8", closefd=False)
+        sys.stdout = sys.__stdout__ = open(
+            1, "w", encoding="utf-8", closefd=False)
+        sys.stderr = sys.__stderr__ = open(
+            2, "w", encoding="utf-8", errors="backslashreplace",
+            closefd=False)
+
+        if request.get("env") is not None:
+            os.environ.clear()
+            os.environ.update(request["env"])
+        if request.get("cwd"):
+            os.chdir(request["cwd"])
+        if request.get("memory_limit_mb"):
+            # MLE は親が max_rss_kb で判定する。ここでは余裕のある上限だけ付ける
+            from runner import limit_memory
+
+            limit_memory(request["memory_limit_mb"])
+
+        script = request["script"]
+        sys.argv = [script] + list(request.get("argv") or [])
+        sys.path[0] = os.path.dirname(script)
+
+        try:
+            runpy.run_path(script, run_name="__main__")
+        except SystemExit as e:
+            if e.code is None:
+                code = 0
+            elif isinstance(e.code, int):
+                code = e.code
+            else:
+                print(e.code, file=sys.stderr)
+                code = 1
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except Exception:
+                pass
+        os._exit(code & 0xFF)
+
+
+def _wait_child(pid: int, timeout: float | None):
+    """
+    子プロセスの終了を待つ。timeout を過ぎたら kill する
+    return: (status, rusage, timed_out)
+    """
+    timed_out = False
+    reaped = None
+    if timeout is not None:
+        deadline = time.monotonic() + timeout
+        pidfd = None
+        if hasattr(os, "pidfd_open"):
+            try:
+                pidfd = os.pidfd_open(pid)
+            except OSError:
+                pidfd = None
+        if pidfd is not None:
+            ready, _, _ = select.select([pidfd], [], [], timeout)
+            os.close(pidfd)
+            timed_out = not ready
+        else:
+            # WNOHANG で回収できたらその結果を使う（もう一度 wait4 すると ECHILD）
+            while time.monotonic() < deadline:
+                reaped = os.wait4(pid, os.WNOHANG)
+                if reaped[0]:
+                    break
+                time.sleep(0.001)
+            else:
+                timed_out = True
+        if timed_out:
+            os.kill(pid, signal.SIGKILL)
+
+    if not reaped or not reaped[0]:
+        reaped = os.wait4(pid, 0)
+    _, status, usage = reaped
+    return status, usage, timed_out
+
+
+def _handle(request) -> dict:
+    stdout_path = request.get("stdout_path")
+    with tempfile.TemporaryFile() as f_in, \
+            (open(stdout_path, "w+b") if stdout_path
+             else tempfile.TemporaryFile()) as f_out, \
+            tempfile.TemporaryFile() as f_err:
+        f_in.write(request["input"].encode("utf-8"))
+        f_in.seek(0)
+
+        started = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            _exec_child(request, f_in, f_out, f_err)
+
+        status, usage, timed_out = _wait_child(pid, request.get("timeout"))
+        wall = time.perf_counter() - started
+
+        stdout, truncated = read_output(
+            f_out, OUTPUT_PREVIEW if stdout_path else None)
+        stderr, _ = read_output(f_err)
+        return {
+            "returncode": os.waitstatus_to_exitcode(status),
+            "stdout": stdout,
+            "stderr": stderr,
+            "wall": wall,
+            "cpu": usage.ru_utime + usage.ru_stime,
+            "max_rss_kb": usage.ru_maxrss,
+            "timed_out": timed_out,
+            "stdout_truncated": truncated,
+        }
+
+
+def serve(fd: int, preload) -> None:
+    _preload(preload)
+    sock = socket.socket(fileno=fd)
+    while True:
+        request = _recv(sock)
+        if request is None:
+            break
+        _send(sock, _handle(request))
+
+
+# -----------------------------
+# ベンチマーク
+# -----------------------------
+
+
+def bench(script: str, input_data: str, n: int) -> None:
+    from statistics import mean, median
+
+    from runner import run_measured
+
+    def measure(fn):
+        times = []
+        for _ in range(n):
+            started = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - started)
+        return times
+
+    cold = measure(
+        lambda: run_measured([sys.executable, script], input_data))
+    with ForkServer() as server:
+        server.run(script, input_data)  # 1 回目は捨てる
+        warm = measure(lambda: server.run(script, input_data))
+
+    print(f"⏱️  {n} run(s) of {script}")
+    for name, times in (("subprocess.run", cold), ("fork server", warm)):
+        print(f"  {name:<15} mean {mean(times) * 1000:7.2f} ms   "
+              f"median {median(times) * 1000:7.2f} ms")
+    print(f"  speedup: x{median(cold) / median(warm):.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "--serve":
+        serve(int(sys.argv[2]), sys.argv[3].split(",") if len(sys.argv) > 3
+              else PRELOAD)
+        sys.exit(0)
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="compare per-case latency of subprocess.run "
+                    "and the fork server"
+    )
+    parser.add_argument("script", help="solution to run (e.g. A.py)")
+    parser.add_argument("--input", help="input file (default: empty input)")
+    parser.add_argument("-n", type=int, default=50,
+                        help="number of runs (default: 50)")
+    args = parser.parse_args()
+
+    data = ""
+    if args.input:
+        with open(args.input, encoding="utf-8") as f:
+            data = f.read()
+    bench(args.script, data, args.n)
@@ -0,0 +1,381 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Java の解答を gradle を使わずに javac でコンパイルして実行する
+
+コンパイル結果（.class）はソースのハッシュごとに保存するので、
+ソースを変更しない限り javac は 1 回しか実行しない。
+同じソースを複数のスレッドから同時にコンパイルしようとしても、javac は 1 回だけ
+
+    compiled = compile_java("ABC439/src/main/java/abc439/A.java")
+    if compiled["ok"]:
+        result = run_java(compiled, "3\n1 2 3\n", timeout=2.0)
+
+JvmServer は JVM を 1 つ常駐させ、入力ごとに main() を呼ぶ（JvmHarness.java）。
+JVM の起動と JIT のウォームアップを毎回払わずに済む
+
+    with JvmServer(compiled) as server:
+        result = server.run("A.java", "3\n1 2 3\n", timeout=2.0)
+
+result の形式は runner.run_measured と同じ
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import struct
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+from result_cache import interpreter_id
+from runner import run_measured
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "javac"
+
+# コンパイル結果をこの数まで残す（古いものから削除する）
+MAX_ENTRIES = 200
+
+HARNESS_SOURCE = Path(__file__).resolve().parent / "JvmHarness.java"
+
+# JvmHarness.java との間の要求・応答のヘッダ
+_REQUEST = struct.Struct("!i")
+_RESPONSE = struct.Struct("!iqqii")  # status, wall_ns, cpu_ns, stdout, stderr
+_OK, _EXCEPTION, _EXIT = 0, 1, 2
+
+# AtCoder の実行オプションに近づける
+JAVA_OPTS = ["-XX:+UseSerialGC", "-Xss512m", "-DONLINE_JUDGE=true"]
+
+_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def cache_dir() -> Path:
+    return Path(os.environ.get("ATCODER_JAVAC_CACHE") or DEFAULT_CACHE_DIR)
+
+
+def main_class(source: Path) -> str:
+    """
+    "package abc439;" があれば "abc439.A"、無ければ "A"
+    """
+    text = source.read_text(encoding="utf-8")
+    m = re.search(r"^\s*package\s+([\w.]+)\s*;", text, re.M)
+    return f"{m.group(1)}.{source.stem}" if m else source.stem
+
+
+def source_key(source: Path, javac: str = "javac") -> str:
+    digest = hashlib.sha256()
+    digest.update(source.read_bytes())
+    digest.update(source.name.encode("utf-8"))
+    # JDK を入れ替えたらコンパイルし直す
+    digest.update(interpreter_id(javac).encode("utf-8"))
+    return digest.hexdigest()[:24]
+
+
+def _lock(key: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def _prune(root: Path) -> None:
+    entries = sorted((p for p in root.iterdir() if p.is_dir()),
+                     key=lambda p: p.stat().st_mtime)
+    for old in entries[:max(0, len(entries) - MAX_ENTRIES)]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def compile_java(source, javac: str = "javac") -> dict:
+    """
+    source をコンパイルする（同じソースのコンパイル結果があればそれを使う）
+
+    return:
+      {
+        "ok": True,
+        "class_dir": "<cache>/<hash>",   # -cp に渡す
+        "main_class": "abc439.A",
+        "output": "...",                 # javac の出力（コンパイルエラーなど）
+        "cached": True,                  # javac を実行しなかった
+        "elapsed": 0.0,                  # javac の時間（秒）
+      }
+    """
+    source = Path(source).resolve()
+    key = source_key(source, javac)
+    out = cache_dir() / key
+    meta = out / "compile.json"
+
+    with _lock(key):
+        if meta.exists():
+            result = json.loads(meta.read_text(encoding="utf-8"))
+            os.utime(out)
+            return {**result, "class_dir": str(out), "cached": True}
+
+        started = time.perf_counter()
+        tmp = out.with_name(f"{key}.tmp-{os.getpid()}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        try:
+            p = subprocess.run(
+                [javac, "-encoding", "UTF-8", "-d", str(tmp), str(source)],
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+            )
+            ok, output = p.returncode == 0, p.stdout
+        except OSError as e:
+            shutil.rmtree(tmp, ignore_errors=True)
+            return {"ok": False, "class_dir": None,
+                    "main_class": source.stem,
+                    "output": f"{javac}: {e.strerror}", "cached": False,
+                    "elapsed": 0.0}
+
+        result = {"ok": ok, "main_class": main_class(source),
+                  "output": output,
+                  "elapsed": time.perf_counter() - started}
+        # コンパイルエラーも保存する（同じソースで javac をやり直さない）
+        (tmp / "compile.json").write_text(json.dumps(result),
+                                          encoding="utf-8")
+        try:
+            os.replace(tmp, out)
+        except OSError:
+            # 別のプロセスが先に保存した
+            shutil.rmtree(tmp, ignore_errors=True)
+        _prune(out.parent)
+        return {**result, "class_dir": str(out), "cached": False}
+
+
+def java_command(compiled: dict, memory_limit_mb: int | None = None,
+                 java: str = "java") -> list[str]:
+    cmd = [java, *JAVA_OPTS]
+    if memory_limit_mb is not None:
+        # JVM は仮想メモリを大きく予約するので RLIMIT_AS ではなくヒープで制限する
+        cmd.append(f"-Xmx{memory_limit_mb}m")
+    return cmd + ["-cp", compiled["class_dir"], compiled["main_class"]]
+
+
+def run_java(compiled: dict, input_data: str, timeout: float | None = None,
+             memory_limit_mb: int | None = None, java: str = "java") -> dict:
+    """
+    コンパイル済みの解答を 1 回実行する（戻り値は runner.run_measured と同じ）
+    """
+    return run_measured(java_command(compiled, memory_limit_mb, java),
+                        input_data, timeout=timeout)
+
+
+# -----------------------------
+# 常駐 JVM
+# -----------------------------
+
+
+class JvmServer:
+    """
+    JvmHarness を 1 つ起動して、run() のたびに解答の main() を呼ばせる
+    1 つのサーバは同時に 1 ケースだけ実行する（並列にするなら複数起動する）
+
+    TLE したとき・System.exit() されたときは JVM を終了させ、次の run() で起動し直す
+    """
+
+    def __init__(self, compiled: dict, memory_limit_mb: int | None = None,
+                 java: str = "java", javac: str = "javac"):
+        harness = compile_java(HARNESS_SOURCE, javac)
+        if not harness["ok"]:
+            raise RuntimeError(f"cannot compile {HARNESS_SOURCE.name}:\n"
+                               f"{harness['output']}")
+        self.cmd = [java, *JAVA_OPTS]
+        if memory_limit_mb is not None:
+            self.cmd.append(f"-Xmx{memory_limit_mb}m")
+        self.cmd += ["-cp", harness["class_dir"], harness["main_class"],
+                     compiled["class_dir"], compiled["main_class"]]
+        self._proc = None
+        self._lock = threading.Lock()
+        self._start()
+
+    def _start(self) -> None:
+        self._proc = subprocess.Popen(
+            self.cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def _read_exact(self, n: int) -> bytes | None:
+        buf = bytearray()
+        while len(buf) < n:
+            chunk = self._proc.stdout.read(n - len(buf))
+            if not chunk:
+                return None
+            buf += chunk
+        return bytes(buf)
+
+    def _stop(self) -> int:
+        self._proc.kill()
+        returncode = self._proc.wait()
+        self._proc = None
+        return returncode
+
+    def run(
+        self,
+        script: str,
+        input_data: str,
+        timeout: float | None = None,
+        env: dict[str, str] | None = None,
+        memory_limit_mb: int | None = None,
+    ) -> dict:
+        """
+        script・env・memory_limit_mb は ForkServer と揃えるための引数
+        （解答と -Xmx は起動時に決まる）
+        """
+        data = input_data.encode("utf-8")
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._start()
+            proc = self._proc
+
+            timed_out = threading.Event()
+
+            def kill():
+                timed_out.set()
+                proc.kill()
+
+            timer = threading.Timer(timeout, kill) if timeout else None
+            started = time.perf_counter()
+            if timer is not None:
+                timer.start()
+            try:
+                proc.stdin.write(_REQUEST.pack(len(data)) + data)
+                proc.stdin.flush()
+                header = self._read_exact(_RESPONSE.size)
+                status, wall_ns, cpu_ns, n_out, n_err = \
+                    _RESPONSE.unpack(header) if header else (None,) * 5
+                out = self._read_exact(n_out) if header else None
+                err = self._read_exact(n_err) if header else None
+            except OSError:
+                header = out = err = None
+            finally:
+                if timer is not None:
+                    timer.cancel()
+            wall = time.perf_counter() - started
+
+            if timed_out.is_set() or header is None or out is None \
+                    or err is None:
+                # TLE か、JVM が落ちた（どちらも JVM は起動し直す）
+                returncode = self._stop()
+                return {
+                    "returncode": returncode,
+                    "stdout": "",
+                    "stderr": "" if timed_out.is_set()
+                    else "JVM terminated unexpectedly",
+                    "wall": wall,
+                    "cpu": None,
+                    "max_rss_kb": None,
+                    "timed_out": timed_out.is_set(),
+                }
+
+            if status == _EXIT:
+                # System.exit() の終了コード
+                returncode = proc.wait()
+                self._proc = None
+            else:
+                returncode = 0 if status == _OK else 1
+            return {
+                "returncode": returncode,
+                "stdout": out.decode("utf-8", errors="replace"),
+                "stderr": err.decode("utf-8", errors="replace"),
+                "wall": wall_ns / 1e9,
+                "cpu": cpu_ns / 1e9 if cpu_ns > 0 else None,
+                "max_rss_kb": None,
+                "timed_out": False,
+            }
+
+    def close(self) -> None:
+        if self._proc is None:
+            return
+        self._proc.stdin.close()
+        try:
+            self._proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+        self._proc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -----------------------------
+# ベンチマーク
+# -----------------------------
+
+
+def bench(source: str, n: int, gradle: bool = True) -> None:
+    """
+    全ての入力例の結果が出るまでの時間を比べる
+      - gradle test --tests ATest（cleanTest で毎回テストを実行させる）
+      - javac（キャッシュ）+ 入力例ごとに java を起動
+      - javac（キャッシュ）+ 常駐 JVM（起動を含む）
+    """
+    from statistics import median
+
+    from validate import contest_dir_of_source, load_examples
+
+    source = Path(source).resolve()
+    contest_dir = contest_dir_of_source(source)
+    cases = load_examples(contest_dir).get(source.stem, [])
+    if not cases:
+        raise SystemExit(f"no samples for {source.name} in examples/")
+
+    def measure(fn):
+        times = []
+        for _ in range(n):
+            started = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - started)
+        return median(times)
+
+    compiled = compile_java(source)
+    if not compiled["ok"]:
+        raise SystemExit(compiled["output"])
+
+    def per_process():
+        for case in cases:
+            run_java(compiled, case["input"])
+
+    def persistent():
+        with JvmServer(compiled) as server:
+            for case in cases:
+                server.run(str(source), case["input"])
+
+    rows = []
+    if gradle:
+        cmd = ["./gradlew" if (contest_dir / "gradlew").exists()
+               else "gradle", "cleanTest", "test",
+               "--tests", f"{source.stem}Test", "--console=plain"]
+        rows.append(("gradle test", measure(lambda: subprocess.run(
+            cmd, cwd=contest_dir, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL))))
+    rows.append(("java per sample", measure(per_process)))
+    rows.append(("persistent JVM", measure(persistent)))
+
+    print(f"⏱️  {len(cases)} sample(s) of {source.name}, median of {n} run(s)"
+          f" (javac {compiled['elapsed'] * 1000:.0f} ms, once per change)")
+    for name, t in rows:
+        print(f"  {name:<16} {t * 1000:8.0f} ms   x{rows[0][1] / t:.1f}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="compare gradle test with javac + java and with a "
+                    "persistent JVM on the samples of one problem"
+    )
+    parser.add_argument("source",
+                        help="solution (e.g. src/main/java/abc439/A.java)")
+    parser.add_argument("-n", type=int, default=5,
+                        help="number of runs (default: 5)")
+    parser.add_argument("--no-gradle", action="store_true",
+                        help="skip gradle test")
+    args = parser.parse_args()
+    bench(args.source, args.n, gradle=not args.no_gradle)
@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+出力の判定: 空白・改行で区切ったトークンを先頭から順に比べる
+
+    from judge import check, describe
+    mismatch = check(output, expected)                       # 完全一致
+    mismatch = check(output, expected, abs_tol=1e-6, rel_tol=1e-6)
+    mismatch = check(output, expected, input_data=inp, checker="checker_a.py")
+    if mismatch is not None:
+        print(describe(mismatch))   # line 3, token 2: expected 0.5, got 0.6
+
+    python judge.py A.out examples/A_1.out --tolerance 1e-6
+
+  - 出力全体を split() したり改行を置き換えたりせず、少しずつ読みながら比べて、
+    最初に違うトークンで止まる（数 MB の出力でも、違いがあればそこまでしか読まない）
+  - 誤差を許す問題では、数値のトークンを絶対誤差・相対誤差のどちらかが許容範囲なら一致とする
+  - 特別なジャッジ（答えが複数ある問題など）は checker に任せる:
+      checker 入力のファイル 出力のファイル 想定解のファイル
+    終了コード 0 なら正解、それ以外なら不正解（checker の出力を理由として表示する）
+"""
+
+import argparse
+import codecs
+import math
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from collections import deque
+from pathlib import Path
+
+CHUNK_SIZE = 1 << 16
+
+_TOKEN = re.compile(r"\S+")
+_NUMBER = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+
+
+# -----------------------------
+# トークン
+# -----------------------------
+
+
+def _chunks(source):
+    """
+    文字列・バイト列・ファイルを少しずつ返す
+    """
+    if isinstance(source, (str, bytes)):
+        text = source.decode("utf-8", "replace") \
+            if isinstance(source, bytes) else source
+        for start in range(0, len(text), CHUNK_SIZE):
+            yield text[start:start + CHUNK_SIZE]
+        return
+    # バイナリのファイルは、チャンクの境目で切れた文字も正しく読めるように少しずつ decode する
+    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+    while chunk := source.read(CHUNK_SIZE):
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+
+
+def lines(source):
+    """
+    (行番号, その行のトークンのリスト) を順に返す（行番号は 1 始まり）
+    """
+    lineno = 0
+    rest = ""
+    for chunk in _chunks(source):
+        parts = (rest + chunk).split("\n")
+        rest = parts.pop()
+        for line in parts:
+            lineno += 1
+            yield lineno, line.split()
+    if rest:
+        yield lineno + 1, rest.split()
+
+
+def tokens(source):
+    """
+    (行番号, 行の中で何番目か, トークン) を順に返す（どちらも 1 始まり）
+    """
+    for lineno, words in lines(source):
+        for index, word in enumerate(words, 1):
+            yield lineno, index, word
+
+
+# -----------------------------
+# 比較
+# -----------------------------
+
+
+def same_token(got: str, expected: str, abs_tol: float | None = None,
+               rel_tol: float | None = None) -> bool:
+    if got == expected:
+        return True
+    if abs_tol is None and rel_tol is None:
+        return False
+    if not (_NUMBER.fullmatch(got) and _NUMBER.fullmatch(expected)):
+        return False
+    g, e = float(got), float(expected)
+    if not (math.isfinite(g) and math.isfinite(e)):
+        return False
+    diff = abs(g - e)
+    # AtCoder の「絶対誤差または相対誤差が 10^{-6} 以下」
+    return (abs_tol is not None and diff <= abs_tol) or \
+        (rel_tol is not None and diff <= rel_tol * abs(e))
+
+
+def first_mismatch(output, expected, abs_tol: float | None = None,
+                   rel_tol: float | None = None) -> dict | None:
+    """
+    最初に違うトークン。一致すれば None
+
+    return: {"line", "token"（出力の何行目の何番目か）,
+             "expected", "got"（足りない・余計な場合は None）}
+    """
+    got_lines = lines(output)
+    expected_lines = lines(expected)
+    # 行の区切り方が違うときに、次の行へ持ち越すトークン
+    got_rest = deque()  # (行番号, 何番目か, トークン)
+    expected_rest = deque()
+    last = (1, 0)  # 最後に比べた出力のトークンの位置
+
+    def mismatch(position, want, got):
+        return {"line": position[0], "token": position[1],
+                "expected": want, "got": got}
+
+    while True:
+        if not got_rest and not expected_rest:
+            got = next(got_lines, None)
+            want = next(expected_lines, None)
+            if got is None and want is None:
+                return None
+            if got is not None and want is not None:
+                lineno, words = got
+                # ほとんどの行は 1 回のリストの比較で済む
+                if words == want[1]:
+                    if words:
+                        last = (lineno, len(words))
+                    continue
+                if len(words) == len(want[1]):
+                    for index, (word, w) in enumerate(zip(words, want[1]),
+                                                      1):
+                        if not same_token(word, w, abs_tol, rel_tol):
+                            return mismatch((lineno, index), w, word)
+                    last = (lineno, len(words))
+                    continue
+        else:
+            got = next(got_lines, None) if not got_rest else None
+            want = next(expected_lines, None) if not expected_rest else None
+            if not got_rest and got is None:
+                return mismatch((last[0], last[1] + 1), expected_rest[0],
+                                None)
+            if not expected_rest and want is None:
+                return mismatch(got_rest[0][:2], None, got_rest[0][2])
+        if got is not None:
+            got_rest.extend((got[0], index, word)
+                            for index, word in enumerate(got[1], 1))
+        if want is not None:
+            expected_rest.extend(want[1])
+
+        while got_rest and expected_rest:
+            lineno, index, word = got_rest.popleft()
+            w = expected_rest.popleft()
+            if not same_token(word, w, abs_tol, rel_tol):
+                return mismatch((lineno, index), w, word)
+            last = (lineno, index)
+
+
+def checker_command(checker) -> list[str]:
+    checker = str(checker)
+    if checker.endswith(".py"):
+        return [sys.executable, checker]
+    return [checker]
+
+
+def run_checker(checker, output: str, expected: str, input_data: str = "",
+                timeout: float | None = None) -> dict | None:
+    """
+    特別なジャッジを実行する。正解なら None
+    output / expected は文字列かバイナリのファイル
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for name, text in (("input", input_data), ("output", output),
+                           ("expected", expected)):
+            path = Path(tmp) / name
+            if text is None or isinstance(text, str):
+                path.write_text(text or "", encoding="utf-8")
+            elif isinstance(text, bytes):
+                path.write_bytes(text)
+            else:
+                with open(path, "wb") as f:
+                    shutil.copyfileobj(text, f)
+            paths.append(str(path))
+        try:
+            p = subprocess.run(checker_command(checker) + paths,
+                               stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT, text=True,
+                               timeout=timeout)
+        except subprocess.TimeoutExpired:
+            message = f"checker timed out after {timeout} s"
+        except OSError as e:
+            message = f"cannot run checker {checker}: {e.strerror}"
+        else:
+            if p.returncode == 0:
+                return None
+            message = p.stdout.strip() or f"checker exited with {p.returncode}"
+    return {"line": None, "token": None, "expected": None, "got": None,
+            "message": message}
+
+
+def check(output, expected, input_data: str = "",
+          abs_tol: float | None = None, rel_tol: float | None = None,
+          checker=None, timeout: float | None = None) -> dict | None:
+    """
+    output が正解なら None、そうでなければ最初の違い（first_mismatch / run_checker）
+    """
+    if checker:
+        return run_checker(checker, output, expected, input_data, timeout)
+    # ほとんどの AC は文字列として同じなので、トークンに分けずに済ませる
+    if isinstance(output, str) and isinstance(expected, str) and \
+            output.strip() == expected.strip():
+        return None
+    return first_mismatch(output, expected, abs_tol, rel_tol)
+
+
+def describe(mismatch: dict, width: int = 30) -> str:
+    """
+    "line 3, token 2: expected 0.5, got 0.6" のような 1 行の説明
+    """
+    if mismatch.get("message"):
+        # 1 行のメッセージか、checker が落ちたときの Traceback の最後の行
+        return mismatch["message"].splitlines()[-1][:width * 2]
+
+    def short(token):
+        return token if len(token) <= width else token[:width - 1] + "…"
+
+    where = f"line {mismatch['line']}, token {mismatch['token']}"
+    if mismatch["got"] is None:
+        return f"{where}: expected {short(mismatch['expected'])}, " \
+               "but the output ended"
+    if mismatch["expected"] is None:
+        return f"{where}: extra output {short(mismatch['got'])}"
+    return f"{where}: expected {short(mismatch['expected'])}, " \
+           f"got {short(mismatch['got'])}"
+
+
+def judging_options(problem: dict | None = None, tolerance=None,
+                    checker=None) -> dict:
+    """
+    check() に渡すオプション。tolerance を省略すると $ATCODER_TOLERANCE、
+    それも無ければ問題文から取った誤差（setup.py が保存した "tolerance"）を使う
+    """
+    if tolerance is None:
+        tolerance = os.environ.get("ATCODER_TOLERANCE") or None
+    if tolerance is None and problem:
+        tolerance = problem.get("tolerance")
+    tolerance = float(tolerance) if tolerance is not None else None
+    return {"abs_tol": tolerance, "rel_tol": tolerance, "checker": checker}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="compare an output with the expected one token by token"
+    )
+    parser.add_argument("output", help="output file")
+    parser.add_argument("expected", help="expected output file")
+    parser.add_argument("--tolerance", type=float,
+                        help="accept numbers within this absolute or "
+                             "relative error (e.g. 1e-6)")
+    parser.add_argument("--checker",
+                        help="special judge: run as CHECKER input output "
+                             "expected, exit code 0 means accepted")
+    parser.add_argument("--input", default=os.devnull,
+                        help="input file for --checker")
+    args = parser.parse_args()
+
+    if args.checker:
+        mismatch = check(Path(args.output).read_text(encoding="utf-8"),
+                         Path(args.expected).read_text(encoding="utf-8"),
+                         Path(args.input).read_text(encoding="utf-8"),
+                         checker=args.checker)
+    else:
+        with open(args.output, "rb") as out, open(args.expected, "rb") as exp:
+            mismatch = first_mismatch(out, exp, args.tolerance,
+                                      args.tolerance)
+    if mismatch is None:
+        print("✅ AC")
+        raise SystemExit(0)
+    print(f"❌ WA, {describe(mismatch)}")
+    raise SystemExit(1)
@@ -0,0 +1,544 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+制約と入力形式から最大サイズの入力を作り、解答の実行時間を測る
+
+コンテストのディレクトリで実行する:
+
+    python ../maxcase.py A.py
+
+examples/ に次の入力を作り、問題の実行時間制限で解答を実行する
+  - A_max1.in:  サイズも値も上限
+  - A_rand1.in: サイズは上限・値はランダム（--random で個数を指定）
+
+入力形式は setup.py が保存した「入力」の <pre> から読み取る。対応している形:
+  - 1 行に変数を並べる      N M
+  - 横に並ぶ配列            A_1 A_2 \\ldots A_N
+  - \\vdots で縦に続く行     u_1 v_1 / \\vdots / u_M v_M
+  - 文字列                  S（長さは制約の |S| から）
+  - 文字のグリッド          S_{1,1}S_{1,2}\\ldots S_{1,W} / \\vdots / ...
+
+総和の制約（N の総和 ≤ 2×10^5 など）や、値どうしの関係（相異なる、u_i < v_i、
+グラフが木である など）は考慮しない。必要なら作られたファイルを手で直す
+"""
+
+import argparse
+import random
+import re
+import string
+import sys
+import time
+from pathlib import Path
+
+from cache_store import get_store
+from runner import run_measured
+from scrape import eval_bound, parse_constraint_bounds
+from validate import format_mb, format_ms, is_mle, load_limits
+
+# numpy があれば乱数と文字列化をまとめて行う
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INT64_MAX = 2**63 - 1
+
+_TOKEN = re.compile(r"\.\.\.|[A-Za-z]+(?:_(?:\{[^}]*\}|[A-Za-z0-9]))?|\S")
+_VAR = re.compile(r"([A-Za-z]+)(?:_(?:\{([^}]*)\}|([A-Za-z0-9])))?")
+
+
+# -----------------------------
+# 入力形式の解析
+# -----------------------------
+
+
+def _tokens(line: str) -> tuple[list[tuple], str]:
+    """
+    1 行を変数と "..." に分ける
+
+    return: (tokens, sep)
+      token: ("var", "A", ["1"]) / ("dots",)
+      sep:   変数どうしの区切り（空白なしで並ぶ文字のグリッドなら ""）
+    """
+    line = re.sub(r"\\(?:ldots|cdots|dots)", " ... ", line)
+    line = re.sub(r"\\(?:mathrm|rm|text|mathit)\{([^}]*)\}", r"\1", line)
+    line = re.sub(r"\\[,;: ]|~", " ", line)
+
+    tokens: list[tuple] = []
+    sep = " "
+    end = -1
+    for m in _TOKEN.finditer(line):
+        text = m.group()
+        if text == "...":
+            tokens.append(("dots",))
+            end = -1
+            continue
+        v = _VAR.fullmatch(text)
+        if not v:
+            raise ValueError(f"unsupported token in input format: {text!r}")
+        if m.start() == end:
+            sep = ""
+        end = m.end()
+        sub = v.group(2) if v.group(2) is not None else v.group(3)
+        subs = [s.strip() for s in sub.split(",")] if sub else []
+        tokens.append(("var", v.group(1), subs))
+    return tokens, sep
+
+
+def _varying_axis(a: tuple, b: tuple) -> int | None:
+    """
+    同じ配列の 2 つの要素（A_{1,j} と A_{N,j} など）で、添字が異なる位置
+    """
+    if a[0] != "var" or b[0] != "var" or a[1] != b[1] \
+            or len(a[2]) != len(b[2]):
+        return None
+    diff = [k for k, (x, y) in enumerate(zip(a[2], b[2])) if x != y]
+    return diff[0] if len(diff) == 1 else None
+
+
+def _items(tokens: list[tuple]) -> list[dict]:
+    """
+    横に並ぶ X_1 X_2 ... X_N を 1 つの配列にまとめる
+
+    item:
+      {"kind": "scalar", "base": "N", "subs": []}
+      {"kind": "array", "base": "A", "subs": ["1"], "axis": 0,
+       "start": "1", "end": "N"}
+    """
+    items: list[dict] = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token[0] != "dots":
+            items.append({"kind": "scalar", "base": token[1],
+                          "subs": token[2]})
+            i += 1
+            continue
+
+        if not items or items[-1]["kind"] != "scalar" or i + 1 >= len(tokens):
+            raise ValueError("cannot parse '\\ldots' in input format")
+        first = items.pop()
+        last = tokens[i + 1]
+        axis = _varying_axis(("var", first["base"], first["subs"]), last)
+        if axis is None:
+            raise ValueError(
+                f"cannot parse '{first['base']} \\ldots {last}' "
+                "in input format")
+        # X_1 X_2 \ldots X_N の X_2 より前の要素もまとめる
+        while items and items[-1]["kind"] == "scalar" and _varying_axis(
+            ("var", items[-1]["base"], items[-1]["subs"]),
+            ("var", first["base"], first["subs"]),
+        ) == axis:
+            first = items.pop()
+        items.append({
+            "kind": "array", "base": first["base"], "subs": first["subs"],
+            "axis": axis, "start": first["subs"][axis],
+            "end": last[2][axis],
+        })
+        i += 2
+    return items
+
+
+def _row_axis(first: list[dict], last: list[dict]) -> tuple[str, str] | None:
+    """
+    \\vdots の前後の行を比べて、行ごとに変わる添字の (最初, 最後) を返す
+    """
+    if len(first) != len(last):
+        return None
+    for a, b in zip(first, last):
+        if a["kind"] != b["kind"] or a["base"] != b["base"]:
+            return None
+        for k, (x, y) in enumerate(zip(a["subs"], b["subs"])):
+            if a["kind"] == "array" and k == a["axis"]:
+                continue
+            if x != y:
+                return x, y
+    return None
+
+
+def parse_input_format(text: str) -> list[dict]:
+    """
+    入力形式を行ごとのブロックにする
+
+    例: "N M\\nA_1 A_2 \\ldots A_N\\nu_1 v_1\\n\\vdots\\nu_M v_M"
+      → [
+          {"items": [N, M], "sep": " ", "repeat": None},
+          {"items": [A(1..N)], "sep": " ", "repeat": None},
+          {"items": [u, v], "sep": " ", "repeat": ("1", "M")},
+        ]
+    """
+    blocks: list[dict] = []
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        if re.fullmatch(r"\\vdots|⋮|:", line):
+            blocks.append({"vdots": True})
+            continue
+        tokens, sep = _tokens(line)
+        blocks.append({"items": _items(tokens), "sep": sep, "repeat": None})
+
+    spec: list[dict] = []
+    i = 0
+    while i < len(blocks):
+        block = blocks[i]
+        if not block.get("vdots"):
+            spec.append(block)
+            i += 1
+            continue
+
+        if not spec or spec[-1]["repeat"] or i + 1 >= len(blocks):
+            raise ValueError("cannot parse '\\vdots' in input format")
+        first = spec.pop()
+        last = blocks[i + 1]
+        rows = _row_axis(first["items"], last["items"])
+        if rows is None:
+            raise ValueError("rows around '\\vdots' do not match")
+        # A_1 / A_2 / \vdots / A_N の A_2 より前の行もまとめる
+        while spec and not spec[-1]["repeat"]:
+            prev = _row_axis(spec[-1]["items"], first["items"])
+            if prev is None or prev[1] != rows[0]:
+                break
+            rows = (prev[0], rows[1])
+            first = spec.pop()
+        spec.append({**first, "repeat": rows})
+        i += 2
+    return spec
+
+
+# -----------------------------
+# 値の範囲
+# -----------------------------
+
+
+def _bounds_index(bounds: dict) -> dict:
+    """
+    {"A_i": ..., "|S|": ...} を {("A", False): ..., ("S", True): ...} にする
+    True は文字列の長さの範囲
+    """
+    index = {}
+    for key, b in bounds.items():
+        is_length = key.startswith("|")
+        base = key.strip("|").split("_")[0]
+        index.setdefault((base, is_length), b)
+    return index
+
+
+def _length_equalities(raw: list[str]) -> dict:
+    """
+    "|S_i| = W" のような長さの等式（parse_constraint_bounds は = を扱わない）
+    """
+    found = {}
+    for line in raw:
+        for m in re.finditer(
+            r"\|\s*([A-Za-z]+)(?:_\{?[^|]*?\}?)?\s*\|\s*=\s*([\w^{}]+)", line
+        ):
+            found[m.group(1)] = m.group(2).replace("{", "").replace("}", "")
+    return found
+
+
+def _alphabet(raw: list[str], base: str) -> str:
+    """
+    制約の文章から文字列に使う文字を推定する（分からなければ英小文字）
+    """
+    text = " ".join(
+        line for line in raw if re.search(rf"\b{base}(?:_|\b)", line)
+    ) or " ".join(raw)
+    if "#" in text and "." in text:
+        return ".#"
+    letters = ""
+    if "英小文字" in text or "lowercase" in text:
+        letters += string.ascii_lowercase
+    if "英大文字" in text or "uppercase" in text:
+        letters += string.ascii_uppercase
+    if "数字" in text or "digit" in text:
+        letters += string.digits
+    return letters or string.ascii_lowercase
+
+
+# -----------------------------
+# 入力の生成
+# -----------------------------
+
+
+class MaxCase:
+    """
+    入力形式と制約から入力を 1 つ作る
+
+    サイズ（添字の無い N, M などの値と文字列の長さ）はどちらの mode でも上限にする
+    scale < 1 なら、配列の長さ・行数・文字列の長さに使われる変数を上限の scale 倍にする
+    （validate.py --scaling で小さい入力から順に測るため）
+
+    mode:
+      "max":  値も上限（文字列は同じ文字の繰り返し）
+      "rand": 値はランダム
+    """
+
+    def __init__(self, spec: list[dict], constraints: dict, mode: str,
+                 seed: int = 0, scale: float = 1.0):
+        self.spec = spec
+        self.raw = constraints.get("raw", [])
+        self.bounds = constraints.get("bounds", {})
+        self.index = _bounds_index(self.bounds)
+        self.lengths = _length_equalities(self.raw)
+        self.mode = mode
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed) if np is not None else None
+        self.values: dict[str, int] = {}
+        # 一番大きいサイズ（--scaling の横軸）
+        self.n = 0
+
+        self.sizes = set(self.lengths.values())
+        for block in spec:
+            ends = [item["end"] for item in block["items"]
+                    if item["kind"] == "array"]
+            if block["repeat"]:
+                ends.append(block["repeat"][1])
+            for end in ends:
+                self.sizes.update(re.findall(r"[A-Za-z]\w*", end))
+        # "1 ≤ u_i ≤ N" の N（頂点数など、他の値の上限になる変数）もサイズとみなす
+        for line in self.raw:
+            m = re.search(r"(?:\\leq?|<|≤)\s*([A-Za-z])\s*$", line)
+            if m:
+                self.sizes.add(m.group(1))
+
+    def _refresh_bounds(self) -> None:
+        """
+        N などが決まったら、"1 ≤ u_i ≤ N" のような範囲をその値で評価し直す
+        """
+        if self.raw and self.scale < 1:
+            self.index = _bounds_index(
+                parse_constraint_bounds(self.raw, known=self.values))
+
+    def _scaled(self, lo: int, hi: int) -> int:
+        if self.scale >= 1:
+            return hi
+        return max(lo, int(round(hi * self.scale)))
+
+    # 範囲・個数
+
+    def _eval(self, expr) -> int:
+        value = eval_bound(expr, self.values)
+        if value is None:
+            raise ValueError(f"cannot evaluate {expr!r} "
+                             f"(known: {self.values})")
+        return int(value)
+
+    def _count(self, start: str, end: str) -> int:
+        return max(self._eval(end) - self._eval(start) + 1, 0)
+
+    def _range(self, base: str, siblings: list[dict]) -> tuple[int, int]:
+        b = self.index.get((base, False))
+        lo = b and b.get("min")
+        hi = b and b.get("max")
+        # "1 ≤ u_i < v_i ≤ N" のように片側しか無ければ同じ行の変数から補う
+        for item in siblings:
+            other = self.index.get((item["base"], False)) or {}
+            if lo is None:
+                lo = other.get("min")
+            if hi is None:
+                hi = other.get("max")
+        if lo is None or hi is None:
+            raise ValueError(f"no bounds for {base} in 制約")
+        return self._eval(lo), self._eval(hi)
+
+    def _is_string(self, base: str) -> bool:
+        return (base, True) in self.index or base in self.lengths
+
+    def _string_length(self, base: str) -> int:
+        if base in self.lengths:
+            length = self._eval(self.lengths[base])
+        else:
+            b = self.index[(base, True)]
+            length = self._scaled(self._eval(b.get("min") or 0),
+                                  self._eval(b["max"]))
+        self.n = max(self.n, length)
+        return length
+
+    # 値
+
+    def ints(self, lo: int, hi: int, n: int) -> list[int]:
+        if self.mode == "max":
+            return [hi] * n
+        if self.np_rng is not None and -INT64_MAX <= lo and hi < INT64_MAX:
+            return self.np_rng.integers(lo, hi, size=n, endpoint=True).tolist()
+        span = hi - lo + 1
+        if span < 2**53:
+            # randint より速い（一様性の誤差は 2^-53 程度）
+            r = self.rng.random
+            return [lo + int(r() * span) for _ in range(n)]
+        return [self.rng.randint(lo, hi) for _ in range(n)]
+
+    def text(self, alphabet: str, length: int) -> str:
+        if self.mode == "max":
+            return alphabet[0] * length
+        if self.np_rng is not None:
+            table = np.frombuffer(alphabet.encode("ascii"), dtype=np.uint8)
+            picks = self.np_rng.integers(0, len(table), size=length)
+            return table[picks].tobytes().decode("ascii")
+        return "".join(self.rng.choices(alphabet, k=length))
+
+    def column(self, item: dict, siblings: list[dict], n: int) -> list[str]:
+        """
+        item の値を n 個（行ごとに 1 つ）作る
+        """
+        base = item["base"]
+        if item["kind"] == "array":
+            count = self._count(item["start"], item["end"])
+            if self._is_string(base) or (base, False) not in self.index:
+                # 文字のグリッド: 1 行 count 文字
+                alphabet = _alphabet(self.raw, base)
+                return [self.text(alphabet, count) for _ in range(n)]
+            lo, hi = self._range(base, siblings)
+            flat = self.ints(lo, hi, n * count)
+            # 1 行分を "%d %d ... %d" % tuple(...) でまとめて文字列にする
+            fmt = " ".join(["%d"] * count)
+            return [fmt % tuple(flat[r * count:(r + 1) * count])
+                    for r in range(n)]
+
+        if self._is_string(base):
+            alphabet = _alphabet(self.raw, base)
+            return [self.text(alphabet, self._string_length(base))
+                    for _ in range(n)]
+        lo, hi = self._range(base, siblings)
+        if n == 1 and not item["subs"]:
+            # N, M, Q などの先頭の値はサイズなので rand でも上限にする
+            if base in self.sizes:
+                hi = self._scaled(lo, hi)
+                self.n = max(self.n, hi)
+            return [str(hi)]
+        return list(map(str, self.ints(lo, hi, n)))
+
+    def generate(self):
+        """
+        入力を 1 行ずつ返す
+        """
+        for block in self.spec:
+            items = block["items"]
+            sep = block["sep"]
+            if block["repeat"] is None:
+                parts = []
+                for item in items:
+                    value = self.column(item, items, 1)[0]
+                    if item["kind"] == "scalar" and not item["subs"] and \
+                            not self._is_string(item["base"]):
+                        self.values[item["base"]] = int(value)
+                    parts.append(value if item["kind"] == "scalar" or
+                                 sep == " " else value.replace(" ", ""))
+                self._refresh_bounds()
+                yield sep.join(parts) + "\n"
+                continue
+
+            n = self._count(*block["repeat"])
+            columns = [self.column(item, items, n) for item in items]
+            if sep == "":
+                columns = [[v.replace(" ", "") for v in c] for c in columns]
+            # 1 行ずつ write せず、65536 行ずつまとめて返す
+            for start in range(0, n, 65536):
+                rows = zip(*(c[start:start + 65536] for c in columns))
+                yield "\n".join(map(sep.join, rows)) + "\n"
+
+
+def write_case(path: Path, spec: list[dict], constraints: dict, mode: str,
+               seed: int) -> tuple[int, float]:
+    """
+    入力を path に書き出して (バイト数, 秒) を返す
+    """
+    started = time.perf_counter()
+    size = 0
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for chunk in MaxCase(spec, constraints, mode, seed).generate():
+            f.write(chunk)
+            size += len(chunk)
+    return size, time.perf_counter() - started
+
+
+def format_size(n: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024 or unit == "MiB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="generate max-size inputs from the scraped constraints "
+                    "and time the solution on them"
+    )
+    parser.add_argument("filename", help="solution (e.g. A.py)")
+    parser.add_argument("--random", type=int, default=2, metavar="K",
+                        help="number of random max-size inputs (default: 2)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the first random input")
+    parser.add_argument("--cmd",
+                        help="command to run instead of `python3 FILENAME`")
+    parser.add_argument("--no-run", action="store_true",
+                        help="only generate the inputs")
+    parser.add_argument("--show-spec", action="store_true",
+                        help="print the parsed input format")
+    parser.add_argument("--tl-factor", type=float, default=1.0,
+                        help="multiply the time limit by this")
+    args = parser.parse_args()
+
+    path = Path(args.filename).resolve()
+    contest, problem = path.parent.name.lower(), path.stem
+    data = get_store().get("problem", contest, problem) or {}
+    if not data.get("input_format"):
+        print(f"⚠️  no input format cached for {contest} {problem} "
+              "(run setup.py, or setup.py --reparse)")
+        sys.exit(1)
+
+    spec = parse_input_format(data["input_format"])
+    if args.show_spec:
+        for block in spec:
+            print(block)
+
+    example_dir = path.parent / "examples"
+    example_dir.mkdir(exist_ok=True)
+    cases = [(example_dir / f"{problem}_max1.in", "max", args.seed)]
+    cases += [(example_dir / f"{problem}_rand{k}.in", "rand", args.seed + k)
+              for k in range(1, args.random + 1)]
+
+    constraints = data.get("constraints") or {}
+    for in_path, mode, seed in cases:
+        size, elapsed = write_case(in_path, spec, constraints, mode, seed)
+        print(f"📝 {in_path.relative_to(path.parent)}: {format_size(size)} "
+              f"in {elapsed * 1000:.0f} ms")
+
+    if args.no_run:
+        return
+
+    time_limit, memory_limit = load_limits(args.filename)
+    timeout = (time_limit or 2.0) * args.tl_factor
+    cmd = args.cmd.split() if args.cmd else ["python3", str(path)]
+    print(f"\n⏱️  time limit {timeout:.2f} s, memory limit "
+          f"{memory_limit or '-'} MiB")
+    print(f"{'input':<16} {'verdict':<8} {'time':>9} {'memory':>9}")
+    failed = False
+    for in_path, _, _ in cases:
+        result = run_measured(cmd, in_path.read_text(encoding="utf-8"),
+                              timeout=timeout, memory_limit_mb=memory_limit)
+        if result["timed_out"]:
+            verdict = "TLE"
+        elif is_mle(result, memory_limit):
+            verdict = "MLE"
+        elif result["returncode"] != 0:
+            verdict = "RE"
+        else:
+            verdict = "OK"
+        failed |= verdict != "OK"
+        print(f"{in_path.name:<16} {verdict:<8} "
+              f"{format_ms(result['wall']):>9} "
+              f"{format_mb(result['max_rss_kb']):>9}")
+        if verdict == "RE":
+            print(result["stderr"][-1000:])
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
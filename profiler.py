@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+解答プログラムを 1 回実行して、どこで時間を使っているかを調べる
+
+validate.py --profile から子プロセスとして起動される（標準入力はそのまま解答に渡す）
+
+    python profiler.py --mode sample --out profile/A_sample1 A.py < in.txt
+
+mode:
+  - sample:   SIGPROF（CPU 時間）で一定間隔にスタックを記録する
+              関数ごとの self / 累積の割合・行ごとの割合・collapsed stacks
+              （flamegraph.pl や speedscope で表示できる形式）を出力する
+  - cprofile: cProfile で全ての関数呼び出しを記録する（.prof）
+              collapsed stacks は呼び出し元・呼び出し先の関係から近似して作る
+
+--max-time を過ぎたらスクリプトを中断して、それまでの結果を書き出す
+（TLE する解答でも、どこで止まっているかが分かる）
+"""
+
+import json
+import linecache
+import os
+import runpy
+import signal
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+# sample が使えるか（SIGPROF / setitimer は POSIX のみ）
+CAN_SAMPLE = hasattr(signal, "setitimer") and hasattr(signal, "SIGPROF")
+
+# スタックに含めない（この実行のための）フレーム
+_SKIP_FILES = {os.path.abspath(__file__), os.path.abspath(runpy.__file__),
+               "<frozen runpy>"}
+
+
+class _TimeUp(BaseException):
+    """
+    --max-time を過ぎた（解答の except Exception で握りつぶされないように BaseException）
+    """
+
+
+# -----------------------------
+# 子プロセス側：実行と記録
+# -----------------------------
+
+
+def _run_script(script: str) -> None:
+    sys.argv = [script]
+    sys.path[0] = os.path.dirname(script)
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit:
+        pass
+
+
+def _frame_name(code) -> str:
+    return f"{Path(code.co_filename).name}:{code.co_name}"
+
+
+def sample(script: str, out: str, interval: float = 0.001) -> None:
+    """
+    interval 秒（CPU 時間）ごとにスタックを記録して out.json に保存する
+    """
+    stacks: Counter = Counter()
+    lines: Counter = Counter()
+
+    def on_sample(signum, frame):
+        names = []
+        line = None
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename in _SKIP_FILES or \
+                    os.path.abspath(code.co_filename) in _SKIP_FILES:
+                frame = frame.f_back
+                continue
+            names.append(_frame_name(code))
+            # 解答ファイルの中で一番内側の行に割り当てる
+            if line is None and code.co_filename == script:
+                line = frame.f_lineno
+            frame = frame.f_back
+        if names:
+            stacks[";".join(reversed(names))] += 1
+        if line is not None:
+            lines[line] += 1
+
+    signal.signal(signal.SIGPROF, on_sample)
+    signal.setitimer(signal.ITIMER_PROF, interval, interval)
+    started = time.perf_counter()
+    try:
+        _run_script(script)
+    except _TimeUp:
+        pass
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        elapsed = time.perf_counter() - started
+        with open(out + ".json", "w", encoding="utf-8") as f:
+            json.dump({
+                "script": script,
+                "interval": interval,
+                "elapsed": elapsed,
+                "stacks": dict(stacks),
+                "lines": {str(k): v for k, v in lines.items()},
+            }, f)
+
+
+def profile_calls(script: str, out: str) -> None:
+    """
+    cProfile で実行して out.prof に保存する
+    """
+    import cProfile
+
+    prof = cProfile.Profile()
+    try:
+        prof.runcall(_run_script, script)
+    except _TimeUp:
+        pass
+    finally:
+        prof.dump_stats(out + ".prof")
+
+
+# -----------------------------
+# 親プロセス側：集計と表示
+# -----------------------------
+
+
+def write_collapsed(data: dict, path: Path) -> None:
+    """
+    "A.py:<module>;A.py:solve 123" 形式（flamegraph.pl / speedscope 用）
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in sorted(data["stacks"].items()):
+            f.write(f"{stack} {count}\n")
+
+
+def _pstats_name(func) -> str:
+    filename, _, name = func
+    # 組み込み関数は ("~", 0, "<built-in method ...>")
+    return name if filename == "~" else f"{Path(filename).name}:{name}"
+
+
+def collapsed_from_cprofile(path: Path, script: str | None = None,
+                            min_time: float = 1e-6) -> dict:
+    """
+    .prof の呼び出し関係から collapsed stacks（値はマイクロ秒）を作る
+
+    cProfile は呼び出し元ごとの時間しか持たないので、関数の時間を
+    呼び出し元からの累積時間の割合で各スタックに配る（近似）。
+    script を指定すると、そのファイルの関数から下のスタックだけにする。
+    min_time 秒より短い枝は辿らない
+    """
+    import pstats
+
+    stats = pstats.Stats(str(path)).stats
+    callees = defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge[3]
+
+    stacks: Counter = Counter()
+
+    def walk(func, names, on_path, share):
+        _, _, own, cumulative, _ = stats[func]
+        if cumulative <= 0:
+            return
+        # runpy から解答を呼ぶまでの exec / import なども含めない
+        skip = func[0] in _SKIP_FILES or \
+            os.path.abspath(func[0]) in _SKIP_FILES or \
+            (not names and func[0] == "~") or \
+            (not names and script is not None and func[0] != script)
+        if not skip:
+            names = names + [_pstats_name(func)]
+        if names:
+            stacks[";".join(names)] += share * own / cumulative
+        for callee, edge in callees[func].items():
+            part = share * edge / cumulative
+            if callee not in on_path and part >= min_time:
+                walk(callee, names, on_path | {callee}, part)
+
+    for func, (_, _, _, cumulative, callers) in stats.items():
+        if not callers:
+            walk(func, [], {func}, cumulative)
+    return {stack: round(t * 1e6) for stack, t in stacks.items()
+            if round(t * 1e6) > 0}
+
+
+def function_table(data: dict) -> list[tuple[str, int, int]]:
+    """
+    関数ごとの (名前, self のサンプル数, 累積のサンプル数)
+    """
+    own: Counter = Counter()
+    cumulative: Counter = Counter()
+    for stack, count in data["stacks"].items():
+        names = stack.split(";")
+        own[names[-1]] += count
+        for name in set(names):
+            cumulative[name] += count
+    return [(name, own[name], cumulative[name]) for name in cumulative]
+
+
+def print_sample_report(data: dict, top: int = 15, lines: bool = False):
+    total = sum(data["stacks"].values())
+    print(f"🔥 {total} samples every {data['interval'] * 1000:g} ms of CPU "
+          f"time ({data['elapsed']:.2f} s wall)")
+    if total == 0:
+        print("   (too short to sample; try a larger input)")
+        return
+
+    table = function_table(data)
+    for title, key in (("cumulative", 2), ("self", 1)):
+        print(f"\n  top functions by {title} time")
+        print(f"  {'self':>6} {'cumul':>6}  function")
+        for name, own, cumulative in sorted(
+                table, key=lambda r: -r[key])[:top]:
+            print(f"  {own / total:6.1%} {cumulative / total:6.1%}  {name}")
+
+    if lines:
+        script = data["script"]
+        counts = sorted(((int(k), v) for k, v in data["lines"].items()),
+                        key=lambda r: -r[1])
+        print(f"\n  top lines of {Path(script).name}")
+        print(f"  {'time':>6} {'line':>5}  source")
+        for lineno, count in counts[:top]:
+            source = linecache.getline(script, lineno).rstrip()
+            print(f"  {count / total:6.1%} {lineno:>5}  {source}")
+
+
+def print_cprofile_report(path: Path, top: int = 15) -> None:
+    import pstats
+
+    stats = pstats.Stats(str(path), stream=sys.stdout)
+    stats.strip_dirs()
+    for key in ("cumulative", "tottime"):
+        print(f"\n  top functions by {key}")
+        stats.sort_stats(key).print_stats(top)
+
+
+# -----------------------------
+# CLI（子プロセス）
+# -----------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="run a solution under a profiler (used by validate.py)"
+    )
+    parser.add_argument("--mode", choices=("sample", "cprofile"),
+                        default="sample" if CAN_SAMPLE else "cprofile")
+    parser.add_argument("--out", required=True,
+                        help="output path without extension")
+    parser.add_argument("--interval", type=float, default=0.001,
+                        help="sampling interval in seconds of CPU time")
+    parser.add_argument("--max-time", type=float,
+                        help="stop the script after this many seconds")
+    parser.add_argument("script")
+    args = parser.parse_args()
+
+    if args.max_time:
+        def time_up(signum, frame):
+            raise _TimeUp()
+
+        signal.signal(signal.SIGALRM, time_up)
+        signal.setitimer(signal.ITIMER_REAL, args.max_time)
+
+    script = os.path.abspath(args.script)
+    if args.mode == "sample":
+        if not CAN_SAMPLE:
+            parser.error("sampling needs SIGPROF (use --mode cprofile)")
+        sample(script, args.out, args.interval)
+    else:
+        profile_calls(script, args.out)
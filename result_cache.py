@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+解答の実行結果をキャッシュする（validate.py と生成される pytest から使う）
+
+キーは次の組のハッシュ:
+  - 正規化したソースのハッシュ（コメント・空白・docstring・TEST_DATA を除いた AST）
+    同じディレクトリから import しているモジュールのソースも含める
+  - インタプリタ（実体のパス・更新時刻・サイズ）
+  - 入力のハッシュ
+  - 制限時間・メモリ制限・DEBUG などの実行条件
+
+結果は cache_store の共有ストア（namespace "result"）に保存する。
+result だけの上限（cache_store.NAMESPACE_MAX_BYTES）を超えると、
+最後に使われた時刻が古い結果から削除される（問題のキャッシュは消さない）。
+TLE した結果と、出力が大きすぎる結果は保存しない
+"""
+
+import ast
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+from cache_store import get_store
+
+NAMESPACE = "result"
+
+# これより大きい出力（stdout + stderr）は保存しない
+MAX_OUTPUT = 1024 * 1024
+
+
+# -----------------------------
+# ソースの正規化
+# -----------------------------
+
+
+def _strip_strings(tree: ast.AST) -> ast.AST:
+    """
+    式として置かれただけの文字列（docstring・TEST_DATA）を取り除く
+    """
+    for node in ast.walk(tree):
+        for field in ("body", "orelse", "finalbody"):
+            body = getattr(node, field, None)
+            if not isinstance(body, list):
+                continue
+            kept = [
+                stmt for stmt in body
+                if not (isinstance(stmt, ast.Expr)
+                        and isinstance(stmt.value, ast.Constant)
+                        and isinstance(stmt.value.value, str))
+            ]
+            if body and not kept and field == "body" and \
+                    not isinstance(node, ast.Module):
+                kept = [ast.Pass()]
+            setattr(node, field, kept)
+    return tree
+
+
+def _local_imports(tree: ast.AST, directory: Path) -> list[Path]:
+    """
+    同じディレクトリにあるモジュール・パッケージのうち import しているもの
+    """
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(a.name.split(".")[0] for a in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 \
+                and node.module:
+            names.add(node.module.split(".")[0])
+
+    found = []
+    for name in sorted(names):
+        module = directory / f"{name}.py"
+        package = directory / name
+        if module.is_file():
+            found.append(module)
+        elif (package / "__init__.py").is_file():
+            found.extend(sorted(package.rglob("*.py")))
+    return found
+
+
+def source_hash(path, _seen: set | None = None) -> str:
+    """
+    動作に関係しない変更（コメント・空白・docstring・TEST_DATA）では変わらないハッシュ
+    """
+    path = Path(path).resolve()
+    seen = _seen if _seen is not None else set()
+    seen.add(path)
+
+    raw = path.read_bytes()
+    digest = hashlib.sha256()
+    try:
+        tree = ast.parse(raw, filename=str(path))
+    except SyntaxError:
+        digest.update(raw)
+        return digest.hexdigest()
+
+    digest.update(ast.dump(_strip_strings(tree)).encode("utf-8"))
+    # 変更が反映されるよう、import しているローカルのモジュールも含める
+    for module in _local_imports(tree, path.parent):
+        if module.resolve() not in seen:
+            digest.update(module.name.encode("utf-8"))
+            digest.update(source_hash(module, seen).encode("ascii"))
+    return digest.hexdigest()
+
+
+def interpreter_id(interpreter: str) -> str:
+    """
+    インタプリタの実体のパス・更新時刻・サイズ（入れ替えたら別のキーになる）
+    """
+    found = shutil.which(interpreter) or interpreter
+    real = os.path.realpath(found)
+    try:
+        st = os.stat(real)
+    except OSError:
+        return real
+    return f"{real}:{st.st_mtime_ns}:{st.st_size}"
+
+
+# -----------------------------
+# 読み書き
+# -----------------------------
+
+
+def result_key(prog, interpreter: str, input_data: str, **options) -> str:
+    """
+    options には timeout / memory_limit / debug など結果が変わる条件を渡す
+    """
+    parts = {
+        "source": source_hash(prog),
+        "interpreter": interpreter_id(interpreter),
+        "input": hashlib.sha256(input_data.encode("utf-8")).hexdigest(),
+        "options": options,
+    }
+    text = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _contest(prog) -> str:
+    # cache_store.py --clear abc438 で一緒に消えるように
+    return Path(prog).resolve().parent.name.lower()
+
+
+def lookup(prog, key: str) -> dict | None:
+    return get_store().get(NAMESPACE, _contest(prog), key)
+
+
+def save(prog, key: str, result: dict) -> bool:
+    """
+    保存したら True（TLE・大きすぎる出力は保存しない）
+    """
+    if result.get("timed_out"):
+        return False
+    if len(result.get("stdout") or "") + len(result.get("stderr") or "") \
+            > MAX_OUTPUT:
+        return False
+    get_store().put(NAMESPACE, _contest(prog), key, result)
+    return True
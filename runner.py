@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+子プロセスを 1 回実行して、出力・経過時間・CPU 時間・最大メモリを測る
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# MLE は wait4 の最大 RSS で判定する。RLIMIT_AS は暴走を止めるための上限で、
+# numpy（スレッドごとのバッファ）や PyPy（GC のヒープ）は使わないアドレス空間も
+# 大きく予約するので、メモリ制限よりずっと大きくしておく
+ADDRESS_SPACE_FACTOR = 4
+ADDRESS_SPACE_MARGIN_MB = 4096
+
+
+# stdout_path を指定したときに、結果の "stdout" に入れる先頭の長さ（バイト）
+# 全体はファイルに残るので、判定はそこから少しずつ読む
+OUTPUT_PREVIEW = 1024 * 1024
+
+
+def read_output(f, limit: int | None = None) -> tuple[str, bool]:
+    """
+    f の先頭から最大 limit バイトを文字列にして返す
+    return: (文字列, limit で切ったら True)
+    """
+    f.seek(0)
+    data = f.read() if limit is None else f.read(limit + 1)
+    truncated = limit is not None and len(data) > limit
+    if truncated:
+        data = data[:limit]
+    return data.decode("utf-8", errors="replace"), truncated
+
+
+def address_space_cap_mb(memory_limit_mb: int) -> int:
+    """
+    メモリ制限 memory_limit_mb MiB の問題で使う RLIMIT_AS（MiB）
+    """
+    memory_limit_mb = int(memory_limit_mb)
+    return max(memory_limit_mb * ADDRESS_SPACE_FACTOR,
+               memory_limit_mb + ADDRESS_SPACE_MARGIN_MB)
+
+
+def limit_memory(memory_limit_mb: int | None) -> None:
+    """
+    このプロセスのアドレス空間を address_space_cap_mb(memory_limit_mb) MiB に
+    制限する（メモリ制限そのものではなく、暴走したときの安全のための上限）
+    """
+    if memory_limit_mb is None or sys.platform == "win32":
+        return
+    import resource
+
+    limit = address_space_cap_mb(memory_limit_mb) * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def run_measured(
+    cmd: list[str],
+    input_data: str,
+    timeout: float | None = None,
+    env: dict[str, str] | None = None,
+    cwd: str | None = None,
+    memory_limit_mb: int | None = None,
+    stdout_path: str | None = None,
+) -> dict:
+    """
+    cmd を実行して結果を返す
+
+    標準入出力は一時ファイル経由（大きな入出力でもパイプが詰まらない）。
+    timeout 秒を過ぎたら kill する。CPU 時間と最大 RSS は wait4 で取得する
+    memory_limit_mb を指定すると子プロセスのアドレス空間に余裕のある上限を付ける
+    （MLE かどうかは呼び出し側が max_rss_kb と比べて判定する）
+    stdout_path を指定すると標準出力をそのファイルに残し、"stdout" には
+    先頭の OUTPUT_PREVIEW バイトだけを入れる（"stdout_truncated" が True なら一部だけ）
+
+    return:
+      {
+        "returncode": 0,        # シグナルで終了した場合は負の値
+        "stdout": "...",
+        "stderr": "...",
+        "wall": 0.031,          # 秒
+        "cpu": 0.025,           # 秒（user + sys）
+        "max_rss_kb": 9800,     # KiB（取得できない場合は None）
+        "timed_out": False,
+        "stdout_truncated": False,
+      }
+    """
+    with tempfile.TemporaryFile() as f_in, \
+            (open(stdout_path, "w+b") if stdout_path
+             else tempfile.TemporaryFile()) as f_out, \
+            tempfile.TemporaryFile() as f_err:
+        f_in.write(input_data.encode("utf-8"))
+        f_in.seek(0)
+
+        started = time.perf_counter()
+        preexec = None
+        if memory_limit_mb is not None and sys.platform != "win32":
+            def preexec():
+                limit_memory(memory_limit_mb)
+
+        proc = subprocess.Popen(
+            cmd, stdin=f_in, stdout=f_out, stderr=f_err, env=env, cwd=cwd,
+            preexec_fn=preexec,
+        )
+
+        # timer のスレッドと回収する側で共有する（lock の中でだけ読み書きする）
+        lock = threading.Lock()
+        state = {"reaped": False, "killed": False}
+
+        # waitid があれば、終了を待つ（回収はしない）→ lock の中で回収する
+        # （無ければ回収した直後に timer が来た場合だけ TLE と誤ることがある）
+        wait_first = hasattr(os, "wait4") and hasattr(os, "waitid")
+
+        def exited() -> bool:
+            # 終了してまだ回収されていない（ゾンビ）なら True。PID はまだ再利用されない
+            if not wait_first:
+                return False
+            return os.waitid(os.P_PID, proc.pid,
+                             os.WEXITED | os.WNOHANG | os.WNOWAIT) is not None
+
+        def kill():
+            with lock:
+                # 制限時間内に終わっていたら TLE にしない
+                # （回収した後の PID は別のプロセスが使っているかもしれない）
+                if state["reaped"] or exited():
+                    return
+                state["killed"] = True
+                if hasattr(os, "wait4"):
+                    # proc.kill() は poll() で子プロセスを回収してしまうことがある
+                    os.kill(proc.pid, signal.SIGKILL)
+                else:
+                    proc.kill()
+
+        timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, kill)
+            timer.start()
+
+        try:
+            if wait_first:
+                os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOWAIT)
+                with lock:
+                    _, status, usage = os.wait4(proc.pid, 0)
+                    state["reaped"] = True
+            elif hasattr(os, "wait4"):
+                _, status, usage = os.wait4(proc.pid, 0)
+                with lock:
+                    state["reaped"] = True
+            else:
+                proc.wait()
+                with lock:
+                    state["reaped"] = True
+            wall = time.perf_counter() - started
+            if hasattr(os, "wait4"):
+                # Popen に回収済みであることを教える
+                proc.returncode = os.waitstatus_to_exitcode(status)
+                cpu = usage.ru_utime + usage.ru_stime
+                max_rss_kb = usage.ru_maxrss
+            else:
+                cpu = None
+                max_rss_kb = None
+        finally:
+            if timer:
+                timer.cancel()
+
+        # 終了処理に入っていた子プロセスには SIGKILL が届かないことがある
+        # （その場合は制限時間内に終わったので TLE にしない）
+        timed_out = state["killed"] and (
+            not hasattr(os, "wait4") or proc.returncode == -signal.SIGKILL)
+
+        stdout, truncated = read_output(
+            f_out, OUTPUT_PREVIEW if stdout_path else None)
+        stderr, _ = read_output(f_err)
+        return {
+            "returncode": proc.returncode,
+            "stdout": stdout,
+            "stderr": stderr,
+            "wall": wall,
+            "cpu": cpu,
+            "max_rss_kb": max_rss_kb,
+            "timed_out": timed_out,
+            "stdout_truncated": truncated,
+        }
@@ -2,54 +2,485 @@
 # -*- coding: utf-8 -*-
 
 import os
-import json
+import re
 import time
+import threading
 from datetime import datetime
-from bs4 import BeautifulSoup
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup, ElementFilter
 import requests
+from requests.adapters import HTTPAdapter
+
+from cache_store import DEFAULT_TTL, get_store
+
+# -----------------------------
+# HTTP セッション
+# -----------------------------
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0 Safari/537.36"
+)
+
+_session: requests.Session | None = None
+
+
+def create_session(pool_size: int = 8) -> requests.Session:
+    """
+    keep-alive / コネクションプール付きのセッションを作る
+    同じホストへの 2 回目以降のリクエストは TCP+TLS ハンドシェイクを省略できる
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    プロセス内で共有するセッションを返す
+    """
+    global _session
+    if _session is None:
+        _session = create_session()
+    return _session
+
+
+# -----------------------------
+# レート制限（トークンバケット）
+# -----------------------------
+
+
+class RateLimiter:
+    """
+    スレッドセーフなトークンバケット
+
+    - rate: 1 秒あたりに補充されるトークン数（= 定常状態のリクエスト数/秒）
+    - burst: バケットの容量（連続して即時に送れるリクエスト数）
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 2):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        トークンが 1 つ取れるまで待つ
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst,
+                    self._tokens + (now - self._updated) * self.rate,
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+
+def in_flight() -> int:
+    """
+    送信中（レスポンス待ち）のリクエスト数
+    """
+    return _in_flight
+
+
+def _track_in_flight(delta: int):
+    global _in_flight
+    with _in_flight_lock:
+        _in_flight += delta
+
+
+# -----------------------------
+# HTTP キャッシュ（ETag / Last-Modified）
+# -----------------------------
+
+# 検証子はコンテストに依らず URL をキーに共有ストアへ保存する
+# 本文は圧縮して pages / blobs に保存する（--reparse で再抽出に使う）
+HTTP_NAMESPACE = "http"
+
+
+def _load_validators(url: str) -> dict | None:
+    return get_store().get(HTTP_NAMESPACE, "", url,
+                           ttl=DEFAULT_TTL[HTTP_NAMESPACE])
+
+
+def _save_validators(url: str, etag, last_modified):
+    get_store().put(HTTP_NAMESPACE, "", url, {
+        "etag": etag,
+        "last_modified": last_modified,
+    })
+
 
 # -----------------------------
 # HTML ダウンロード
 # -----------------------------
 
 
-def download_html(url: str, cookies: dict[str, str] | None = None, wait: int = 3) -> str:
+def download_html(
+    url: str,
+    cookies: dict[str, str] | None = None,
+    wait: int = 3,
+    session: requests.Session | None = None,
+    archive: tuple[str, str, str] | None = None,
+    limiter: RateLimiter | None = None,
+) -> str:
     """
     Cookie を使って Web ページをダウンロードする
-    """
 
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (X11; Linux x86_64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0 Safari/537.36"
-        )
-    }
+    - session: 省略時はプロセス共有のセッション（keep-alive）を使う
+    - archive: (contest, kind, key) を指定すると、生の本文を圧縮して保存し
+      （kind は "contest" / "tasks" / "problem"）、ETag / Last-Modified があれば
+      次回は条件付き GET を送る。304 の場合は保存済みの本文を返す
+    - limiter: 指定すると固定の wait の代わりにトークンバケットで間隔を調整する
+    """
+    if session is None:
+        session = get_session()
+
+    store = get_store()
+    headers = {}
+    entry = _load_validators(url) if archive else None
+    body = store.get_page(url) if entry else None
+    if body is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
 
     # make a break between requests
-    time.sleep(wait)
-    resp = requests.get(url, cookies=cookies, headers=headers, timeout=10)
+    if limiter:
+        limiter.acquire()
+    else:
+        time.sleep(wait)
+
+    _track_in_flight(1)
+    try:
+        resp = session.get(url, cookies=cookies, headers=headers, timeout=10)
+    finally:
+        _track_in_flight(-1)
+
+    if resp.status_code == 304 and body is not None:
+        print(f"♻️  not modified: {url}")
+        return body
+
     resp.raise_for_status()
 
+    if archive:
+        store.put_page(url, *archive, resp.text)
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if etag or last_modified:
+            _save_validators(url, etag, last_modified)
+
     return resp.text
 
 # -----------------------------
-# HTML 解析：入力例・出力例抽出
+# HTML パーサ
 # -----------------------------
 
+# lxml (C 実装) があれば使い、無ければ標準の html.parser にフォールバック
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
 
-def extract_examples_from_html(html: str):
+
+class ProblemPageStrainer(ElementFilter):
     """
-    AtCoder 問題ページの HTML から
-    入力例・出力例を抽出する
+    問題ページのうち抽出に必要な部分だけを木にする
+    （#task-statement, span.h2, a.contest-title, #contest-nav-tabs
+    と「実行時間制限 / メモリ制限」の文字列）
+
+    トップレベルで一致しなかったタグ・文字列は Tag を作らずに読み飛ばす
+    """
+
+    KEEP_IDS = ("task-statement", "contest-nav-tabs")
+    KEEP_CLASSES = {"span": "h2", "a": "contest-title"}
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        attrs = attrs or {}
+        if attrs.get("id") in self.KEEP_IDS:
+            return True
+        cls = self.KEEP_CLASSES.get(name)
+        if not cls:
+            return False
+        classes = attrs.get("class") or ""
+        if isinstance(classes, str):
+            classes = classes.split()
+        return cls in classes
+
+    def allow_string_creation(self, string) -> bool:
+        return "実行時間制限" in string or "Time Limit" in string
+
+
+def parse_html(html: str, parse_only: ElementFilter | None = None):
+    return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+
+
+# -----------------------------
+# HTML 解析：問題ページ（1 回のパースでまとめて抽出）
+# -----------------------------
+
+
+def extract_problem_page(html: str) -> dict:
+    """
+    問題ページを 1 回だけパースして
+    タイトル・入力例/出力例・コンテストのメタ情報をまとめて返す
 
     return:
-      [
-        { "input": "...\\n", "output": "...\\n" },
-        ...
-      ]
+      {
+        "title": "A - ...",
+        "examples": [{ "input": "...", "output": "..." }, ...],
+        "meta": { "title": ..., "start_time_raw": ..., "date": ... },
+        "time_limit": 2.0,          # 秒
+        "memory_limit": 1024,       # MiB
+        "constraints": { "raw": [...], "bounds": {...} },
+        "input_format": "N M\\nA_1 A_2 \\ldots A_N\\n",
+        "tolerance": 1e-06,         # 誤差を許す問題のみ（それ以外は None）
+      }
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html, ProblemPageStrainer())
+    time_limit, memory_limit = _limits_from_soup(soup)
+    return {
+        "title": _title_from_span(soup.select_one("span.h2")),
+        "examples": _examples_from_soup(soup),
+        "meta": _contest_meta_from_soup(soup),
+        "time_limit": time_limit,
+        "memory_limit": memory_limit,
+        "constraints": _constraints_from_soup(soup),
+        "input_format": _input_format_from_soup(soup),
+        "tolerance": _tolerance_from_soup(soup),
+    }
+
+
+# -----------------------------
+# HTML 解析：実行時間制限・メモリ制限・制約
+# -----------------------------
+
+
+def _limits_from_soup(soup) -> tuple[float | None, int | None]:
+    """
+    "実行時間制限: 2 sec / メモリ制限: 1024 MiB" から (2.0, 1024) を得る
+    """
+    text = soup.find(string=re.compile("実行時間制限|Time Limit"))
+    if not text:
+        return None, None
+    time_part, _, memory_part = str(text).partition("/")
+    return _parse_time_limit(time_part), _parse_memory_limit(memory_part)
+
+
+def _section_by_heading(soup, heading: str):
+    for part in soup.select("div.part"):
+        h3 = part.find("h3")
+        if h3 and h3.get_text(strip=True) == heading:
+            return part
+    return None
+
+
+def _constraints_from_soup(soup) -> dict:
+    part = _section_by_heading(soup, "制約")
+    if not part:
+        return {"raw": [], "bounds": {}}
+    raw = [li.get_text(" ", strip=True) for li in part.find_all("li")]
+    return {"raw": raw, "bounds": parse_constraint_bounds(raw)}
+
+
+def _input_format_from_soup(soup) -> str | None:
+    """
+    「入力」の <pre>（入力形式）の文字列
+    """
+    part = _section_by_heading(soup, "入力")
+    pre = part.find("pre") if part else None
+    return pre.get_text() if pre else None
+
+
+def _tolerance_from_soup(soup) -> float | None:
+    """
+    「出力」の「真の値との絶対誤差または相対誤差が 10^{-6} 以下であれば正解」から 1e-06 を得る
+    """
+    part = _section_by_heading(soup, "出力")
+    if not part:
+        return None
+    text = part.get_text(" ", strip=True)
+    if "誤差" not in text:
+        return None
+    m = re.search(r"10\s*\^\s*\{?\s*-\s*(\d+)\s*\}?", text)
+    return 10.0 ** -int(m.group(1)) if m else None
+
+
+def normalize_var(name: str) -> str:
+    """
+    変数名を揃える: "A_{i,j}" → "A_ij", " N " → "N"
+    """
+    name = re.sub(r"_\{([^}]*)\}", lambda m: "_" + m.group(1).replace(",", ""),
+                  name)
+    return re.sub(r"[\s{}]", "", name)
+
+
+def _normalize_tex(text: str) -> str:
+    text = re.sub(r"_\{([^}]*)\}",
+                  lambda m: "_" + m.group(1).replace(",", ""), text)
+    for pattern, repl in (
+        (r"\\leq?(?![a-zA-Z])|≦|≤", "<="),
+        (r"\\geq?(?![a-zA-Z])|≧|≥", ">="),
+        (r"\\lt(?![a-zA-Z])", "<"),
+        (r"\\gt(?![a-zA-Z])", ">"),
+        (r"\\times|\\cdot|×", "*"),
+        (r"\\[a-zA-Z]+|\\.", " "),
+        (r"[{}]", ""),
+    ):
+        text = re.sub(pattern, repl, text)
+    return text
+
+
+def eval_bound(expr, names: dict | None = None):
+    """
+    "2*10^5", "10^18-1", "N" のような式を数値にする（計算できなければ None）
+    """
+    import ast
+
+    names = names or {}
+    try:
+        tree = ast.parse(str(expr).replace("^", "**").strip(), mode="eval")
+    except SyntaxError:
+        return None
+
+    def ev(node):
+        if isinstance(node, ast.Expression):
+            return ev(node.body)
+        if isinstance(node, ast.Constant) and \
+                isinstance(node.value, (int, float)):
+            return node.value
+        if isinstance(node, ast.UnaryOp) and \
+                isinstance(node.op, (ast.USub, ast.UAdd)):
+            v = ev(node.operand)
+            return -v if isinstance(node.op, ast.USub) else v
+        if isinstance(node, ast.BinOp):
+            a, b = ev(node.left), ev(node.right)
+            ops = {
+                ast.Add: lambda: a + b,
+                ast.Sub: lambda: a - b,
+                ast.Mult: lambda: a * b,
+                ast.Div: lambda: a // b if a % b == 0 else a / b,
+                ast.FloorDiv: lambda: a // b,
+                ast.Pow: lambda: a ** b,
+            }
+            if type(node.op) in ops:
+                return ops[type(node.op)]()
+        if isinstance(node, ast.Name) and isinstance(
+                names.get(node.id), (int, float)):
+            return names[node.id]
+        raise ValueError("unsupported expression")
+
+    try:
+        return ev(tree)
+    except (ValueError, ZeroDivisionError, OverflowError):
+        return None
+
+
+def parse_constraint_bounds(lines: list[str],
+                            known: dict | None = None) -> dict:
+    """
+    制約の各行から数値の範囲を取り出す
+
+    例: ["1 \\leq N \\leq 2\\times 10^5", "1 \\leq A_i < 2^{30}"]
+      → {"N": {"min": 1, "max": 200000}, "A_i": {"min": 1, "max": 1073741823}}
+
+    上限・下限が他の変数（例 "1 \\leq M \\leq N"）の場合は、その変数の範囲で置き換える
+    known に値が決まっている変数（例 {"N": 1000}）を渡すと、その値で置き換える
+
+    "1 \\leq u_i < v_i \\leq N" のような連なった不等式では、両端（1 と N）は
+    範囲を決める側なので、間の u_i・v_i だけに範囲を付ける。
+    同じ変数が何行かに出てくる場合は、範囲を狭める方だけを採る
+    """
+    bounds: dict[str, dict] = {}
+    for line in lines:
+        parts = [p.strip() for p in
+                 re.split(r"(<=|>=|<|>)", _normalize_tex(line))]
+        if len(parts) < 3:
+            continue
+        # 比較が 2 つ以上なら両端は除く
+        inner = range(2, len(parts) - 2, 2) if len(parts) >= 5 \
+            else range(0, len(parts), 2)
+        for i in inner:
+            segment = parts[i]
+            if not segment or eval_bound(segment) is not None:
+                continue
+            names = [normalize_var(n) for n in segment.split(",")]
+            names = [n for n in names if n and re.fullmatch(r"[\w|]+", n)]
+            if not names:
+                continue
+            low = high = None
+            if i >= 2 and parts[i - 1] in ("<=", "<"):
+                low = (parts[i - 2], parts[i - 1] == "<")
+            if i + 2 < len(parts) and parts[i + 1] in ("<=", "<"):
+                high = (parts[i + 2], parts[i + 1] == "<")
+            for name in names:
+                b = bounds.setdefault(name, {"min": None, "max": None})
+                if low:
+                    _tighten(b, "min",
+                             _bound_value(low[0], +1 if low[1] else 0), max)
+                if high:
+                    _tighten(b, "max",
+                             _bound_value(high[0], -1 if high[1] else 0), min)
+
+    # 他の変数を参照する範囲を数値にする（"M <= N" など）
+    for _ in range(3):
+        lows = {**{k: v["min"] for k, v in bounds.items()}, **(known or {})}
+        highs = {**{k: v["max"] for k, v in bounds.items()}, **(known or {})}
+        for b in bounds.values():
+            if isinstance(b["min"], str):
+                b["min"] = _bound_value(b["min"], 0, lows)
+            if isinstance(b["max"], str):
+                b["max"] = _bound_value(b["max"], 0, highs)
+    return bounds
+
+
+def _tighten(bound: dict, key: str, value, pick) -> None:
+    """
+    bound[key] を value で狭める（pick は下限なら max、上限なら min）
+    どちらかが他の変数を参照する文字列の場合は、先に記録した方を残す
+    """
+    current = bound[key]
+    if current is None:
+        bound[key] = value
+    elif isinstance(current, (int, float)) and \
+            isinstance(value, (int, float)):
+        bound[key] = pick(current, value)
+
+
+def _bound_value(expr, shift: int, names: dict | None = None):
+    value = eval_bound(expr, names)
+    if value is None:
+        return expr.strip() if isinstance(expr, str) else expr
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return value + shift if isinstance(value, int) else value
+
+
+# -----------------------------
+# HTML 解析：入力例・出力例抽出
+# -----------------------------
+
+
+def _examples_from_soup(soup):
     parts = soup.select("div.part")
 
     examples = []
@@ -75,20 +506,22 @@ def extract_examples_from_html(html: str):
     return examples
 
 
-def extract_problem_title(html: str) -> str | None:
+def extract_examples_from_html(html: str):
     """
-    問題タイトルを取得する
-    XPath:
-      //*[@id="main-container"]/div[1]/div[2]/span[1]/text()
-    に相当
+    AtCoder 問題ページの HTML から
+    入力例・出力例を抽出する
+
+    return:
+      [
+        { "input": "...\\n", "output": "...\\n" },
+        ...
+      ]
     """
     soup = BeautifulSoup(html, "html.parser")
+    return _examples_from_soup(soup)
 
-    container = soup.find(id="main-container")
-    if not container:
-        return None
 
-    span = container.select_one("div.row > div.col-sm-12 > span.h2")
+def _title_from_span(span) -> str | None:
     if not span:
         return None
 
@@ -99,22 +532,95 @@ def extract_problem_title(html: str) -> str | None:
 
     return None
 
+
+def extract_problem_title(html: str) -> str | None:
+    """
+    問題タイトルを取得する
+    XPath:
+      //*[@id="main-container"]/div[1]/div[2]/span[1]/text()
+    に相当
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    container = soup.find(id="main-container")
+    if not container:
+        return None
+
+    span = container.select_one("div.row > div.col-sm-12 > span.h2")
+    return _title_from_span(span)
+
 # -----------------------------
-# HTML 解析：コンテストメタ情報抽出
+# HTML 解析：問題一覧（/tasks）
 # -----------------------------
 
 
-def extract_contest_meta_from_html(html: str) -> dict:
+def _parse_time_limit(text: str) -> float | None:
+    # 例: "2 sec", "3.5 sec", "500 msec"
+    m = re.search(r"([\d.]+)\s*(m?sec)", text)
+    if not m:
+        return None
+    value = float(m.group(1))
+    return value / 1000 if m.group(2) == "msec" else value
+
+
+def _parse_memory_limit(text: str) -> int | None:
+    # 例: "1024 MiB", "256 MB"
+    m = re.search(r"([\d.]+)\s*([KMG])i?B", text)
+    if not m:
+        return None
+    scale = {"K": 1 / 1024, "M": 1, "G": 1024}[m.group(2)]
+    return int(float(m.group(1)) * scale)
+
+
+def extract_task_list_from_html(
+    html: str, base_url: str = "https://atcoder.jp"
+) -> list[dict]:
     """
-    AtCoder コンテストページ(または問題ページ)の HTML から
-    コンテストのメタ情報を抽出する。
+    コンテストの問題一覧ページ（/contests/<contest>/tasks）から
+    実際に存在する問題を抽出する
 
-    - title: 例 "AtCoder Beginner Contest 438"
-    - start_time_raw: 例 "2025-12-27 21:00:00+0900"
-    - date: README 用に人間が読みやすい形式（例 "2025-12-27" や "2025 年 12 月 27 日"）
+    return:
+      [
+        { "id": "A", "title": "...", "url": "https://...",
+          "time_limit": 2.0, "memory_limit": 1024 },
+        ...
+      ]
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
+
+    tasks = []
+    for row in soup.select("table tbody tr"):
+        cells = row.find_all("td")
+        if len(cells) < 2:
+            continue
+        id_link = cells[0].find("a")
+        title_link = cells[1].find("a")
+        if not id_link or not title_link or not title_link.get("href"):
+            continue
+
+        tasks.append({
+            "id": id_link.get_text(strip=True),
+            "title": title_link.get_text(strip=True),
+            "url": urljoin(base_url, title_link["href"]),
+            "time_limit": (
+                _parse_time_limit(cells[2].get_text())
+                if len(cells) > 2 else None
+            ),
+            "memory_limit": (
+                _parse_memory_limit(cells[3].get_text())
+                if len(cells) > 3 else None
+            ),
+        })
+
+    return tasks
+
 
+# -----------------------------
+# HTML 解析：コンテストメタ情報抽出
+# -----------------------------
+
+
+def _contest_meta_from_soup(soup) -> dict:
     # タイトル: 問題ページでは navbar の a.contest-title が取りやすい
     title_el = soup.select_one("a.contest-title")
     if not title_el:
@@ -150,68 +656,107 @@ def extract_contest_meta_from_html(html: str) -> dict:
     }
 
 
+def extract_contest_meta_from_html(html: str) -> dict:
+    """
+    AtCoder コンテストページ(または問題ページ)の HTML から
+    コンテストのメタ情報を抽出する。
+
+    - title: 例 "AtCoder Beginner Contest 438"
+    - start_time_raw: 例 "2025-12-27 21:00:00+0900"
+    - date: README 用に人間が読みやすい形式（例 "2025-12-27" や "2025 年 12 月 27 日"）
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    return _contest_meta_from_soup(soup)
+
+
 # -----------------------------
-# キャッシュ管理（contest）
+# 保存済み HTML の再抽出
 # -----------------------------
 
 
-def _contest_cache_path(base_dir):
-    return os.path.join(base_dir, "cache", "contest.json")
+def reparse_page(kind: str, url: str, html: str):
+    """
+    保存済みページから抽出し直す（ProcessPoolExecutor から呼ばれる）
+    """
+    if kind == "problem":
+        return extract_problem_page(html)
+    if kind == "tasks":
+        return extract_task_list_from_html(html, base_url=url)
+    if kind == "contest":
+        return extract_contest_meta_from_html(html)
+    raise ValueError(f"unknown page kind: {kind}")
 
 
-def load_contest_cache(base_dir):
-    path = _contest_cache_path(base_dir)
-    if not os.path.exists(path):
-        return None
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
+# -----------------------------
+# キャッシュ管理（contest）
+# -----------------------------
+#
+# キャッシュは cache_store の共有ストア（SQLite）に
+# (namespace, contest, key) で保存する。contest は小文字の ID（例 abc438）
+
 
+def load_contest_cache(contest):
+    return get_store().get("contest", contest.lower(), "meta")
 
-def save_contest_cache(base_dir, url: str, meta: dict):
-    cache_dir = os.path.join(base_dir, "cache")
-    os.makedirs(cache_dir, exist_ok=True)
+
+def save_contest_cache(contest, url: str, meta: dict):
     data = {
         "url": url,
         **meta,
     }
-    with open(_contest_cache_path(base_dir), "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    get_store().put("contest", contest.lower(), "meta", data)
 
 
 # -----------------------------
-# キャッシュ管理
+# キャッシュ管理（tasks）
 # -----------------------------
 
 
-def _cache_path(base_dir, problem):
-    return os.path.join(base_dir, "cache", f"{problem}.json")
+def load_tasks_cache(contest, ttl=DEFAULT_TTL["tasks"]):
+    return get_store().get("tasks", contest.lower(), "list", ttl=ttl)
 
 
-def load_cache(base_dir, problem):
-    """
-    キャッシュが存在すれば読み込む
-    """
-    path = _cache_path(base_dir, problem)
-    if not os.path.exists(path):
-        return None
+def save_tasks_cache(contest, url: str, tasks: list[dict]):
+    data = {
+        "url": url,
+        "tasks": tasks,
+    }
+    get_store().put("tasks", contest.lower(), "list", data)
 
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
+
+# -----------------------------
+# キャッシュ管理
+# -----------------------------
 
 
-def save_cache(base_dir, problem, url, title, examples):
-    cache_dir = os.path.join(base_dir, "cache")
-    os.makedirs(cache_dir, exist_ok=True)
+def load_cache(contest, problem, ttl=DEFAULT_TTL["problem"]):
+    """
+    キャッシュが存在すれば読み込む（ttl 秒より古ければ None。None なら期限なし）
+    """
+    return get_store().get("problem", contest.lower(), problem, ttl=ttl)
 
+
+def save_cache(contest, problem, url, title, examples,
+               time_limit=None, memory_limit=None, constraints=None,
+               input_format=None, tolerance=None):
+    """
+    time_limit は秒、memory_limit は MiB
+    constraints は {"raw": [...], "bounds": {"N": {"min": 1, "max": ...}}}
+    input_format は「入力」の形式（例 "N\\nA_1 \\ldots A_N\\n"）
+    tolerance は出力で許される誤差（例 1e-06。誤差を許さない問題は None）
+    """
     data = {
         "problem": problem,
         "title": title,
         "url": url,
-        "examples": examples
+        "examples": examples,
+        "time_limit": time_limit,
+        "memory_limit": memory_limit,
+        "constraints": constraints or {"raw": [], "bounds": {}},
+        "input_format": input_format,
+        "tolerance": tolerance,
     }
-
-    with open(_cache_path(base_dir, problem), "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    get_store().put("problem", contest.lower(), problem, data)
 
 # -----------------------------
 # .in / .out 形式で保存
@@ -249,8 +794,8 @@ if __name__ == "__main__":
     )
     parser.add_argument(
         "--html",
-        required=True,
-        help="HTML file of problem page"
+        help="HTML file of problem page "
+             "(with --bench, defaults to every stored problem page)"
     )
     parser.add_argument(
         "--out",
@@ -262,9 +807,63 @@ if __name__ == "__main__":
         default="A",
         help="problem name (A, B, ...)"
     )
+    parser.add_argument(
+        "--contest",
+        default="local",
+        help="contest id used as the cache key (default: local)"
+    )
+    parser.add_argument(
+        "--bench",
+        type=int,
+        metavar="N",
+        help="benchmark extract_problem_page against the per-field "
+             "extractors N times and exit"
+    )
 
     args = parser.parse_args()
 
+    if args.bench:
+        if args.html:
+            with open(args.html, encoding="utf-8") as f:
+                corpus = [f.read()]
+        else:
+            store = get_store()
+            corpus = [
+                store.get_page(p["url"])
+                for p in store.pages(kind="problem")
+            ]
+        if not corpus:
+            print("❌ no problem pages to benchmark")
+            sys.exit(1)
+
+        def legacy():
+            for html in corpus:
+                extract_problem_title(html)
+                extract_examples_from_html(html)
+                extract_contest_meta_from_html(html)
+
+        def single_pass():
+            for html in corpus:
+                extract_problem_page(html)
+
+        print(f"⏱️  {args.bench} iteration(s) over {len(corpus)} page(s), "
+              f"parser: {HTML_PARSER}")
+        timings = {}
+        for name, fn in (("legacy (3 parses)", legacy),
+                         ("extract_problem_page", single_pass)):
+            started = time.perf_counter()
+            for _ in range(args.bench):
+                fn()
+            elapsed = time.perf_counter() - started
+            timings[name] = elapsed / (args.bench * len(corpus))
+            print(f"  {name:<22} {timings[name] * 1000:8.2f} ms/page")
+        speedup = timings["legacy (3 parses)"] / timings["extract_problem_page"]
+        print(f"  speedup: x{speedup:.1f}")
+        sys.exit(0)
+
+    if not args.html:
+        parser.error("--html is required")
+
     if not os.path.exists(args.html):
         print(f"❌ HTML file not found: {args.html}")
         sys.exit(1)
@@ -272,8 +871,9 @@ if __name__ == "__main__":
     with open(args.html, encoding="utf-8") as f:
         html = f.read()
 
-    title = extract_problem_title(html)
-    examples = extract_examples_from_html(html)
+    page = extract_problem_page(html)
+    title = page["title"]
+    examples = page["examples"]
 
     print(f"✅ extracted {len(examples)} example(s)")
 
@@ -286,4 +886,5 @@ if __name__ == "__main__":
 
     save_examples_as_inout(args.out, args.problem, examples)
     print(f"\n📁 saved to {os.path.join(args.out, 'examples')}")
-    save_cache(args.out, args.problem, None, title, examples)
+    save_cache(args.contest, args.problem, None, title, examples,
+               tolerance=page["tolerance"])
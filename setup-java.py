@@ -2,19 +2,110 @@
 # -*- coding: utf-8 -*-
 
 import argparse
-import json
+import os
 import re
+import shutil
 import subprocess
 from pathlib import Path
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, TemplateNotFound
 
+from cache_store import get_store
 
-def load_cache(contest_dir: Path, problem: str) -> dict:
-    path = contest_dir / "cache" / f"{problem}.json"
-    if not path.exists():
-        raise FileNotFoundError(f"cache not found: {path}")
-    return json.loads(path.read_text(encoding="utf-8"))
+DEFAULT_TIME_LIMIT = 2.0  # 秒
+DEFAULT_MEMORY_LIMIT = 1024  # MiB
+
+
+def load_cache(contest: str, problem: str) -> dict:
+    data = get_store().get("problem", contest, problem)
+    if data is None:
+        raise FileNotFoundError(
+            f"cache not found: {contest} {problem} (run setup.py first)"
+        )
+    return data
+
+
+def contest_memory_limit(contest: str) -> int:
+    """
+    コンテストの問題のうち最大のメモリ制限（MiB）
+    build.gradle はコンテストで 1 つなので、テスト JVM のヒープはこれに合わせる
+
+    問題一覧（setup.py が問題ページより先に保存する）の制限も見るので、
+    --pipeline で最初の問題を生成する時点でも全問題の最大になる
+    """
+    store = get_store()
+    tasks = (store.get("tasks", contest, "list") or {}).get("tasks") or []
+    limits = [t.get("memory_limit") for t in tasks] + [
+        (store.get("problem", contest, key) or {}).get("memory_limit")
+        for key in store.keys("problem", contest)
+    ]
+    return max([m for m in limits if m] or [DEFAULT_MEMORY_LIMIT])
+
+
+def raise_heap_size(build_gradle: Path, memory_limit: int) -> None:
+    """
+    生成済みの build.gradle の maxHeapSize が memory_limit より小さければ上げる
+    （問題一覧が取れずに、後から大きな制限の問題が見つかった場合）
+    """
+    text = build_gradle.read_text(encoding="utf-8")
+    m = re.search(r'maxHeapSize = "(\d+)m"', text)
+    if m is None or int(m.group(1)) >= memory_limit:
+        return
+    build_gradle.write_text(
+        text[:m.start(1)] + str(memory_limit) + text[m.end(1):],
+        encoding="utf-8",
+    )
+    print(f"📝 {build_gradle}: maxHeapSize {m.group(1)}m -> {memory_limit}m")
+
+
+def detect_java_version() -> int | None:
+    """
+    `java -version` のメジャーバージョン（"17.0.9" → 17、"1.8.0_392" → 8）
+    java が無ければ None
+    """
+    try:
+        p = subprocess.run(["java", "-version"], capture_output=True,
+                           text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    m = re.search(r'version "(\d+)(?:\.(\d+))?', p.stderr + p.stdout)
+    if not m:
+        return None
+    major = int(m.group(1))
+    return int(m.group(2) or 0) if major == 1 else major
+
+
+def start_warm_up(contest_dir: Path) -> None:
+    """
+    バックグラウンドで gradle test を 1 回実行しておく
+    （デーモンの起動・依存関係の解決・コンパイル・AppCDS アーカイブの作成を
+    問題を解いている間に済ませる）。出力は build/warm-up.log
+    """
+    gradle = "./gradlew" if (contest_dir / "gradlew").exists() else \
+        shutil.which("gradle")
+    if gradle is None:
+        print("⚠️ gradle not found; skipped warm-up")
+        return
+
+    build_dir = contest_dir / "build"
+    build_dir.mkdir(exist_ok=True)
+    pid_file = build_dir / "warm-up.pid"
+    # 問題ごとに呼ばれても（setup.py --pipeline）同時に 1 つだけ
+    try:
+        os.kill(int(pid_file.read_text()), 0)
+        return
+    except (OSError, ValueError):
+        pass
+
+    with open(build_dir / "warm-up.log", "w", encoding="utf-8") as log:
+        # 解いていない問題のテストは失敗するので --continue で全て実行する
+        proc = subprocess.Popen(
+            [gradle, "test", "--continue", "--console=plain"],
+            cwd=contest_dir, stdin=subprocess.DEVNULL, stdout=log,
+            stderr=subprocess.STDOUT, start_new_session=True,
+        )
+    pid_file.write_text(str(proc.pid))
+    print(f"🔥 warming up gradle in the background (pid {proc.pid})")
 
 
 def write_if_absent(path: Path, content: str) -> None:
@@ -42,6 +133,11 @@ def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("contest", help="e.g. abc438")
     ap.add_argument("problems", help="e.g. A,B,C")
+    ap.add_argument(
+        "--variant",
+        help="skeleton variant: templates/template_main_<variant>.java "
+             "(e.g. fastio)",
+    )
 
     # 手動指定もできるように残しつつ、デフォルトは自動検出
     ap.add_argument(
@@ -51,6 +147,12 @@ def main() -> None:
         help="override Java major version for Gradle toolchain (e.g. 21). "
              "If omitted, auto-detected from `java -version`.",
     )
+    ap.add_argument(
+        "--warm-up",
+        action="store_true",
+        help="run gradle test once in the background to start the daemon "
+             "and build the class-data-sharing archive",
+    )
 
     args = ap.parse_args()
 
@@ -70,7 +172,13 @@ def main() -> None:
         keep_trailing_newline=True,
     )
 
-    t_main = env.get_template("template_main.java")
+    # --variant fastio なら template_main_fastio.java
+    try:
+        t_main = env.get_template(
+            f"template_main_{args.variant}.java" if args.variant
+            else "template_main.java")
+    except TemplateNotFound as e:
+        ap.error(f"unknown variant: {args.variant} ({e.name} not found)")
     t_test = env.get_template("template_test.java")
     t_build = env.get_template("build.gradle.j2")
     t_settings = env.get_template("settings.gradle.j2")
@@ -78,10 +186,20 @@ def main() -> None:
 
     # Gradle 設定
     # build.gradle.j2 は junit-jupiter:5.10.2 を固定で持っている前提 :contentReference[oaicite:2]{index=2}
-    write_if_absent(
-        contest_dir / "build.gradle",
-        t_build.render(),
-    )
+    # JDK 13 以降ならテスト JVM に AppCDS のオプションを付ける
+    # （java -version は build.gradle を作るときだけ。--pipeline で問題ごとに
+    # 呼ばれても、2 問目以降はヒープの上限を確かめるだけ）
+    build_gradle = contest_dir / "build.gradle"
+    memory_limit = contest_memory_limit(contest)
+    if build_gradle.exists():
+        raise_heap_size(build_gradle, memory_limit)
+    else:
+        java_version = args.java_version or detect_java_version()
+        write_if_absent(
+            build_gradle,
+            t_build.render(memory_limit=memory_limit,
+                           java_version=java_version),
+        )
     write_if_absent(
         contest_dir / "settings.gradle",
         t_settings.render(project_name=contest_dir.name),
@@ -97,9 +215,11 @@ def main() -> None:
     main_dir.mkdir(parents=True, exist_ok=True)
     test_dir.mkdir(parents=True, exist_ok=True)
 
-    # A〜F を生成
-    for p in [q.upper() for q in args.problems.split(",")]:
-        data = load_cache(contest_dir, p)
+    # 問題ごとに生成
+    # "a" → "A", "ex" → "Ex"（問題 ID は先頭だけ大文字）
+    for p in [q.strip()[:1].upper() + q.strip()[1:]
+              for q in args.problems.split(",")]:
+        data = load_cache(contest, p)
 
         # main
         content = {
@@ -107,6 +227,8 @@ def main() -> None:
             "Name": p,                # クラス名 A/B/...
             "title": data.get("title", ""),
             "url": data.get("url", ""),
+            "time_limit_ms": int(
+                (data.get("time_limit") or DEFAULT_TIME_LIMIT) * 1000),
         }
 
         main_code = t_main.render(content=content)
@@ -130,6 +252,9 @@ def main() -> None:
 
     print(f"✅ Generated Java skeleton + JUnit + Gradle in: {contest_dir}")
 
+    if args.warm_up:
+        start_warm_up(contest_dir)
+
 
 if __name__ == "__main__":
     main()
@@ -2,17 +2,24 @@
 # -*- coding: utf-8 -*-
 
 import argparse
-import json
+import os
 from pathlib import Path
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, TemplateNotFound
 
+from cache_store import get_store
 
-def load_cache(contest_dir: Path, problem: str) -> dict:
-    path = contest_dir / "cache" / f"{problem}.json"
-    if not path.exists():
-        raise FileNotFoundError(f"cache not found: {path}")
-    return json.loads(path.read_text(encoding="utf-8"))
+DEFAULT_TIME_LIMIT = 2.0  # 秒
+DEFAULT_MEMORY_LIMIT = 1024  # MiB
+
+
+def load_cache(contest: str, problem: str) -> dict:
+    data = get_store().get("problem", contest, problem)
+    if data is None:
+        raise FileNotFoundError(
+            f"cache not found: {contest} {problem} (run setup.py first)"
+        )
+    return data
 
 
 def write_if_absent(path: Path, content: str) -> None:
@@ -25,10 +32,31 @@ def strip_last_newline(s: str) -> str:
     return s[:-1] if s.endswith("\n") else s
 
 
+def link_library(contest_dir: Path, library: Path) -> None:
+    """
+    コンテストのディレクトリから cplib/ を import できるようにリンクを作る
+    （提出するときは bundle.py が使っている定義を埋め込む）
+    """
+    link = contest_dir / library.name
+    if link.exists() or link.is_symlink():
+        return
+    try:
+        link.symlink_to(os.path.relpath(library, contest_dir.resolve()),
+                        target_is_directory=True)
+    except OSError as e:
+        # Windows で開発者モードが無効な場合など
+        print(f"⚠️  cannot link {library.name}/: {e}")
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("contest", help="e.g. abc421")
     ap.add_argument("problems", help="e.g. A,B,C")
+    ap.add_argument(
+        "--variant",
+        help="skeleton variant: templates/template_main_<variant>.py "
+             "(e.g. fastio)",
+    )
     args = ap.parse_args()
 
     contest = args.contest.lower()
@@ -49,7 +77,13 @@ def main() -> None:
     )
 
     # 添付の template_main.py を使う :contentReference[oaicite:2]{index=2}
-    t_main = env.get_template("template_main.py")
+    # --variant fastio なら template_main_fastio.py
+    try:
+        t_main = env.get_template(
+            f"template_main_{args.variant}.py" if args.variant
+            else "template_main.py")
+    except TemplateNotFound as e:
+        ap.error(f"unknown variant: {args.variant} ({e.name} not found)")
     t_test = env.get_template("template_test.py")
 
     # 出力先：
@@ -62,9 +96,12 @@ def main() -> None:
         contest_dir / "pytest.ini",
         "[pytest]\npython_files = test_*.py\naddopts = -q\n",
     )
+    link_library(contest_dir, tools_dir / "cplib")
 
-    for p in [q.upper() for q in args.problems.split(",")]:
-        data = load_cache(contest_dir, p)
+    # "a" → "A", "ex" → "Ex"（問題 ID は先頭だけ大文字）
+    for p in [q.strip()[:1].upper() + q.strip()[1:]
+              for q in args.problems.split(",")]:
+        data = load_cache(contest, p)
 
         # template_main.py は {{contents.title}} / {{contents.url}} を参照している :contentReference[oaicite:3]{index=3}
         contents = {
@@ -72,6 +109,11 @@ def main() -> None:
             "url": data.get("url", ""),
             "contest": contest,
             "problem": p,
+            # 取れなかった場合は AtCoder でよくある値にする
+            "time_limit": data.get("time_limit") or DEFAULT_TIME_LIMIT,
+            "memory_limit": data.get("memory_limit") or DEFAULT_MEMORY_LIMIT,
+            # 誤差を許す問題のみ（問題文の「10^{-6} 以下」）
+            "tolerance": data.get("tolerance"),
         }
 
         raw_examples = data.get("examples", [])
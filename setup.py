@@ -5,23 +5,42 @@ import argparse
 import os
 import re
 import json
+import random
 import subprocess
+import sys
+import time
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from datetime import datetime, timezone
 from pathlib import Path
 
+import requests
 from jinja2 import Environment, FileSystemLoader
 
+from cache_store import get_store
+
 from scrape import (
+    RateLimiter,
+    create_session,
     download_html,
-    extract_problem_title,
-    extract_examples_from_html,
+    in_flight,
+    extract_problem_page,
     extract_contest_meta_from_html,
+    extract_task_list_from_html,
+    reparse_page,
     load_cache,
     save_cache,
     load_contest_cache,
     save_contest_cache,
+    load_tasks_cache,
+    save_tasks_cache,
     save_examples_as_inout,
 )
 
+# 問題一覧ページが取得できない場合のフォールバック
 PROBLEMS = ["A", "B", "C", "D", "E", "F"]
 SUPPORTED_LANGUAGES = ["java", "python"]
 
@@ -46,60 +65,275 @@ def task_url(contest: str, problem: str) -> str:
     )
 
 
-def scrape_contest(contest: str):
+def tasks_url(contest: str) -> str:
+    return f"https://atcoder.jp/contests/{contest}/tasks"
+
+
+def guess_tasks(contest: str) -> list[dict]:
+    """
+    問題一覧が取れないときに PROBLEMS から URL を推測する
+    """
+    return [
+        {"id": p, "title": None, "url": task_url(contest, p)}
+        for p in PROBLEMS
+    ]
+
+
+def discover_tasks(contest, cookies, session, limiter) -> list[dict]:
+    """
+    問題一覧ページから実在する問題（ID・タイトル・URL・制限）を取得する
+    """
+    tcache = load_tasks_cache(contest)
+    if tcache and tcache.get("tasks"):
+        print("⚡ task list cache hit")
+        return tcache["tasks"]
+
+    url = tasks_url(contest)
+    print(f"🌐 fetching task list: {url}")
+    try:
+        html = download_html(
+            url, cookies=cookies, session=session,
+            archive=(contest, "tasks", "list"), limiter=limiter,
+        )
+    except requests.RequestException as e:
+        print(f"⚠️  task list not available ({e}), guessing {PROBLEMS}")
+        return guess_tasks(contest)
+
+    tasks = extract_task_list_from_html(html, base_url=url)
+    if not tasks:
+        print(f"⚠️  no tasks found in task list, guessing {PROBLEMS}")
+        return guess_tasks(contest)
+
+    save_tasks_cache(contest, url, tasks)
+    print(f"📋 tasks: {', '.join(t['id'] for t in tasks)}")
+    return tasks
+
+
+def ordered_tasks(tasks: list[dict], order: list[str] | None = None):
+    """
+    order に挙げた問題を先頭に、残りを問題一覧の順に並べる
+    """
+    by_id = {t["id"].upper(): t for t in tasks}
+    # "--order a,A" でも 1 回だけ（大文字・小文字は区別しない）
+    wanted = dict.fromkeys(p.strip().upper() for p in order or [])
+    head = [by_id[p] for p in wanted if p in by_id]
+    return head + [t for t in tasks if t not in head]
+
+
+def fetch_problem(contest, task, cookies, session, limiter):
+    """
+    問題ページを 1 つ取得して cache に保存する（スレッドから呼ばれる）
+    """
+    problem = task["id"]
+    url = task["url"]
+    html = download_html(
+        url,
+        cookies=cookies,
+        session=session,
+        archive=(contest, "problem", problem),
+        limiter=limiter,
+    )
+    page = extract_problem_page(html)
+    title = page["title"] or task.get("title")
+    examples = page["examples"]
+    # 問題ページから読めなければ問題一覧の値を使う
+    time_limit = page["time_limit"] or task.get("time_limit")
+    memory_limit = page["memory_limit"] or task.get("memory_limit")
+    save_cache(contest, problem, url, title, examples,
+               time_limit=time_limit, memory_limit=memory_limit,
+               constraints=page["constraints"],
+               input_format=page["input_format"],
+               tolerance=page["tolerance"])
+
+    print(
+        f"📥 {problem}: {title} ({len(examples)} examples, "
+        f"{time_limit} sec / {memory_limit} MiB, "
+        f"in flight: {in_flight()})"
+    )
+    return {"title": title, "url": url, "examples": examples}
+
+
+def load_contest_meta(contest, cookies, session, limiter=None):
+    """
+    コンテストのメタ情報（タイトル・開始時刻）をキャッシュまたは Web から得る
+    """
+    ccache = load_contest_cache(contest)
+    if ccache:
+        print("⚡ contest meta cache hit")
+        return ccache
+
+    url = contest_url(contest)
+    print(f"🌐 fetching contest page: {url}")
+    html = download_html(
+        url, cookies=cookies, session=session,
+        archive=(contest, "contest", "meta"), wait=0, limiter=limiter,
+    )
+    meta = extract_contest_meta_from_html(html)
+    save_contest_cache(contest, url, meta)
+    return {"url": url, **meta}
+
+
+def parse_start_time(raw: str | None) -> datetime | None:
+    """
+    "2025-12-27 21:00:00+0900" を timezone 付きの datetime にする
+    """
+    if not raw:
+        return None
+    try:
+        return datetime.strptime(raw, "%Y-%m-%d %H:%M:%S%z")
+    except ValueError:
+        return None
+
+
+def wait_until(start: datetime) -> None:
+    """
+    start まで待つ（残り時間を時々表示する）
+    """
+    while True:
+        remaining = (start - datetime.now(timezone.utc)).total_seconds()
+        if remaining <= 0:
+            return
+        if remaining > 60:
+            print(f"⏳ {int(remaining // 60)} min {int(remaining % 60)} s "
+                  "until start", flush=True)
+            time.sleep(min(remaining - 60, 60) or 1)
+        else:
+            print(f"⏳ {remaining:.0f} s until start", flush=True)
+            time.sleep(min(remaining, 10))
+
+
+def wait_for_contest_start(
+    contest: str,
+    session,
+    poll_initial: float = 0.5,
+    poll_max: float = 5.0,
+) -> None:
+    """
+    コンテスト開始時刻まで待ち、問題一覧が公開されるまでポーリングする
+
+    ポーリング間隔は poll_initial から 1.5 倍ずつ poll_max まで伸ばし、
+    ±30% のジッタを入れて他の参加者とリクエストが揃わないようにする
+    """
+    cookies = load_cookies()
+
+    cmeta = load_contest_meta(contest, cookies, session)
+    start = parse_start_time(cmeta.get("start_time_raw"))
+    if start is None:
+        print("⚠️  start time unknown, polling task list now")
+    else:
+        print(f"🕘 contest starts at {start.isoformat()}")
+        wait_until(start)
+
+    url = tasks_url(contest)
+    delay = poll_initial
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            html = download_html(
+                url, cookies=cookies, wait=0, session=session,
+                archive=(contest, "tasks", "list"),
+            )
+            tasks = extract_task_list_from_html(html, base_url=url)
+            if tasks:
+                save_tasks_cache(contest, url, tasks)
+                print(f"🔓 task list opened (attempt {attempt}): "
+                      f"{', '.join(t['id'] for t in tasks)}")
+                return
+        except requests.RequestException as e:
+            print(f"🔒 not open yet (attempt {attempt}): {e}", flush=True)
+
+        time.sleep(delay * random.uniform(0.7, 1.3))
+        delay = min(delay * 1.5, poll_max)
+
+
+def scrape_contest(
+    contest: str,
+    session=None,
+    jobs: int = 4,
+    rate: float = 1.0,
+    burst: int = 2,
+    order: list[str] | None = None,
+    on_problem=None,
+):
     """
     問題ページを scrape して cache / examples を作成
+    session を渡すとコンテストページ・問題ページで接続を使い回す
+
+    未キャッシュの問題は jobs 並列で取得する。
+    リクエスト間隔は rate（回/秒）と burst のトークンバケットで制限する
+
+    - order: 取得を優先する問題の順番（残りは問題一覧の順）
+    - on_problem: examples を保存するたびに problem を引数に呼ばれる。
+      後続の問題を取得している間に生成処理を進めるために使う
+
+    return: 問題 ID のリスト（例 ["A", ..., "G"]）
     """
     out_dir = contest.upper()
     os.makedirs(out_dir, exist_ok=True)
 
     cookies = load_cookies()
+    if session is None:
+        session = create_session(pool_size=max(jobs, 1))
+    limiter = RateLimiter(rate=rate, burst=burst)
 
     # ---- contest meta (cached) ----
-    ccache = load_contest_cache(out_dir)
-    if ccache:
-        print("⚡ contest meta cache hit")
-        cmeta = ccache
-    else:
-        url = contest_url(contest)
-        print(f"🌐 fetching contest page: {url}")
-        html = download_html(url, cookies=cookies, wait=0)
-        meta = extract_contest_meta_from_html(html)
-        save_contest_cache(out_dir, url, meta)
-        cmeta = {"url": url, **meta}
-
-    # README 用に problems リストを作る（後でキャッシュから title/url を拾う）
-    problems_for_readme = []
+    cmeta = load_contest_meta(contest, cookies, session, limiter)
 
-    for problem in PROBLEMS:
-        print(f"\n=== Problem {problem} ===")
+    # ---- task list ----
+    tasks = discover_tasks(contest, cookies, session, limiter)
 
-        cache = load_cache(out_dir, problem)
-        if cache:
-            print("⚡ cache hit")
-            examples = cache["examples"]
-            title = cache.get("title")
-            url = cache.get("url")
-        else:
-            url = task_url(contest, problem)
-            print(f"🌐 fetching: {url}")
+    # ---- problems ----
+    results = {}
 
-            html = download_html(url, cookies=cookies)
-            title = extract_problem_title(html)
-            examples = extract_examples_from_html(html)
+    def finish(problem, data):
+        results[problem] = data
+        save_examples_as_inout(out_dir, problem, data["examples"])
+        if on_problem:
+            on_problem(problem)
 
-            print(f"📘 title: {title}")
-            print(f"📄 examples: {len(examples)}")
+    missing = []
+    for task in ordered_tasks(tasks, order):
+        cache = load_cache(contest, task["id"])
+        if cache:
+            print(f"⚡ cache hit: {task['id']}")
+            finish(task["id"], cache)
+        else:
+            missing.append(task)
 
-            save_cache(out_dir, problem, url, title, examples)
+    if missing:
+        print(
+            f"\n🌐 fetching {len(missing)} problem(s) "
+            f"(jobs={jobs}, rate={rate}/s, burst={burst})"
+        )
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+            # 投入順にトークンを取るので order の先頭から届く
+            futures = {
+                pool.submit(
+                    fetch_problem,
+                    contest, task, cookies, session, limiter,
+                ): task["id"]
+                for task in missing
+            }
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+        print(f"⏱️  fetched in {time.monotonic() - started:.1f}s")
 
-        save_examples_as_inout(out_dir, problem, examples)
+    # README 用に problems リストを作る
+    problems_for_readme = []
 
+    # タイトルは問題一覧のものを使う（問題ページの解析は不要）
+    for task in tasks:
+        problem = task["id"]
+        title = results[problem].get("title")
+        if task.get("title"):
+            title = f"{problem} - {task['title']}"
         problems_for_readme.append(
             {
                 "id": problem,
                 "title": title or f"Problem {problem}",
-                "url": url or task_url(contest, problem),
+                "url": task["url"],
             }
         )
 
@@ -128,6 +362,67 @@ def scrape_contest(contest: str):
     print(f"\n📝 README generated: {readme_path}")
 
     print("\n✅ scrape finished successfully")
+    return [t["id"] for t in tasks]
+
+
+def reparse(contest: str | None = None, jobs: int = 4) -> None:
+    """
+    保存済みの HTML から抽出し直してキャッシュを更新する（通信なし）
+    contest を省略すると保存済みの全コンテストが対象
+    """
+    store = get_store()
+    pages = store.pages(contest=contest)
+    if not pages:
+        print("⚠️  no stored pages (run setup.py first)")
+        return
+
+    print(f"🔁 re-extracting {len(pages)} page(s) with {jobs} process(es)")
+    started = time.monotonic()
+    updated = 0
+    with ProcessPoolExecutor(max_workers=max(jobs, 1)) as pool:
+        futures = {
+            pool.submit(
+                reparse_page, page["kind"], page["url"],
+                store.get_page(page["url"]),
+            ): page
+            for page in pages
+        }
+        for future in as_completed(futures):
+            page = futures[future]
+            c, kind, key = page["contest"], page["kind"], page["key"]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ {c} {kind} {key}: {e}")
+                continue
+
+            if kind == "problem":
+                old = load_cache(c, key, ttl=None) or {}
+                if result["examples"] != old.get("examples"):
+                    print(f"✏️  {c} {key}: {len(result['examples'])} examples")
+                save_cache(
+                    c, key, page["url"],
+                    result["title"] or old.get("title"),
+                    result["examples"],
+                    time_limit=result["time_limit"] or old.get("time_limit"),
+                    memory_limit=(result["memory_limit"]
+                                  or old.get("memory_limit")),
+                    constraints=result["constraints"],
+                    input_format=result["input_format"],
+                    tolerance=result["tolerance"],
+                )
+                if Path(c.upper()).is_dir():
+                    save_examples_as_inout(c.upper(), key, result["examples"])
+            elif kind == "tasks" and result:
+                save_tasks_cache(c, page["url"], result)
+            elif kind == "contest":
+                save_contest_cache(c, page["url"], result)
+            updated += 1
+
+    print(
+        f"✅ re-extracted {updated}/{len(pages)} page(s) "
+        f"in {time.monotonic() - started:.1f}s"
+    )
 
 
 def _jinja_env() -> Environment:
@@ -140,10 +435,10 @@ def _jinja_env() -> Environment:
     )
 
 
-def _render_template(name: str, *, contest: str) -> str:
+def _render_template(name: str, *, contest: str, problems: list[str]) -> str:
     env = _jinja_env()
     t = env.get_template(name)
-    return t.render(content={"contest": contest}, problems=PROBLEMS)
+    return t.render(content={"contest": contest}, problems=problems)
 
 
 def _append_block_if_missing(
@@ -166,7 +461,12 @@ def _append_block_if_missing(
     return True
 
 
-def ensure_gitignore_split(contest: str, languages: list[str]) -> None:
+def ensure_gitignore_split(
+    contest: str,
+    languages: list[str],
+    problems: list[str] | None = None,
+) -> None:
+    problems = problems or PROBLEMS
     contest_dir = Path(contest.upper())
     contest_dir.mkdir(parents=True, exist_ok=True)
 
@@ -177,6 +477,7 @@ def ensure_gitignore_split(contest: str, languages: list[str]) -> None:
         common = _render_template(
             "gitignore_common.j2",
             contest=contest,
+            problems=problems,
         )
         gitignore_path.write_text(
             common.rstrip("\n") + "\n",
@@ -193,6 +494,7 @@ def ensure_gitignore_split(contest: str, languages: list[str]) -> None:
             block = _render_template(
                 tmpl_name,
                 contest=contest,
+                problems=problems,
             )
         except Exception:
             print(f"⚠️ no gitignore template for language: {lang}")
@@ -202,31 +504,58 @@ def ensure_gitignore_split(contest: str, languages: list[str]) -> None:
             print(f"🧹 .gitignore appended ({lang})")
 
 
-def generate_java(contest: str):
-    print("\n☕ Generating Java skeleton & JUnit tests")
+def generate_java(contest: str, problems: list[str] | None = None,
+                  warm_up: bool = False, variant: str | None = None):
+    problems = problems or PROBLEMS
+    print(f"\n☕ Generating Java skeleton & JUnit tests: {','.join(problems)}")
     subprocess.check_call(
-        ["python3", "setup-java.py", contest, ",".join(PROBLEMS)]
+        ["python3", "setup-java.py", contest, ",".join(problems)]
+        + (["--warm-up"] if warm_up else [])
+        + (["--variant", variant] if variant else [])
     )
     print("✅ Java generation finished")
 
 
-def generate_python(contest: str):
-    print("\n🐍 Generating Python skeleton")
+def generate_python(contest: str, problems: list[str] | None = None,
+                    variant: str | None = None):
+    problems = problems or PROBLEMS
+    print(f"\n🐍 Generating Python skeleton: {','.join(problems)}")
     subprocess.check_call(
-        ["python3", "setup-python.py", contest, ",".join(PROBLEMS)]
+        ["python3", "setup-python.py", contest, ",".join(problems)]
+        + (["--variant", variant] if variant else [])
     )
     print("✅ Python generation finished")
 
 
+def generate(contest: str, languages: list[str], problems=None,
+             warm_up: bool = False,
+             variants: dict[str, str] | None = None) -> list[str]:
+    """
+    指定された言語のコードを生成し、生成した言語のリストを返す
+    warm_up: Java の生成後に gradle をバックグラウンドで起動しておく
+    variants: 言語ごとのテンプレートの種類（例: {"python": "fastio"}）
+    """
+    variants = variants or {}
+    generated_languages = []
+    for lang in languages:
+        if lang == "java":
+            generate_java(contest, problems, warm_up, variants.get(lang))
+            generated_languages.append("java")
+        elif lang == "python":
+            generate_python(contest, problems, variants.get(lang))
+            generated_languages.append("python")
+    return generated_languages
+
+
 def load_default_languages_txt() -> list[str] | None:
     """
     default_lang.txt を読む。
-    - 1 行 1 言語
+    - 1 行 1 言語（"言語:種類" でテンプレートの種類も指定できる）
     - 空行・'#' で始まる行は無視
     例:
         # default languages
         java
-        python
+        python:fastio
     """
     p = Path(__file__).resolve().parent / "default_lang.txt"
     if not p.exists():
@@ -245,6 +574,11 @@ def load_default_languages_txt() -> list[str] | None:
 
 
 def main():
+    # setup.py test abc439: 生成した全ての問題・言語の入力例をまとめてテストする
+    if len(sys.argv) > 1 and sys.argv[1] == "test":
+        from testall import main as test_main
+        raise SystemExit(test_main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(
         description="AtCoder contest setup tool"
     )
@@ -263,6 +597,57 @@ def main():
         action="store_true",
         help="generate Python code (future)"
     )
+    parser.add_argument(
+        "--fastio",
+        action="store_true",
+        help="use the fast I/O skeletons (template_main_fastio.*)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="number of problem pages fetched concurrently (default: 4)"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="max requests per second to atcoder.jp (default: 1.0)"
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=2,
+        help="requests allowed back-to-back before --rate applies "
+             "(default: 2)"
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="generate each problem as soon as its page is downloaded"
+    )
+    parser.add_argument(
+        "--order",
+        help="problems to fetch first, comma separated (e.g. A,B)"
+    )
+    parser.add_argument(
+        "--wait-start",
+        action="store_true",
+        help="sleep until the contest starts, poll until the tasks open, "
+             "then run the --pipeline setup"
+    )
+    parser.add_argument(
+        "--warm-up",
+        action="store_true",
+        help="start gradle test in the background after generating Java "
+             "(daemon, dependencies and class-data-sharing archive)"
+    )
+    parser.add_argument(
+        "--reparse",
+        action="store_true",
+        help="re-run extraction over stored pages without network "
+             "(all contests unless contest is given)"
+    )
     parser.add_argument(
         "--login",
         action="store_true",
@@ -271,13 +656,16 @@ def main():
 
     args = parser.parse_args()
 
+    # keep-alive セッションを全リクエストで共有する
+    session = create_session(pool_size=max(args.jobs, 1))
+
     # --login が指定された場合は他のオプションを無視して終了
     if args.login:
         url = "https://atcoder.jp/"
         cookies = load_cookies()
 
         print(f"🌐 fetching: {url}")
-        html = download_html(url, cookies=cookies, wait=0)
+        html = download_html(url, cookies=cookies, wait=0, session=session)
 
         # userScreenName を抽出
         m = re.search(
@@ -293,6 +681,10 @@ def main():
 
         return
 
+    if args.reparse:
+        reparse(args.contest.lower() if args.contest else None, args.jobs)
+        return
+
     # 通常モードでは contest 必須
     if not args.contest:
         parser.error("contest is required unless --login is specified")
@@ -307,31 +699,69 @@ def main():
         languages.append("python")
     print(f"🏁 Contest: {contest.upper()}")
 
-    # ① scrape
-    scrape_contest(contest)
+    # default_lang.txt の "python:fastio" はテンプレートの種類
+    cfg = load_default_languages_txt() or []
+    variants = {}
+    for entry in cfg:
+        lang, _, variant = entry.partition(":")
+        if variant:
+            variants[lang.strip()] = variant.strip()
+    if args.fastio:
+        variants = {lang: "fastio" for lang in SUPPORTED_LANGUAGES}
 
-    # ② generate codes
     if not languages:
         # 2) default_lang.txt
-        cfg = load_default_languages_txt()
-        if cfg:
-            languages = [x for x in cfg if x in SUPPORTED_LANGUAGES]
+        languages = [x.partition(":")[0].strip() for x in cfg]
+        languages = [x for x in languages if x in SUPPORTED_LANGUAGES]
 
     if not languages:
         # 3) フォールバック：すべて
         languages = SUPPORTED_LANGUAGES.copy()
 
-    generated_languages = []
-    for lang in languages:
-        if lang == "java":
-            generate_java(contest)
-            generated_languages.append("java")
-        elif lang == "python":
-            generate_python(contest)
-            generated_languages.append("python")
+    order = [p.strip().upper() for p in args.order.split(",")] \
+        if args.order else None
+    scrape_options = {
+        "session": session,
+        "jobs": args.jobs,
+        "rate": args.rate,
+        "burst": args.burst,
+        "order": order,
+    }
+
+    if args.wait_start:
+        wait_for_contest_start(contest, session)
+        args.pipeline = True
+
+    if args.pipeline:
+        # 問題ごとに fetch → examples → コード生成 を流す
+        started = time.monotonic()
+        generated_languages = [
+            x for x in languages if x in SUPPORTED_LANGUAGES
+        ]
+
+        def on_problem(problem):
+            generate(contest, languages, [problem], args.warm_up, variants)
+            print(
+                f"🚀 {problem} ready "
+                f"({time.monotonic() - started:.1f}s since start)"
+            )
+
+        problems = scrape_contest(
+            contest, on_problem=on_problem, **scrape_options
+        )
+        ensure_gitignore_split(contest, generated_languages, problems)
+        print("\n🎉 setup.py completed successfully")
+        return
+
+    # ① scrape
+    problems = scrape_contest(contest, **scrape_options)
+
+    # ② generate codes
+    generated_languages = generate(contest, languages, problems,
+                                   args.warm_up, variants)
 
     # ③ .gitignore
-    ensure_gitignore_split(contest, generated_languages)
+    ensure_gitignore_split(contest, generated_languages, problems)
 
     print("\n🎉 setup.py completed successfully")
 
@@ -0,0 +1,102 @@
+package {{content.contest}};
+
+/*
+* {{content.title}}
+* {{content.url}}
+*
+* Test command: gradle test --tests {{content.Name}}Test
+* Test command: gradle test --tests {{content.Name}}Test.sample1
+*/
+
+import java.io.BufferedOutputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.PrintWriter;
+import java.io.UncheckedIOException;
+
+public class {{content.Name}} {
+    public static void main(String[] args) {
+        FastReader in = new FastReader(System.in);
+        // 出力はバッファに溜めて最後に flush する（System.out.println を繰り返すより速い）
+        PrintWriter out = new PrintWriter(new BufferedOutputStream(System.out));
+
+        int N = in.nextInt(); //
+        long[] A = new long[N];
+        for (int i = 0; i < N; i++) {
+            A[i] = in.nextLong();
+        }
+        String S = in.next(); //
+
+        out.println(N);
+        out.flush();
+    }
+
+    // バイト単位で読むトークンリーダー（2×10^5 個を超えると Scanner より数倍速い）
+    static final class FastReader {
+        private final InputStream in;
+        private final byte[] buf = new byte[1 << 16];
+        private int len = 0;
+        private int ptr = 0;
+
+        FastReader(InputStream in) {
+            this.in = in;
+        }
+
+        private int read() {
+            if (ptr == len) {
+                try {
+                    len = in.read(buf, 0, buf.length);
+                } catch (IOException e) {
+                    throw new UncheckedIOException(e);
+                }
+                ptr = 0;
+                if (len <= 0) {
+                    len = 0;
+                    return -1;
+                }
+            }
+            return buf[ptr++] & 0xff;
+        }
+
+        // 空白・改行を読み飛ばして、トークンの最初の文字を返す
+        private int skip() {
+            int c = read();
+            while (c != -1 && c <= ' ') {
+                c = read();
+            }
+            return c;
+        }
+
+        long nextLong() {
+            int c = skip();
+            boolean negative = c == '-';
+            if (negative) {
+                c = read();
+            }
+            long n = 0;
+            while (c >= '0' && c <= '9') {
+                n = n * 10 + (c - '0');
+                c = read();
+            }
+            return negative ? -n : n;
+        }
+
+        int nextInt() {
+            return (int) nextLong();
+        }
+
+        double nextDouble() {
+            return Double.parseDouble(next());
+        }
+
+        String next() {
+            StringBuilder sb = new StringBuilder();
+            int c = skip();
+            while (c > ' ') {
+                sb.append((char) c);
+                c = read();
+            }
+            return sb.toString();
+        }
+    }
+}
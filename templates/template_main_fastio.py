@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+
+# {{contents.title}}
+# {{contents.url}}
+
+# python ../validate.py {{contents.problem}}.py
+
+# pytest tests/test_{{contents.problem | lower}}.py
+# pytest tests/test_{{contents.problem | lower}}.py -k sample1
+
+"""TEST_DATA
+{% for ex in examples %}{{ex.input}}
+<expected> {{ex.output}}
+
+{% endfor -%}
+"""
+
+import os
+import sys
+from itertools import islice
+
+# 入力を一度に読んでトークンに分ける（2×10^5 個を超えると input() より数倍速い）
+# 改行の位置は区別しないので、行ごとの個数が決まっていない入力では使えない
+_tokens = iter(sys.stdin.buffer.read().split())
+
+
+def read_int() -> int:
+    return int(next(_tokens))
+
+
+def read_ints(n: int) -> list[int]:
+    return list(map(int, islice(_tokens, n)))
+
+
+def read_str() -> str:
+    return next(_tokens).decode()
+
+
+# remove or comment out `debug()` before upload.
+# the cost is not negligible
+def debug(*args):
+    if os.environ.get("DEBUG") in ("1", "true", "True", "yes"):
+        print(*args)
+
+
+def main():
+    N = read_int()
+    A = read_ints(N)
+    # 配列のpointerに便利
+    # A = [x - 1 for x in read_ints(N)]
+    S = read_str()
+
+    # 出力はリストに溜めて最後に 1 回で書く（print() を繰り返すより速い）
+    out = []
+    out.append(N)
+    sys.stdout.write("\n".join(map(str, out)) + "\n")
+
+
+main()
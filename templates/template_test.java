@@ -7,9 +7,20 @@ import java.io.ByteArrayInputStream;
 import java.io.ByteArrayOutputStream;
 import java.io.PrintStream;
 import java.nio.charset.StandardCharsets;
+import java.time.Duration;
 
 class {{content.Name}}Test {
 
+    // 問題ページの実行時間制限（ミリ秒）
+    private static final long TIME_LIMIT_MS = {{content.time_limit_ms | default(2000)}};
+
+    private static Duration timeLimit() {
+        // ATCODER_TL_FACTOR=0.8 なら制限時間の 0.8 倍で打ち切る
+        String factor = System.getenv("ATCODER_TL_FACTOR");
+        double f = factor == null || factor.isEmpty() ? 1.0 : Double.parseDouble(factor);
+        return Duration.ofMillis((long) (TIME_LIMIT_MS * f));
+    }
+
     private static String stripLastNewline(String s) {
         // 末尾の改行だけを1個除去（\n / \r\n 対応）
         return s.replaceFirst("\\R\\z", "");
@@ -37,7 +48,12 @@ class {{content.Name}}Test {
         System.setOut(new PrintStream(out));
 
         try {
-            {{content.Name}}.main(new String[]{});
+            // 制限時間を過ぎたら別スレッドの main() を打ち切って失敗にする
+            assertTimeoutPreemptively(
+                timeLimit(),
+                () -> {{content.Name}}.main(new String[]{}),
+                "TLE"
+            );
         } finally {
             System.setOut(originalOut);
         }
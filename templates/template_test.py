@@ -4,6 +4,8 @@
 {{ contents.url }}
 """
 
+import os
+import shutil
 import subprocess
 import sys
 from pathlib import Path
@@ -16,6 +18,32 @@ def strip_last_newline(s: str) -> str:
 
 
 SCRIPT = Path(__file__).resolve().parents[1] / "{{ contents.problem }}.py"
+TOOLS_DIR = Path(__file__).resolve().parents[2]
+
+# 問題ページの「実行時間制限 / メモリ制限」
+TIME_LIMIT = {{ contents.time_limit }}  # 秒
+MEMORY_LIMIT = {{ contents.memory_limit }}  # MiB
+
+# 問題文の「絶対誤差または相対誤差が 10^{-6} 以下」（None なら完全一致。ATCODER_TOLERANCE で上書き）
+TOLERANCE = {{ contents.tolerance }}
+# 答えが複数ある問題では特別なジャッジを書いてここに指定する（checker 入力 出力 想定解、終了コード 0 で正解）
+CHECKER = None  # 例: Path(__file__).resolve().parent / "checker_{{ contents.problem | lower }}.py"
+
+# 制限時間に掛ける係数（ATCODER_TL_FACTOR=0.8 なら 2 sec の問題を 1.6 sec で打ち切る）
+TL_FACTOR = float(os.environ.get("ATCODER_TL_FACTOR", "1.0"))
+TIMEOUT = TIME_LIMIT * TL_FACTOR
+
+# ATCODER_FORKSERVER=1 なら import 済みの常駐プロセスから fork して実行する
+USE_FORKSERVER = os.environ.get("ATCODER_FORKSERVER") in ("1", "true", "yes")
+
+# ATCODER_NO_CACHE=1 なら前回の結果を使わずに必ず実行する
+USE_CACHE = os.environ.get("ATCODER_NO_CACHE") not in ("1", "true", "yes")
+
+# ATCODER_INTERPRETERS=python3,pypy3 なら各インタプリタで実行する
+INTERPRETERS = [
+    i.strip() for i in os.environ.get("ATCODER_INTERPRETERS", "").split(",")
+    if i.strip()
+] or [sys.executable]
 
 
 CASES = [
@@ -25,27 +53,126 @@ CASES = [
 ]
 
 
+@pytest.fixture(scope="module", params=INTERPRETERS,
+                ids=lambda i: Path(i).name)
+def interpreter(request):
+    if shutil.which(request.param) is None:
+        pytest.skip(f"{request.param} not found")
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def fork_server(interpreter):
+    if not USE_FORKSERVER:
+        yield None
+        return
+    sys.path.insert(0, str(TOOLS_DIR))
+    from forkserver import ForkServer
+
+    with ForkServer(interpreter) as server:
+        yield server
+
+
+def run(inp: str, interpreter: str,
+        fork_server) -> tuple[subprocess.CompletedProcess, int | None]:
+    # (結果, 最大 RSS の KiB)。MLE は最大 RSS で判定する（RLIMIT_AS は余裕のある上限だけ）
+    if fork_server is not None:
+        r = fork_server.run(str(SCRIPT), inp, timeout=TIMEOUT,
+                            memory_limit_mb=MEMORY_LIMIT)
+    else:
+        if str(TOOLS_DIR) not in sys.path:
+            sys.path.insert(0, str(TOOLS_DIR))
+        try:
+            from runner import run_measured
+        except ImportError:
+            try:
+                p = subprocess.run([interpreter, str(SCRIPT)], input=inp,
+                                   text=True, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, timeout=TIMEOUT)
+            except subprocess.TimeoutExpired:
+                pytest.fail(f"TLE: killed after {TIMEOUT:.2f} sec",
+                            pytrace=False)
+            return p, None
+        r = run_measured([interpreter, str(SCRIPT)], inp, timeout=TIMEOUT,
+                         memory_limit_mb=MEMORY_LIMIT)
+
+    if r["timed_out"]:
+        pytest.fail(f"TLE: killed after {TIMEOUT:.2f} sec", pytrace=False)
+    return subprocess.CompletedProcess(
+        [str(SCRIPT)], r["returncode"], r["stdout"], r["stderr"]
+    ), r["max_rss_kb"]
+
+
+def cached_run(inp: str, interpreter: str,
+               fork_server) -> tuple[subprocess.CompletedProcess, int | None]:
+    # ソース（コメントを除く）・インタプリタ・入力が前回と同じなら結果を使い回す
+    if not USE_CACHE:
+        return run(inp, interpreter, fork_server)
+    if str(TOOLS_DIR) not in sys.path:
+        sys.path.insert(0, str(TOOLS_DIR))
+    try:
+        import result_cache
+    except ImportError:
+        return run(inp, interpreter, fork_server)
+
+    key = result_cache.result_key(SCRIPT, interpreter, inp, timeout=TIMEOUT,
+                                  memory_limit=MEMORY_LIMIT, harness="pytest")
+    hit = result_cache.lookup(SCRIPT, key)
+    if hit is not None:
+        return subprocess.CompletedProcess(
+            [str(SCRIPT)], hit["returncode"], hit["stdout"], hit["stderr"]
+        ), hit.get("max_rss_kb")
+
+    p, max_rss_kb = run(inp, interpreter, fork_server)
+    result_cache.save(SCRIPT, key, {
+        "returncode": p.returncode,
+        "stdout": p.stdout,
+        "stderr": p.stderr,
+        "max_rss_kb": max_rss_kb,
+        "timed_out": False,
+    })
+    return p, max_rss_kb
+
+
+def mismatch_of(inp: str, output: str, expected: str) -> str | None:
+    # トークンごとに比べて、最初に違う行・トークンを返す（誤差・特別なジャッジに対応）
+    if str(TOOLS_DIR) not in sys.path:
+        sys.path.insert(0, str(TOOLS_DIR))
+    try:
+        from judge import check, describe, judging_options
+    except ImportError:
+        if strip_last_newline(output) == strip_last_newline(expected):
+            return None
+        return "output differs"
+
+    mismatch = check(output, expected, inp,
+                     **judging_options({"tolerance": TOLERANCE},
+                                       checker=CHECKER))
+    return None if mismatch is None else describe(mismatch)
+
+
 @pytest.mark.parametrize("inp, expected", CASES)
-def test_main(inp: str, expected: str):
+def test_main(inp: str, expected: str, interpreter: str, fork_server):
     # stdin は末尾改行がある方が自然なので、無ければ付ける
     if not inp.endswith("\n"):
         inp = inp + "\n"
 
-    p = subprocess.run(
-        [sys.executable, str(SCRIPT)],
-        input=inp,
-        text=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-    )
+    p, max_rss_kb = cached_run(inp, interpreter, fork_server)
 
+    if max_rss_kb is not None and max_rss_kb > MEMORY_LIMIT * 1024:
+        pytest.fail(f"MLE: used {max_rss_kb / 1024:.1f} MiB "
+                    f"(limit {MEMORY_LIMIT} MiB)", pytrace=False)
+    if "MemoryError" in p.stderr:
+        pytest.fail(f"MLE: over {MEMORY_LIMIT} MiB\n{p.stderr}", pytrace=False)
     assert p.returncode == 0, f"returncode={p.returncode}\nSTDERR:\n{p.stderr}"
 
     got = strip_last_newline(p.stdout)
     exp = strip_last_newline(expected)
+    mismatch = mismatch_of(inp, p.stdout, expected)
 
-    assert got == exp, (
-        "\n--- got ---\n" + got + "\n"
+    assert mismatch is None, (
+        f"\nWA: {mismatch}\n"
+        + "--- got ---\n" + got + "\n"
         + "--- expected ---\n" + exp + "\n"
         + "--- raw stdout ---\n" + p.stdout + "\n"
         + "--- stderr ---\n" + p.stderr + "\n"
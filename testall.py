@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+コンテストの全ての問題 × 言語 × 入力例を 1 つのワーカープールでまとめてテストする
+
+    python setup.py test abc439
+    python setup.py test abc439 --lang python --problems A,B -j 8
+
+入力例は setup.py が保存した examples/{問題}_{番号}.in / .out を使う
+  - Python: {問題}.py を validate.py と同じ方法で実行する（結果のキャッシュも使う）
+  - Java:   src/main/java/.../{問題}.java を javac でコンパイルして実行する
+            （java_runner.py。ソースを変更しない限りコンパイルは 1 回だけ）
+
+最後に、問題・言語ごとに入力例の判定と実行時間を 1 つの表にまとめて表示する
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from java_runner import compile_java, run_java
+from judge import judging_options
+from validate import (VERDICT_MARKS, format_ms, judge_result, load_examples,
+                      load_problem, run_case, verdict_detail)
+
+LANGUAGES = ["python", "java"]
+
+
+def contest_dir_of(contest: str) -> Path:
+    """
+    "abc439" なら ABC439/（ディレクトリのパスをそのまま渡してもよい）
+    """
+    path = Path(contest)
+    if path.is_dir():
+        return path
+    return Path(contest.upper())
+
+
+def problem_order(problem: str):
+    # A, B, ..., G, Ex の順
+    return len(problem), problem
+
+
+def find_solution(contest_dir: Path, problem: str, lang: str) -> Path | None:
+    if lang == "python":
+        path = contest_dir / f"{problem}.py"
+        return path if path.exists() else None
+    found = sorted((contest_dir / "src" / "main" / "java").glob(
+        f"**/{problem}.java"))
+    return found[0] if found else None
+
+
+# -----------------------------
+# 実行
+# -----------------------------
+
+
+def compile_error(case: dict, compiled: dict) -> dict:
+    return {"case": case, "verdict": "CE", "output": "",
+            "stdout": "", "stderr": compiled["output"], "returncode": None,
+            "wall": None, "cpu": None, "max_rss_kb": None,
+            "timed_out": False}
+
+
+def run_job(job: dict, case: dict, cache: bool) -> dict:
+    if job["lang"] == "python":
+        return run_case(str(job["path"]), case, timeout=job["timeout"],
+                        memory_limit=job["memory_limit"], cache=cache,
+                        judging=job["judging"])
+
+    # 同じソースのコンパイルは 1 回だけ（他のジョブは終わるのを待つ）
+    compiled = compile_java(job["path"])
+    if not compiled["ok"]:
+        return compile_error(case, compiled)
+    try:
+        result = run_java(compiled, case["input"], timeout=job["timeout"],
+                          memory_limit_mb=job["memory_limit"])
+    except OSError as e:
+        return compile_error(case, {"output": f"java: {e.strerror}"})
+    return judge_result(result, case, job["memory_limit"], job["judging"])
+
+
+def test_contest(contest_dir: Path, languages=None, problems=None,
+                 jobs: int | None = None, tl_factor: float = 1.0,
+                 cache: bool = True,
+                 tolerance: float | None = None) -> list[dict]:
+    """
+    全ての (問題, 言語, 入力例) を並列に実行して、(問題, 言語) ごとの結果を返す
+
+    return: [{"problem": "A", "lang": "python", "results": [...]}, ...]
+    """
+    # examples/A_1.in / A_1.out（maxcase.py の A_max1.in などは含めない）
+    samples = load_examples(contest_dir)
+    rows = []
+    for problem in sorted(samples, key=problem_order):
+        if problems and problem not in problems:
+            continue
+        data = load_problem(contest_dir / f"{problem}.py")
+        time_limit, memory_limit = (data.get("time_limit"),
+                                    data.get("memory_limit"))
+        # 誤差を許す問題（問題文から取った誤差、または --tolerance）
+        judging = judging_options(data, tolerance)
+        for lang in languages or LANGUAGES:
+            path = find_solution(contest_dir, problem, lang)
+            if path is None:
+                continue
+            rows.append({
+                "problem": problem,
+                "lang": lang,
+                "path": path,
+                "timeout": (time_limit or 2.0) * tl_factor,
+                "memory_limit": memory_limit,
+                "judging": judging,
+            })
+
+    with ThreadPoolExecutor(max_workers=max(jobs or os.cpu_count() or 1,
+                                            1)) as pool:
+        # javac を先に始めておく（入力例のジョブはコンパイル結果を待つ）
+        compiles = [pool.submit(compile_java, row["path"])
+                    for row in rows if row["lang"] == "java"]
+        for row in rows:
+            row["futures"] = [pool.submit(run_job, row, case, cache)
+                              for case in samples[row["problem"]]]
+        for row in rows:
+            row["results"] = [f.result() for f in row.pop("futures")]
+        for f in compiles:
+            f.result()
+    return rows
+
+
+# -----------------------------
+# 表示
+# -----------------------------
+
+
+def format_cell(result: dict) -> str:
+    verdict = result["verdict"]
+    mark = VERDICT_MARKS.get(verdict, "")
+    time_text = format_ms(result["wall"]) if result["wall"] is not None \
+        else ""
+    return f"{mark} {verdict:<3} {time_text:>7}"
+
+
+def print_table(rows: list[dict], elapsed: float, jobs: int) -> bool:
+    """
+    問題・言語ごとの表を表示して、全て AC なら True を返す
+    """
+    width = max((len(r["results"]) for r in rows), default=0)
+    print(f"{'problem':<8} {'lang':<7} "
+          + " ".join(f"{'#' + str(i + 1):<14}" for i in range(width))
+          + "  result")
+
+    total = passed = 0
+    failures = []
+    for row in rows:
+        results = row["results"]
+        judged = [r for r in results if r["verdict"] != "-"]
+        ok = sum(r["verdict"] == "AC" for r in judged)
+        total += len(judged)
+        passed += ok
+        cells = [f"{format_cell(r):<14}" for r in results]
+        cells += [" " * 14] * (width - len(results))
+        print(f"{row['problem']:<8} {row['lang']:<7} " + " ".join(cells)
+              + f"  {ok}/{len(judged)}" + ("  (cached)" if all(
+                  r.get("cached") for r in results) else ""))
+        bad = next((r for r in results if r["verdict"] not in ("AC", "-")),
+                   None)
+        if bad is not None:
+            failures.append((row, bad))
+
+    if failures:
+        print()
+        for row, bad in failures:
+            print(f"{VERDICT_MARKS[bad['verdict']]} {row['path'].name} "
+                  f"#{bad['case']['index']} {bad['verdict']}: "
+                  f"{verdict_detail(bad)}")
+
+    print(f"\n{passed}/{total} AC in {elapsed:.1f} s ({jobs} jobs)")
+    return passed == total
+
+
+# -----------------------------
+# CLI（setup.py test から呼ばれる）
+# -----------------------------
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="setup.py test",
+        description="run every sample of every problem and language of a "
+                    "contest on one worker pool",
+    )
+    parser.add_argument("contest", help="contest id (e.g. abc439) or dir")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(),
+                        help="samples run concurrently (default: CPUs)")
+    parser.add_argument("--lang", help="languages, comma separated "
+                                       "(default: python,java)")
+    parser.add_argument("--problems", help="problems, comma separated "
+                                           "(e.g. A,B)")
+    parser.add_argument("--tl-factor", type=float,
+                        default=float(os.environ.get("ATCODER_TL_FACTOR",
+                                                     "1.0")),
+                        help="multiply the time limits by this "
+                             "(default: $ATCODER_TL_FACTOR or 1.0)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="run Python samples even if unchanged")
+    parser.add_argument("--tolerance", type=float, metavar="EPS",
+                        help="accept numbers within this absolute or "
+                             "relative error (default: $ATCODER_TOLERANCE "
+                             "or the error bound in each problem statement)")
+    args = parser.parse_args(argv)
+
+    contest_dir = contest_dir_of(args.contest)
+    if not contest_dir.is_dir():
+        parser.error(f"contest dir not found: {contest_dir}")
+    languages = [x.strip() for x in args.lang.split(",")] \
+        if args.lang else None
+    for lang in languages or []:
+        if lang not in LANGUAGES:
+            parser.error(f"unsupported language: {lang}")
+    problems = {p.strip()[:1].upper() + p.strip()[1:]
+                for p in args.problems.split(",")} if args.problems else None
+
+    print(f"🧪 Testing {contest_dir.name}")
+    started = time.perf_counter()
+    rows = test_contest(contest_dir, languages, problems, jobs=args.jobs,
+                        tl_factor=args.tl_factor, cache=not args.no_cache,
+                        tolerance=args.tolerance)
+    if not rows:
+        print("⚠️ no samples to run (examples/*.in with a solution)")
+        return 1
+    ok = print_table(rows, time.perf_counter() - started, args.jobs)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+TOOLS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TOOLS_DIR))
+
+
+def load_script(name: str):
+    """
+    setup-python.py のような、import できない名前のスクリプトを読み込む
+    """
+    path = TOOLS_DIR / name
+    spec = importlib.util.spec_from_file_location(
+        path.stem.replace("-", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """
+    テストごとに空のキャッシュ（get_store() もこれを返す）
+    """
+    import cache_store
+
+    s = cache_store.CacheStore(tmp_path / "cache.sqlite3")
+    monkeypatch.setattr(cache_store, "_store", s)
+    monkeypatch.delenv("ATCODER_TOLERANCE", raising=False)
+    yield s
+    s.close()
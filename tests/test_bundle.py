@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+import subprocess
+import sys
+
+from bundle import inline_library, strip_debug
+
+SOURCE = """\
+import os
+
+DEBUG = False
+
+
+def debug(*args):
+    if os.environ.get("DEBUG") in ("1", "true"):
+        print(*args)
+
+
+ans = 42
+debug(ans)
+if DEBUG:
+    print("dbg")
+if os.environ.get("DEBUG") == "1" and ans:
+    print("dbg")
+if not DEBUG:
+    print(ans)
+if DEBUG != True:
+    print(ans + 1)
+if DEBUG or ans:
+    print(ans + 2)
+if DEBUG == False:
+    print(ans + 3)
+"""
+
+
+def run(source: str) -> str:
+    return subprocess.run([sys.executable, "-c", source], text=True,
+                          stdout=subprocess.PIPE, check=True).stdout
+
+
+def test_negated_debug_checks_are_kept():
+    result, counts = strip_debug(SOURCE)
+    assert "if not DEBUG:" in result
+    assert "if DEBUG != True:" in result
+    assert "if DEBUG or ans:" in result
+    assert "if DEBUG == False:" in result
+    assert counts["block"] == 2
+    assert counts["call"] == 1 and counts["def"] == 1
+    # 提出するプログラムの出力は変わらない
+    assert run(result) == run(SOURCE) == "42\n43\n44\n45\n"
+
+
+def test_inlined_library_runs_without_cplib(tmp_path):
+    source = """\
+from cplib import UnionFind as UF, dijkstra
+
+uf = UF(3)
+uf.union(0, 2)
+print(uf.same(0, 2), uf.size(1))
+print(*dijkstra([[(1, 5)], [(2, 1)], []], 0))
+"""
+    result, names = inline_library(source)
+    assert names == ["UnionFind", "dijkstra"]
+    assert "cplib import" not in result
+    # 使っていない定義は埋め込まない
+    assert "class Fenwick" not in result and "class SegTree" not in result
+
+    path = tmp_path / "A.py"
+    path.write_text(result, encoding="utf-8")
+    # -I: カレントディレクトリもスクリプトのディレクトリも sys.path に入れない
+    out = subprocess.run([sys.executable, "-I", str(path)], text=True,
+                         stdout=subprocess.PIPE, cwd=tmp_path,
+                         check=True).stdout
+    assert out == "True 1\n0 5 6\n"
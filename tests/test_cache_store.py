@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+
+import scrape
+from cache_store import DEFAULT_TTL, CacheStore
+
+
+def test_expired_problem_is_fetched_again(store):
+    scrape.save_cache("abc999", "A", "https://example.com", "A - Test", [])
+    assert scrape.load_cache("abc999", "A")["title"] == "A - Test"
+
+    with store._lock:
+        store._conn.execute(
+            "UPDATE entries SET created_at = ?",
+            (time.time() - DEFAULT_TTL["problem"] - 1,),
+        )
+    assert scrape.load_cache("abc999", "A") is None
+    # 取り直せなかったときのために、期限を指定しなければまだ読める
+    assert scrape.load_cache("abc999", "A", ttl=None)["title"] == "A - Test"
+
+
+def test_pages_count_towards_the_size_limit(tmp_path):
+    s = CacheStore(tmp_path / "cache.sqlite3", max_bytes=64 * 1024)
+    try:
+        # 16 KiB の本文（ランダムなので圧縮しても 8 KiB ほど残る）
+        for i in range(10):
+            s.put_page(f"https://example.com/{i}", "abc999", "problem",
+                       str(i), os.urandom(8 * 1024).hex())
+        urls = [p["url"] for p in s.pages()]
+        assert "https://example.com/0" not in urls
+        assert "https://example.com/9" in urls
+        with s._lock:
+            packed = s._conn.execute(
+                "SELECT SUM(LENGTH(data)) FROM blobs").fetchone()[0]
+        assert packed <= s.max_bytes
+    finally:
+        s.close()
+
+
+def test_results_do_not_evict_problems(tmp_path):
+    s = CacheStore(tmp_path / "cache.sqlite3", max_bytes=64 * 1024,
+                   namespace_max_bytes={"result": 32 * 1024})
+    try:
+        s.put("problem", "abc999", "A", {"title": "A - Test"})
+        s.put("http", "", "https://example.com/", {"etag": "x"})
+        for i in range(100):
+            s.put("result", "abc999", str(i), {"stdout": "x" * 1024})
+        assert s.get("problem", "abc999", "A") == {"title": "A - Test"}
+        assert s.get("http", "", "https://example.com/") == {"etag": "x"}
+        assert s.get("result", "abc999", "0") is None
+        assert s.get("result", "abc999", "99") is not None
+
+        # ページで上限を超えても、問題は消さない
+        for i in range(10):
+            s.put_page(f"https://example.com/{i}", "abc999", "problem",
+                       str(i), os.urandom(8 * 1024).hex())
+        assert s.get("problem", "abc999", "A") == {"title": "A - Test"}
+    finally:
+        s.close()
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+import math
+
+import pytest
+
+from complexity import MODELS, estimate, loglog_slope, predict
+
+SIZES = [1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000]
+
+
+def timings(model, a=0.02, b=1e-7, noise=0.0):
+    # 起動時間 a と、±noise の決まった揺らぎ
+    return [(n, (a + b * MODELS[model](n)) * (1 + noise * (-1) ** k))
+            for k, n in enumerate(SIZES)]
+
+
+@pytest.mark.parametrize("model, b", [
+    ("O(n)", 1e-6), ("O(n log n)", 1e-6), ("O(n^2)", 1e-9),
+])
+def test_estimate_picks_the_generating_model(model, b):
+    assert estimate(timings(model, b=b, noise=0.01))[0]["model"] == model
+
+
+def test_estimate_prefers_the_simpler_model_for_flat_timings():
+    assert estimate(timings("O(1)", noise=0.005))[0]["model"] == "O(1)"
+
+
+def test_estimate_needs_two_sizes():
+    with pytest.raises(ValueError):
+        estimate([(1000, 0.1)])
+
+
+def test_predict_extrapolates_the_fit():
+    best = estimate(timings("O(n log n)", b=1e-6))[0]
+    n = 10**6
+    assert predict(best, n) == pytest.approx(0.02 + 1e-6 * n * math.log(n),
+                                             rel=1e-6)
+
+
+def test_loglog_slope_uses_the_two_largest_sizes():
+    points = [(n, 1e-9 * n * n) for n in SIZES]
+    assert loglog_slope(points) == pytest.approx(2.0)
+    assert loglog_slope([(1000, 0.1)]) is None
+    assert loglog_slope([(1000, 0.0), (2000, 0.1)]) is None
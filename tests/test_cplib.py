@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+import operator
+import random
+
+from cplib import Fenwick, SegTree, UnionFind, dijkstra
+
+
+def test_union_find_matches_naive_labels():
+    rng = random.Random(0)
+    n = 50
+    uf = UnionFind(n)
+    label = list(range(n))
+    for _ in range(60):
+        a, b = rng.randrange(n), rng.randrange(n)
+        merged = label[a] != label[b]
+        assert uf.union(a, b) == merged
+        old, new = label[b], label[a]
+        label = [new if x == old else x for x in label]
+        x, y = rng.randrange(n), rng.randrange(n)
+        assert uf.same(x, y) == (label[x] == label[y])
+        assert uf.size(x) == label.count(label[x])
+    assert sorted(map(sorted, uf.groups())) == sorted(
+        [i for i in range(n) if label[i] == g] for g in set(label))
+
+
+def test_fenwick_sums_and_lower_bound():
+    rng = random.Random(1)
+    values = [rng.randint(0, 9) for _ in range(37)]
+    ft = Fenwick.build(values)
+    for _ in range(100):
+        i = rng.randrange(len(values))
+        x = rng.randint(0, 5)
+        ft.add(i, x)
+        values[i] += x
+        l = rng.randrange(len(values) + 1)
+        r = rng.randrange(l, len(values) + 1)
+        assert ft.sum(l, r) == sum(values[l:r])
+
+    total = sum(values)
+    for w in (1, total // 2, total):
+        i = ft.lower_bound(w)
+        assert sum(values[:i + 1]) >= w
+        assert i == 0 or sum(values[:i]) < w
+    assert ft.lower_bound(total + 1) == len(values)
+
+
+def test_seg_tree_prod_and_max_right():
+    rng = random.Random(2)
+    values = [rng.randint(-100, 100) for _ in range(21)]
+    st = SegTree(values, max, -10**9)
+    for _ in range(100):
+        i = rng.randrange(len(values))
+        values[i] = rng.randint(-100, 100)
+        st.set(i, values[i])
+        assert st.get(i) == values[i]
+        l = rng.randrange(len(values) + 1)
+        r = rng.randrange(l, len(values) + 1)
+        assert st.prod(l, r) == max(values[l:r], default=-10**9)
+    assert st.all_prod() == max(values)
+
+    # max_right は f が単調なときに使う（和なら値を 0 以上にする）
+    weights = [abs(v) for v in values]
+    sums = SegTree(weights, operator.add, 0)
+    for l in range(len(weights) + 1):
+        k = rng.randint(1, 300)
+        want = l
+        while want < len(weights) and sum(weights[l:want + 1]) < k:
+            want += 1
+        assert sums.max_right(l, lambda v: v < k) == want
+
+
+def test_dijkstra_matches_bellman_ford():
+    rng = random.Random(3)
+    n = 30
+    adj = [[] for _ in range(n)]
+    edges = []
+    for _ in range(80):
+        u, v, w = rng.randrange(n), rng.randrange(n), rng.randint(0, 20)
+        adj[u].append((v, w))
+        edges.append((u, v, w))
+
+    want = [None] * n
+    want[0] = 0
+    for _ in range(n):
+        for u, v, w in edges:
+            if want[u] is not None and (want[v] is None
+                                        or want[u] + w < want[v]):
+                want[v] = want[u] + w
+    assert dijkstra(adj, 0) == [-1 if d is None else d for d in want]
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import os
+import signal
+import subprocess
+import sys
+
+import pytest
+
+import forkserver
+from forkserver import ForkServer
+
+
+@pytest.fixture
+def server():
+    with ForkServer(preload=()) as s:
+        yield s
+
+
+def test_run_reads_stdin_and_reports_the_exit_code(server, tmp_path):
+    script = tmp_path / "A.py"
+    script.write_text(
+        "import sys\n"
+        "print(sum(map(int, input().split())))\n"
+        "print('err', file=sys.stderr)\n"
+        "sys.exit(3)\n")
+    result = server.run(str(script), "1 2 3\n", timeout=5.0)
+    assert result["stdout"] == "6\n"
+    assert result["stderr"] == "err\n"
+    assert result["returncode"] == 3
+    assert not result["timed_out"]
+
+
+def test_run_kills_a_case_over_the_timeout(server, tmp_path):
+    script = tmp_path / "A.py"
+    script.write_text("while True:\n    pass\n")
+    result = server.run(str(script), "", timeout=0.2)
+    assert result["timed_out"]
+    assert result["returncode"] == -signal.SIGKILL
+
+    # kill した後も次のケースを実行できる
+    script.write_text("print('ok')\n")
+    assert server.run(str(script), "", timeout=5.0)["stdout"] == "ok\n"
+
+
+def test_each_run_starts_from_a_fresh_fork(server, tmp_path):
+    script = tmp_path / "A.py"
+    script.write_text(
+        "import os, sys\n"
+        "import json\n"
+        "print(json.dumps([getattr(json, 'seen', False),\n"
+        "                  os.environ.get('CASE'), sys.argv[1:]]))\n"
+        "json.seen = True\n"
+        "os.environ['CASE'] = 'leaked'\n")
+    first = server.run(str(script), "", env={"CASE": "1"}, argv=["x"])
+    second = server.run(str(script), "")
+    assert first["stdout"] == '[false, "1", ["x"]]\n'
+    assert second["stdout"] == '[false, null, []]\n'
+
+
+def test_wait_child_without_pidfd_reaps_once(monkeypatch):
+    monkeypatch.delattr(os, "pidfd_open", raising=False)
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    status, _, timed_out = forkserver._wait_child(proc.pid, 5.0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert not timed_out
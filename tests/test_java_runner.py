@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+import shutil
+import threading
+
+import pytest
+
+from java_runner import JvmServer, compile_java, main_class, run_java
+
+needs_jdk = pytest.mark.skipif(
+    shutil.which("javac") is None or shutil.which("java") is None,
+    reason="JDK is not installed")
+
+COUNTER = """package abc999;
+
+import java.util.Scanner;
+
+public class A {
+    static int calls = 0;
+
+    public static void main(String[] args) {
+        Scanner sc = new Scanner(System.in);
+        int n = sc.nextInt();
+        calls++;
+        if (n < 0) {
+            System.exit(3);
+        }
+        while (n == 0) {
+        }
+        System.out.println(n * 2 + " " + calls);
+    }
+}
+"""
+
+
+@pytest.fixture
+def javac_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("ATCODER_JAVAC_CACHE", str(tmp_path / "javac"))
+    return tmp_path / "javac"
+
+
+def counting_javac(tmp_path, code=0):
+    """
+    呼ばれた回数を calls に数え、code で終了する javac の代わり
+    """
+    calls = tmp_path / "calls"
+    javac = tmp_path / "fake-javac"
+    javac.write_text(f'#!/bin/sh\necho >> "{calls}"\n'
+                     f'echo "compiled $*"\nexit {code}\n')
+    javac.chmod(0o755)
+    return str(javac), calls
+
+
+def write_source(tmp_path, text=COUNTER):
+    source = tmp_path / "A.java"
+    source.write_text(text, encoding="utf-8")
+    return source
+
+
+def test_main_class_includes_the_package(tmp_path):
+    assert main_class(write_source(tmp_path)) == "abc999.A"
+    assert main_class(write_source(tmp_path, "public class A {}\n")) == "A"
+
+
+def test_compile_runs_javac_once_per_source(javac_cache, tmp_path):
+    javac, calls = counting_javac(tmp_path)
+    source = write_source(tmp_path)
+
+    results = []
+    threads = [threading.Thread(
+        target=lambda: results.append(compile_java(source, javac)))
+        for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls.read_text().splitlines()) == 1
+    assert sorted(r["cached"] for r in results) == [False, True, True, True]
+    assert {r["class_dir"] for r in results} == {results[0]["class_dir"]}
+    assert all(r["ok"] and r["main_class"] == "abc999.A" for r in results)
+
+    # ソースを変えたらコンパイルし直す
+    write_source(tmp_path, COUNTER.replace("n * 2", "n * 3"))
+    assert not compile_java(source, javac)["cached"]
+    assert len(calls.read_text().splitlines()) == 2
+
+
+def test_compile_errors_are_cached_too(javac_cache, tmp_path):
+    javac, calls = counting_javac(tmp_path, code=1)
+    source = write_source(tmp_path)
+    first = compile_java(source, javac)
+    second = compile_java(source, javac)
+    assert not first["ok"] and not second["ok"]
+    assert second["cached"] and second["output"] == first["output"]
+    assert len(calls.read_text().splitlines()) == 1
+
+
+def test_compile_reports_a_missing_javac(javac_cache, tmp_path):
+    result = compile_java(write_source(tmp_path),
+                          str(tmp_path / "no-such-javac"))
+    assert not result["ok"]
+    assert result["class_dir"] is None
+    assert list(javac_cache.iterdir()) == []
+
+
+@needs_jdk
+def test_run_java_compiles_and_runs(javac_cache, tmp_path):
+    compiled = compile_java(write_source(tmp_path))
+    assert compiled["ok"], compiled["output"]
+    result = run_java(compiled, "21\n", timeout=10.0)
+    assert result["returncode"] == 0
+    assert result["stdout"] == "42 1\n"
+
+
+@needs_jdk
+def test_jvm_server_resets_statics_and_restarts(javac_cache, tmp_path):
+    compiled = compile_java(write_source(tmp_path))
+    assert compiled["ok"], compiled["output"]
+    with JvmServer(compiled) as server:
+        # 入力ごとにクラスを読み込み直すので calls は毎回 1
+        assert server.run("A.java", "1\n", timeout=10.0)["stdout"] == "2 1\n"
+        assert server.run("A.java", "2\n", timeout=10.0)["stdout"] == "4 1\n"
+
+        assert server.run("A.java", "-1\n", timeout=10.0)["returncode"] == 3
+        assert server.run("A.java", "0\n", timeout=1.0)["timed_out"]
+        # System.exit() と TLE の後は JVM を起動し直す
+        assert server.run("A.java", "5\n", timeout=10.0)["stdout"] == "10 1\n"
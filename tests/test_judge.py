@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+import sys
+
+import setup
+import validate
+from judge import check, judging_options
+
+PROBLEM_PAGE = """
+<span class="h2">A - Average</span>
+<p>実行時間制限: 2 sec / メモリ制限: 1024 MiB</p>
+<div id="task-statement">
+  <div class="part"><section><h3>入力</h3><pre>N</pre></section></div>
+  <div class="part"><section><h3>出力</h3>
+    <p>答えを出力せよ。真の値との絶対誤差または相対誤差が
+    <var>10^{-6}</var> 以下であれば正解とみなされる。</p>
+  </section></div>
+  <div class="part"><section><h3>入力例 1</h3><pre>3
+</pre></section></div>
+  <div class="part"><section><h3>出力例 1</h3><pre>0.333333333333
+</pre></section></div>
+</div>
+"""
+
+
+def test_float_within_statement_tolerance(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(setup, "download_html",
+                        lambda *args, **kwargs: PROBLEM_PAGE)
+    setup.fetch_problem("abc999", {"id": "A", "url": "https://example.com"},
+                        None, None, None)
+    assert store.get("problem", "abc999", "A")["tolerance"] == 1e-06
+
+    contest_dir = tmp_path / "ABC999"
+    contest_dir.mkdir()
+    prog = contest_dir / "A.py"
+    prog.write_text("print(f'{1 / int(input()):.7f}')\n", encoding="utf-8")
+
+    judging = judging_options(validate.load_problem(prog))
+    case = {"index": 1, "input": "3\n", "expected": "0.333333333333"}
+    result = validate.run_case(str(prog), case, cache=False,
+                               interpreter=sys.executable, judging=judging)
+    assert result["output"] == "0.3333333"
+    assert result["verdict"] == "AC"
+
+    # 誤差を許さない問題なら WA
+    assert check("0.3333333\n", "0.333333333333") is not None
+
+
+def test_generated_test_renders_tolerance(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(setup, "download_html",
+                        lambda *args, **kwargs: PROBLEM_PAGE)
+    setup.fetch_problem("abc999", {"id": "A", "url": "https://example.com"},
+                        None, None, None)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "ABC999").mkdir()
+    monkeypatch.setattr(sys, "argv", ["setup-python.py", "abc999", "A"])
+    from conftest import load_script
+
+    load_script("setup-python.py").main()
+    test_code = (tmp_path / "ABC999" / "tests" / "test_a.py").read_text(
+        encoding="utf-8")
+    assert "TOLERANCE = 1e-06\n" in test_code
+
+
+def test_long_output_is_judged_from_the_file(store, tmp_path, monkeypatch):
+    import runner
+
+    # 出力の先頭 16 バイトだけをメモリに置く
+    monkeypatch.setattr(runner, "OUTPUT_PREVIEW", 16)
+    prog = tmp_path / "A.py"
+    prog.write_text("for i in range(100):\n    print(i, i * i)\n",
+                    encoding="utf-8")
+    expected = "\n".join(f"{i} {i * i}" for i in range(100))
+
+    case = {"index": 1, "input": "", "expected": expected}
+    result = validate.run_case(str(prog), case, cache=False,
+                               interpreter=sys.executable)
+    assert result["stdout_truncated"]
+    assert len(result["stdout"]) == 16
+    assert result["verdict"] == "AC"
+
+    # 切った先の違いも見つける
+    case = {**case, "expected": expected[:-1] + "0"}
+    result = validate.run_case(str(prog), case, cache=False,
+                               interpreter=sys.executable)
+    assert result["verdict"] == "WA"
+    assert (result["mismatch"]["line"], result["mismatch"]["token"]) == \
+        (100, 2)
+
+    # 特別なジャッジにもファイルの全体を渡す
+    checker = tmp_path / "checker.py"
+    checker.write_text(
+        "import sys\n"
+        "lines = open(sys.argv[2]).read().split('\\n')\n"
+        "sys.exit(0 if lines[99] == '99 9801' else 1)\n",
+        encoding="utf-8")
+    result = validate.run_case(str(prog), case, cache=False,
+                               interpreter=sys.executable,
+                               judging=judging_options(checker=checker))
+    assert result["verdict"] == "AC"
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from maxcase import MaxCase, parse_input_format
+from scrape import parse_constraint_bounds
+
+GRAPH_FORMAT = ("N M\n"
+                "A_1 A_2 \\ldots A_N\n"
+                "u_1 v_1\n"
+                "u_2 v_2\n"
+                "\\vdots\n"
+                "u_M v_M\n")
+GRAPH_CONSTRAINTS = [
+    "2 \\leq N \\leq 10",
+    "1 \\leq M \\leq 20",
+    "1 \\leq A_i \\leq 10^9",
+    "1 \\leq u_i < v_i \\leq N",
+]
+
+
+def constraints(raw):
+    return {"raw": raw, "bounds": parse_constraint_bounds(raw)}
+
+
+def test_parse_input_format_groups_arrays_and_rows():
+    spec = parse_input_format(GRAPH_FORMAT)
+    assert [[item["base"] for item in block["items"]] for block in spec] \
+        == [["N", "M"], ["A"], ["u", "v"]]
+    assert spec[0]["repeat"] is None
+    array = spec[1]["items"][0]
+    assert (array["kind"], array["start"], array["end"]) == ("array", "1", "N")
+    # u_2 v_2 の行も \vdots にまとめる
+    assert spec[2]["repeat"] == ("1", "M")
+
+
+def test_parse_input_format_rejects_unknown_tokens():
+    with pytest.raises(ValueError):
+        parse_input_format("N + M\n")
+
+
+def test_max_case_hits_the_upper_bounds():
+    case = MaxCase(parse_input_format(GRAPH_FORMAT),
+                   constraints(GRAPH_CONSTRAINTS), "max")
+    lines = "".join(case.generate()).splitlines()
+    assert lines[0] == "10 20"
+    assert lines[1].split() == ["1000000000"] * 10
+    assert lines[2:] == ["10 10"] * 20
+    assert case.n == 20
+
+
+def test_random_case_keeps_sizes_and_stays_in_range():
+    case = MaxCase(parse_input_format(GRAPH_FORMAT),
+                   constraints(GRAPH_CONSTRAINTS), "rand", seed=1)
+    lines = "".join(case.generate()).splitlines()
+    assert lines[0] == "10 20"
+    assert all(1 <= int(a) <= 10**9 for a in lines[1].split())
+    assert len(lines) == 2 + 20
+    assert all(1 <= int(x) <= 10 for line in lines[2:] for x in line.split())
+
+
+def test_scale_shrinks_the_sizes_and_their_bounds():
+    raw = ["1 \\leq N \\leq 1000", "1 \\leq A_i \\leq N"]
+    case = MaxCase(parse_input_format("N\nA_1 A_2 \\ldots A_N\n"),
+                   constraints(raw), "max", scale=0.1)
+    lines = "".join(case.generate()).splitlines()
+    assert lines[0] == "100"
+    assert lines[1].split() == ["100"] * 100
+    assert case.n == 100
+
+
+def test_string_length_comes_from_the_constraints():
+    raw = ["S は英小文字からなる長さ 1 以上 5 以下の文字列"]
+    bounds = {"|S|": {"min": 1, "max": 5}}
+    case = MaxCase(parse_input_format("S\n"),
+                   {"raw": raw, "bounds": bounds}, "max")
+    assert "".join(case.generate()) == "aaaaa\n"
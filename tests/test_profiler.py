@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+import sys
+
+import validate
+
+SOLUTION = """\
+def slow():
+    return sum(i * i for i in range(300000))
+
+
+def fast():
+    return sum(range(1000))
+
+
+def solve():
+    print(slow() + fast())
+
+
+solve()
+"""
+
+
+def collapsed(path):
+    stacks = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        stack, count = line.rsplit(" ", 1)
+        stacks[stack] = int(count)
+    return stacks
+
+
+def test_cprofile_writes_collapsed_stacks(tmp_path, capsys):
+    prog = tmp_path / "A.py"
+    prog.write_text(SOLUTION, encoding="utf-8")
+    validate.profile(str(prog), "", "sample1", mode="cprofile",
+                     interpreter=sys.executable)
+    assert f"cprofile, {sys.executable}" in capsys.readouterr().out
+
+    stacks = collapsed(tmp_path / "profile" / "A_sample1.collapsed")
+    assert not any("profiler.py" in s or "runpy" in s for s in stacks)
+
+    def total(name):
+        return sum(v for s, v in stacks.items() if name in s.split(";"))
+
+    # slow の下（ジェネレータ式）に時間のほとんどが付く
+    assert total("A.py:slow") > 10 * max(total("A.py:fast"), 1)
+    assert any(s.startswith("A.py:<module>;A.py:solve;A.py:slow")
+               for s in stacks)
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+import sys
+
+from runner import run_measured
+from validate import is_mle
+
+# 使わないアドレス空間を大きく予約する（numpy や PyPy と同じ）
+RESERVE = """\
+import mmap
+m = mmap.mmap(-1, 1024 * 1024 * 1024)
+print("ok")
+"""
+
+# 実際に 128 MiB 書き込む
+TOUCH = """\
+data = b"x" * (128 * 1024 * 1024)
+print(len(data))
+"""
+
+
+def test_reserved_address_space_is_not_mle():
+    r = run_measured([sys.executable, "-c", RESERVE], "", memory_limit_mb=64)
+    assert r["returncode"] == 0, r["stderr"]
+    assert r["stdout"] == "ok\n"
+    assert not is_mle(r, 64)
+
+
+def test_peak_rss_over_the_limit_is_mle():
+    r = run_measured([sys.executable, "-c", TOUCH], "", memory_limit_mb=64)
+    assert r["returncode"] == 0, r["stderr"]
+    assert is_mle(r, 64)
+
+
+def test_timeout_kills_the_program():
+    r = run_measured([sys.executable, "-c", "import time; time.sleep(10)"],
+                     "", timeout=0.2)
+    assert r["timed_out"]
+    assert r["returncode"] == -9
+    assert r["wall"] < 5
+
+
+def test_runs_finishing_at_the_deadline_are_not_tle():
+    # 終了と timer がほぼ同時でも、kill していない実行は TLE にしない
+    for i in range(30):
+        r = run_measured([sys.executable, "-c", "pass"], "",
+                         timeout=0.01 + 0.002 * i)
+        assert r["timed_out"] == (r["returncode"] == -9), r
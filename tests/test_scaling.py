@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+import random
+import sys
+
+import validate
+from scrape import parse_constraint_bounds
+
+CONSTRAINTS = ["1 \\leq N \\leq 4000", "1 \\leq A_i \\leq 10^9"]
+
+
+def save_problem(store):
+    store.put("problem", "abc999", "A", {
+        "time_limit": 2.0,
+        "input_format": "N\nA_1 A_2 \\ldots A_N\n",
+        "constraints": {"raw": CONSTRAINTS,
+                        "bounds": parse_constraint_bounds(CONSTRAINTS)},
+    })
+
+
+def counting_interpreter(tmp_path):
+    """
+    呼ばれた回数を calls に数えてから Python を実行するインタプリタ
+    """
+    calls = tmp_path / "calls"
+    interpreter = tmp_path / "counting-python"
+    interpreter.write_text(f'#!/bin/sh\necho >> "{calls}"\n'
+                           f'exec "{sys.executable}" "$@"\n')
+    interpreter.chmod(0o755)
+    return str(interpreter), calls
+
+
+def write_solution(tmp_path):
+    contest_dir = tmp_path / "ABC999"
+    contest_dir.mkdir()
+    prog = contest_dir / "A.py"
+    prog.write_text("input()\nprint(sum(map(int, input().split())))\n",
+                    encoding="utf-8")
+    return prog
+
+
+def test_scaling_runs_under_the_chosen_interpreter(store, tmp_path):
+    save_problem(store)
+    prog = write_solution(tmp_path)
+    interpreter, calls = counting_interpreter(tmp_path)
+
+    assert validate.scaling(str(prog), steps=4, repeat=1, timeout=10,
+                            interpreter=interpreter)
+    assert len(calls.read_text().splitlines()) == 4
+
+
+def write_generator_and_brute(tmp_path):
+    generator = tmp_path / "gen.py"
+    generator.write_text("import random, sys\n"
+                         "random.seed(int(sys.argv[1]))\n"
+                         "print(3)\n"
+                         "print(*[random.randint(1, 9) for _ in range(3)])\n",
+                         encoding="utf-8")
+    brute = tmp_path / "brute.py"
+    brute.write_text("input()\nprint(sum(int(a) for a in input().split()))\n",
+                     encoding="utf-8")
+    return generator, brute
+
+
+def test_stress_runs_under_the_chosen_interpreter(tmp_path):
+    prog = write_solution(tmp_path)
+    interpreter, calls = counting_interpreter(tmp_path)
+    generator, brute = write_generator_and_brute(tmp_path)
+
+    assert validate.stress(str(prog), str(generator), str(brute),
+                           iterations=5, timeout=10,
+                           out_dir=str(tmp_path / "stress"),
+                           interpreter=interpreter) is None
+    # 常駐するフォークサーバを 1 つだけ起動する
+    assert len(calls.read_text().splitlines()) == 1
+
+
+def test_stress_reports_the_first_failing_seed(tmp_path):
+    prog = write_solution(tmp_path)
+    # 和が 20 以上のときだけ 1 ずれる
+    prog.write_text("input()\ns = sum(map(int, input().split()))\n"
+                    "print(s - (s >= 20))\n", encoding="utf-8")
+    generator, brute = write_generator_and_brute(tmp_path)
+
+    def total(seed):
+        rng = random.Random(seed)
+        return sum(rng.randint(1, 9) for _ in range(3))
+
+    first = next(s for s in itertools.count() if total(s) >= 20)
+    out_dir = tmp_path / "stress"
+    assert validate.stress(str(prog), str(generator), str(brute),
+                           iterations=1000, jobs=2, timeout=10,
+                           out_dir=str(out_dir),
+                           interpreter=sys.executable) == first
+
+    stem = out_dir / f"A_seed{first}"
+    data = stem.with_suffix(".in").read_text(encoding="utf-8")
+    assert sum(map(int, data.split()[1:])) == total(first)
+    want = int(stem.with_suffix(".expected").read_text(encoding="utf-8"))
+    got = int(stem.with_suffix(".out").read_text(encoding="utf-8"))
+    assert want == got + 1 == total(first)
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+import pytest
+
+import scrape
+from scrape import RateLimiter, parse_constraint_bounds
+
+PROBLEM_PAGE = """<!DOCTYPE html>
+<html><head><title>A - Test</title></head><body>
+<nav><a class="contest-title" href="/contests/abc999">AtCoder Beginner Contest 999</a></nav>
+<div id="main-container" class="container">
+<div class="row">
+<div class="col-sm-12">
+<span class="h2">A - Test <a class="btn btn-default" href="/contests/abc999/editorial">解説</a></span>
+<p>実行時間制限: 2 sec / メモリ制限: 1024 MiB</p>
+<div id="contest-nav-tabs"><div>
+<small class="contest-duration">コンテスト時間:
+<a href="#"><time>2025-12-27 21:00:00+0900</time></a> ~
+<a href="#"><time>2025-12-27 22:40:00+0900</time></a></small>
+</div></div>
+<div id="task-statement"><span class="lang"><span class="lang-ja">
+<div class="part"><section><h3>問題文</h3><p>和を求めてください。</p></section></div>
+<div class="part"><section><h3>制約</h3><ul>
+<li>\\(1 \\leq N \\leq 10^5\\)</li>
+<li>\\(1 \\leq A_i \\leq 10^9\\)</li>
+</ul></section></div>
+<hr/>
+<div class="io-style">
+<div class="part"><section><h3>入力</h3><pre>\\(N\\)
+\\(A_1\\) \\(A_2\\) \\(\\ldots\\) \\(A_N\\)
+</pre></section></div>
+<div class="part"><section><h3>出力</h3><p>答えを出力せよ。</p></section></div>
+</div>
+<hr/>
+<div class="part"><section><h3>入力例 1</h3><pre>3\r
+1 2 3\r
+</pre></section></div>
+<div class="part"><section><h3>出力例 1</h3><pre>6
+</pre></section></div>
+<div class="part"><section><h3>入力例 2</h3><pre>1
+5
+</pre></section></div>
+<div class="part"><section><h3>出力例 2</h3><pre>5
+</pre></section></div>
+</span></span></div>
+</div></div></div>
+</body></html>
+"""
+
+
+def test_rate_limiter_allows_a_burst_then_paces():
+    limiter = RateLimiter(rate=20, burst=3)
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+    assert time.monotonic() - started < 0.04
+
+    started = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+    # 1 回あたり 1 / rate = 50 ms
+    assert 0.17 <= time.monotonic() - started < 0.5
+
+
+def test_rate_limiter_is_shared_by_threads():
+    limiter = RateLimiter(rate=50, burst=2)
+    started = time.monotonic()
+    threads = [threading.Thread(target=lambda: [limiter.acquire()
+                                                for _ in range(3)])
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 12 回のうち burst の 2 回以外は 20 ms ずつ
+    assert time.monotonic() - started >= 0.18
+
+
+def test_rate_limiter_rejects_a_non_positive_rate():
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+
+
+def test_chain_bounds_only_the_inner_operands():
+    bounds = parse_constraint_bounds([
+        "2 \\leq N \\leq 2\\times 10^5",
+        "1 \\leq u_i < v_i \\leq N",
+    ])
+    assert bounds["N"] == {"min": 2, "max": 200000}
+    assert bounds["u_i"]["min"] == 1
+    assert bounds["v_i"]["max"] == 200000
+
+
+def test_later_lines_do_not_loosen_bounds():
+    bounds = parse_constraint_bounds([
+        "1 \\leq A_i \\leq 10^9",
+        "0 \\leq A_i \\leq 10^{18}",
+        "A_i \\leq 1000",
+    ])
+    assert bounds["A_i"] == {"min": 1, "max": 1000}
+
+
+@pytest.mark.parametrize("parser", ["html.parser", "lxml"])
+def test_problem_page_matches_the_separate_extractors(monkeypatch, parser):
+    if parser == "lxml":
+        pytest.importorskip("lxml")
+    monkeypatch.setattr(scrape, "HTML_PARSER", parser)
+
+    page = scrape.extract_problem_page(PROBLEM_PAGE)
+    assert page["title"] == scrape.extract_problem_title(PROBLEM_PAGE)
+    assert page["examples"] == scrape.extract_examples_from_html(PROBLEM_PAGE)
+    assert page["meta"] == scrape.extract_contest_meta_from_html(PROBLEM_PAGE)
+
+    assert page["title"] == "A - Test"
+    assert page["examples"] == [
+        {"input": "3\n1 2 3\n", "output": "6\n"},
+        {"input": "1\n5\n", "output": "5\n"},
+    ]
+    assert page["meta"] == {
+        "title": "AtCoder Beginner Contest 999",
+        "start_time_raw": "2025-12-27 21:00:00+0900",
+        "date": "2025-12-27",
+    }
+    assert (page["time_limit"], page["memory_limit"]) == (2.0, 1024)
+    assert page["constraints"]["bounds"]["N"] == {"min": 1, "max": 100000}
+
+
+def test_task_list_rows_with_links_become_tasks():
+    html = """<table><thead><tr><th></th><th>問題名</th></tr></thead><tbody>
+<tr><td class="text-center"><a href="/contests/abc999/tasks/abc999_a">A</a></td>
+<td><a href="/contests/abc999/tasks/abc999_a">Test</a></td>
+<td class="text-right">2 sec</td><td class="text-right">1024 MiB</td></tr>
+<tr><td>B</td><td>準備中</td><td>2 sec</td><td>1024 MiB</td></tr>
+<tr><td class="text-center"><a href="/contests/abc999/tasks/abc999_c">C</a></td>
+<td><a href="/contests/abc999/tasks/abc999_c">Slow</a></td>
+<td class="text-right">500 msec</td><td class="text-right">256 MB</td></tr>
+</tbody></table>"""
+    tasks = scrape.extract_task_list_from_html(html)
+    assert tasks == [
+        {"id": "A", "title": "Test",
+         "url": "https://atcoder.jp/contests/abc999/tasks/abc999_a",
+         "time_limit": 2.0, "memory_limit": 1024},
+        {"id": "C", "title": "Slow",
+         "url": "https://atcoder.jp/contests/abc999/tasks/abc999_c",
+         "time_limit": 0.5, "memory_limit": 256},
+    ]
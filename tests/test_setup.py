@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+
+from setup import ordered_tasks
+
+TASKS = [{"id": p} for p in ("A", "B", "C", "Ex")]
+
+
+def ids(tasks):
+    return [t["id"] for t in tasks]
+
+
+def test_order_moves_problems_first():
+    assert ids(ordered_tasks(TASKS, ["C", "A"])) == ["C", "A", "B", "Ex"]
+    assert ids(ordered_tasks(TASKS)) == ["A", "B", "C", "Ex"]
+
+
+def test_order_is_case_insensitive_and_deduplicated():
+    assert ids(ordered_tasks(TASKS, ["ex", "a", "A", "EX"])) == \
+        ["Ex", "A", "B", "C"]
+    # 無い問題は無視する
+    assert ids(ordered_tasks(TASKS, ["Z", "b"])) == ["B", "A", "C", "Ex"]
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import sys
+
+from conftest import load_script
+
+
+def generate(module, monkeypatch, problem):
+    monkeypatch.setattr(sys, "argv", ["setup-java.py", "abc999", problem])
+    module.main()
+
+
+def save_problem(store, problem, memory_limit):
+    store.put("problem", "abc999", problem, {
+        "title": f"{problem} - Test", "url": "https://example.com",
+        "examples": [], "memory_limit": memory_limit,
+    })
+
+
+def test_pipeline_renders_gradle_for_the_whole_contest(store, tmp_path,
+                                                       monkeypatch):
+    setup_java = load_script("setup-java.py")
+    calls = []
+    monkeypatch.setattr(setup_java, "detect_java_version",
+                        lambda: calls.append(1) or 17)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "ABC999").mkdir()
+
+    # 問題一覧は先に保存されている（B の方が制限が大きい）
+    store.put("tasks", "abc999", "list", {"tasks": [
+        {"id": "A", "memory_limit": 1024},
+        {"id": "B", "memory_limit": 2048},
+    ]})
+    save_problem(store, "A", 1024)
+    generate(setup_java, monkeypatch, "A")
+    build_gradle = tmp_path / "ABC999" / "build.gradle"
+    assert 'maxHeapSize = "2048m"' in build_gradle.read_text()
+
+    save_problem(store, "B", 2048)
+    generate(setup_java, monkeypatch, "B")
+    assert calls == [1]
+
+
+def test_heap_size_follows_problems_found_later(store, tmp_path,
+                                                monkeypatch):
+    setup_java = load_script("setup-java.py")
+    monkeypatch.setattr(setup_java, "detect_java_version", lambda: 17)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "ABC999").mkdir()
+
+    # 問題一覧が取れなかった場合
+    save_problem(store, "A", 1024)
+    generate(setup_java, monkeypatch, "A")
+    save_problem(store, "B", 2048)
+    generate(setup_java, monkeypatch, "B")
+    text = (tmp_path / "ABC999" / "build.gradle").read_text()
+    assert 'maxHeapSize = "2048m"' in text
+    assert "AutoCreateSharedArchive" not in text
+    assert "ArchiveClassesAtExit" in text
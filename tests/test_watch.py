@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+import pytest
+
+import watcher
+from validate import watch_targets
+
+SOLUTION = '''\
+"""TEST_DATA
+1
+<expected>
+1
+"""
+print(input())
+'''
+
+
+def contest(tmp_path):
+    contest_dir = tmp_path / "ABC999"
+    java_dir = contest_dir / "src" / "main" / "java" / "abc999"
+    java_dir.mkdir(parents=True)
+    for problem in ("A", "B"):
+        (contest_dir / f"{problem}.py").write_text(SOLUTION)
+    (contest_dir / "helper.py").write_text("X = 1\n")
+    (java_dir / "C.java").write_text("class C {}\n")
+    return contest_dir.resolve()
+
+
+def test_saved_file_runs_its_problem(tmp_path):
+    contest_dir = contest(tmp_path)
+    assert watch_targets(contest_dir, {contest_dir / "A.py",
+                                       contest_dir / "helper.py"}) == \
+        {("python", "A")}
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"),
+                    reason="inotify is linux only")
+def test_overflow_reruns_every_problem(tmp_path):
+    contest_dir = contest(tmp_path)
+    w = watcher.InotifyWatcher(contest_dir)
+    # キューがあふれたときのイベント（wd = -1）を inotify の代わりに読ませる
+    os.close(w.fd)
+    w.fd, write_end = os.pipe()
+    os.write(write_end, watcher._EVENT.pack(-1, watcher.IN_Q_OVERFLOW, 0, 0))
+    os.close(write_end)
+    try:
+        paths = w.wait(1)
+    finally:
+        w.close()
+
+    assert paths == {contest_dir}
+    assert watch_targets(contest_dir, paths) == {
+        ("python", "A"), ("python", "B"), ("java", "C"),
+    }
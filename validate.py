@@ -1,9 +1,24 @@
 #!/usr/bin/env python
 
 import re
-import subprocess
 import os
 import argparse
+import itertools
+import json
+import queue
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import result_cache
+from judge import check, describe, judging_options
+from runner import run_measured
 
 
 def parse_limit(value):
@@ -21,39 +36,881 @@ def extract_test_data(filename):
         return None
 
 
-def run_prog_with_data(prog_name, data, debug=False):
+def parse_cases(data, limit=None):
+    cases = []
     blocks = data.strip().split("\n\n")  # Split into blocks by empty lines
     for index, block in enumerate(blocks):
         # skip not specified sample
-        if args.limit and not index in [i - 1 for i in args.limit]:
+        if limit and index + 1 not in limit:
             continue
 
         try:
             input_data, expected_answer = block.split("<expected>")
-            expected_answer = expected_answer.strip().replace('\n', ' ')
+            # keep the lines: judge.check() reports the mismatching line
+            expected_answer = expected_answer.strip()
         except ValueError:
             input_data = block
             expected_answer = None
-        print(f"Input {index + 1}")
-        print(input_data)
-
-        env = os.environ.copy()
-        if debug:
-            env['DEBUG'] = '1'
-        process = subprocess.Popen(["python3", prog_name], stdin=subprocess.PIPE,
-                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=env)
-        stdout, stderr = process.communicate(input=input_data)
-        stdout = stdout.strip().replace('\n', ' ')
-        print(f"Output {index + 1}")
-        print(stdout, stderr)
-        if process.returncode != 0:
-            break
-        elif expected_answer:
-            if stdout == expected_answer:
-                print("✅ OK")
-            else:
-                print(f"❌ WA, expected: {expected_answer}")
-        print()
+        cases.append({
+            "index": index + 1,
+            "input": input_data,
+            "expected": expected_answer,
+        })
+    return cases
+
+
+# print_result shows at most this much of the output
+OUTPUT_SHOWN = 64 * 1024
+
+
+def normalize_output(text):
+    return text.strip().replace('\n', ' ')
+
+
+def load_problem(prog_name):
+    """
+    Return the problem cached by setup.py for e.g. ABC438/A.py ({} if the
+    problem was never scraped).
+    """
+    path = Path(prog_name).resolve()
+    try:
+        from cache_store import get_store
+        data = get_store().get("problem", path.parent.name.lower(), path.stem)
+    except Exception:
+        data = None
+    return data or {}
+
+
+def load_limits(prog_name):
+    """
+    Return (time_limit, memory_limit) cached by setup.py, or (None, None).
+    """
+    data = load_problem(prog_name)
+    return data.get("time_limit"), data.get("memory_limit")
+
+
+def is_mle(result, memory_limit):
+    if memory_limit is None:
+        return False
+    if result["returncode"] != 0 and "MemoryError" in result["stderr"]:
+        return True
+    return result["max_rss_kb"] is not None and \
+        result["max_rss_kb"] > memory_limit * 1024
+
+
+def execute_case(prog_name, case, env, timeout, servers, memory_limit,
+                 interpreter, stdout_path=None):
+    if servers is not None:
+        # borrow an idle fork server for this case
+        server = servers.get()
+        try:
+            return server.run(prog_name, case["input"], timeout=timeout,
+                              env=env, memory_limit_mb=memory_limit,
+                              stdout_path=stdout_path)
+        finally:
+            servers.put(server)
+    return run_measured([interpreter, prog_name], case["input"],
+                        timeout=timeout, env=env,
+                        memory_limit_mb=memory_limit,
+                        stdout_path=stdout_path)
+
+
+def run_case(prog_name, case, debug=False, timeout=None, servers=None,
+             memory_limit=None, interpreter="python3", cache=True,
+             judging=None):
+    env = os.environ.copy()
+    if debug:
+        env['DEBUG'] = '1'
+
+    # answer unchanged (source, interpreter, input) from the result cache
+    key = result = None
+    if cache:
+        key = result_cache.result_key(prog_name, interpreter, case["input"],
+                                      timeout=timeout,
+                                      memory_limit=memory_limit,
+                                      debug=debug)
+        result = result_cache.lookup(prog_name, key)
+
+    if result is not None:
+        return judge_result(result, case, memory_limit, judging)
+
+    # keep the whole output in a file and judge it from there; only the
+    # first runner.OUTPUT_PREVIEW bytes are held in memory
+    with tempfile.TemporaryDirectory() as tmp:
+        stdout_path = os.path.join(tmp, "stdout")
+        result = execute_case(prog_name, case, env, timeout, servers,
+                              memory_limit, interpreter, stdout_path)
+        if key is not None and not result["stdout_truncated"]:
+            result_cache.save(prog_name, key, {**result, "cached": True})
+        with open(stdout_path, "rb") as output:
+            return judge_result(result, case, memory_limit, judging,
+                                output=output)
+
+
+def judge_result(result, case, memory_limit=None, judging=None,
+                 output=None):
+    """
+    Add the verdict (TLE, MLE, RE, - for no expected output, AC, WA) to a
+    run_measured() style result. judging: judge.judging_options() for
+    float tolerance or a special judge (exact token comparison if None).
+    output: the whole stdout as a binary file, read token by token instead
+    of result["stdout"] (which may be only a prefix).
+    """
+    stdout = normalize_output(result["stdout"][:OUTPUT_SHOWN])
+    mismatch = None
+    if result["timed_out"]:
+        verdict = "TLE"
+    elif is_mle(result, memory_limit):
+        verdict = "MLE"
+    elif result["returncode"] != 0:
+        verdict = "RE"
+    elif case["expected"] is None:
+        verdict = "-"
+    else:
+        mismatch = check(result["stdout"] if output is None else output,
+                         case["expected"], case["input"], **(judging or {}))
+        verdict = "AC" if mismatch is None else "WA"
+
+    return {**result, "case": case, "output": stdout, "verdict": verdict,
+            "mismatch": mismatch}
+
+
+VERDICT_MARKS = {"AC": "✅", "WA": "❌", "RE": "💥", "TLE": "⏱️", "MLE": "🧠",
+                 "CE": "🔨", "-": "  "}
+
+
+def print_result(result):
+    case = result["case"]
+    index = case["index"]
+    print(f"Input {index}")
+    print(case["input"])
+    print(f"Output {index}")
+    print(result["output"], result["stderr"])
+
+    verdict = result["verdict"]
+    if verdict == "AC":
+        print("✅ OK")
+    elif verdict == "WA":
+        print(f"❌ WA, {describe(result['mismatch'])}")
+        print(f"   expected: {normalize_output(case['expected'])}")
+    elif verdict == "RE":
+        print(f"💥 RE, returncode: {result['returncode']}")
+    elif verdict == "TLE":
+        print(f"⏱️ TLE, killed after {result['wall']:.2f} s")
+    elif verdict == "MLE":
+        print(f"🧠 MLE, max memory {format_mb(result['max_rss_kb'])}")
+    print()
+
+
+def format_ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:.0f} ms"
+
+
+def format_mb(kb):
+    return "-" if kb is None else f"{kb / 1024:.1f} MB"
+
+
+def print_summary(results):
+    print(f"{'#':>3}  {'verdict':<8} {'time':>9} {'cpu':>9} {'memory':>9}")
+    for r in results:
+        mark = VERDICT_MARKS.get(r["verdict"], "")
+        print(f"{r['case']['index']:>3}  {mark} {r['verdict']:<5} "
+              f"{format_ms(r['wall']):>9} {format_ms(r['cpu']):>9} "
+              f"{format_mb(r['max_rss_kb']):>9}"
+              + ("  (cached)" if r.get("cached") else ""))
+
+    judged = [r for r in results if r["verdict"] != "-"]
+    passed = sum(r["verdict"] == "AC" for r in judged)
+    slowest = max((r["wall"] for r in results), default=0)
+    print(f"\n{passed}/{len(judged)} AC, max time {format_ms(slowest)}")
+
+
+def shorten(text, width=30):
+    text = " ".join(text.split())
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+def print_brief(prog_name, results):
+    """
+    One verdict line for the whole file (used by --watch).
+    """
+    judged = [r for r in results if r["verdict"] != "-"]
+    passed = sum(r["verdict"] == "AC" for r in judged)
+    slowest = max((r["wall"] for r in results), default=0)
+    line = f"{Path(prog_name).name}  {passed}/{len(judged)} AC"
+
+    bad = next((r for r in results if r["verdict"] not in ("AC", "-")), None)
+    if bad is None:
+        print(f"✅ {line}  max {format_ms(slowest)}")
+        return
+
+    verdict = bad["verdict"]
+    print(f"{VERDICT_MARKS[verdict]} {line}  "
+          f"#{bad['case']['index']} {verdict}: {verdict_detail(bad)}")
+
+
+def verdict_detail(result):
+    """
+    Why a case failed, short enough for one line.
+    """
+    verdict = result["verdict"]
+    if verdict == "WA":
+        if result.get("mismatch"):
+            return describe(result["mismatch"])
+        return (f"expected {shorten(result['case']['expected'])}, "
+                f"got {shorten(result['output'])}")
+    if verdict == "CE":
+        lines = result["stderr"].strip().splitlines()
+        errors = [line for line in lines if "error" in line] or lines
+        return shorten(errors[0], 60) if errors else "compile error"
+    if verdict == "RE":
+        lines = result["stderr"].strip().splitlines()
+        return shorten(lines[-1], 60) if lines else \
+            f"returncode {result['returncode']}"
+    if verdict == "TLE":
+        return f"killed after {result['wall']:.2f} s"
+    if verdict == "MLE":
+        return f"max memory {format_mb(result['max_rss_kb'])}"
+    return ""
+
+
+def start_fork_servers(n, interpreter="python3"):
+    from forkserver import ForkServer
+
+    servers = queue.Queue()
+    for _ in range(max(n, 1)):
+        servers.put(ForkServer(interpreter))
+    return servers
+
+
+def stop_fork_servers(servers):
+    while not servers.empty():
+        servers.get().close()
+
+
+def run_cases(prog_name, cases, debug=False, jobs=1, timeout=None,
+              servers=None, memory_limit=None, cache=True, brief=False,
+              interpreter="python3", judging=None):
+    results = []
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+        futures = [pool.submit(run_case, prog_name, case, debug, timeout,
+                               servers, memory_limit, interpreter, cache,
+                               judging)
+                   for case in cases]
+        # print in sample order as results arrive
+        for future in futures:
+            result = future.result()
+            if not brief:
+                print_result(result)
+            results.append(result)
+
+    if brief:
+        print_brief(prog_name, results)
+    else:
+        print_summary(results)
+    return results
+
+
+def run_prog_with_data(prog_name, data, debug=False, limit=None, jobs=1,
+                       timeout=None, fork_server=False, memory_limit=None,
+                       cache=True, brief=False, judging=None):
+    cases = parse_cases(data, limit)
+    servers = start_fork_servers(jobs) if fork_server else None
+    try:
+        return run_cases(prog_name, cases, debug, jobs, timeout, servers,
+                         memory_limit, cache, brief, judging=judging)
+    finally:
+        if servers is not None:
+            stop_fork_servers(servers)
+
+
+def contest_dir_of_source(path):
+    """
+    ABC439/src/main/java/abc439/A.java -> ABC439 (the directory of the file
+    for anything else).
+    """
+    path = Path(path).resolve()
+    for parent in path.parents:
+        if parent.name == "java" and parent.parent.name == "main" \
+                and parent.parent.parent.name == "src":
+            return parent.parent.parent.parent
+    return path.parent
+
+
+def load_examples(contest_dir):
+    """
+    Read the samples saved by setup.py (examples/A_1.in, examples/A_1.out)
+    as {"A": [case, ...]}. Inputs without an .out (maxcase.py) are left out.
+    """
+    samples = {}
+    examples = Path(contest_dir) / "examples"
+    if not examples.is_dir():
+        return samples
+    for path in examples.iterdir():
+        m = re.match(r"^([A-Za-z]+)_(\d+)\.in$", path.name)
+        out = path.with_suffix(".out")
+        if not m or not out.exists():
+            continue
+        samples.setdefault(m.group(1), []).append({
+            "index": int(m.group(2)),
+            "input": path.read_text(encoding="utf-8"),
+            "expected": out.read_text(encoding="utf-8").strip(),
+        })
+    for cases in samples.values():
+        cases.sort(key=lambda c: c["index"])
+    return samples
+
+
+def run_java_prog(prog_name, limit=None, jobs=1, timeout=None,
+                  memory_limit=None, cache=True, brief=False, judging=None):
+    """
+    Compile prog_name with javac (cached by source hash) and run the saved
+    samples in persistent JVMs, one per job, instead of through Gradle.
+    """
+    from java_runner import JvmServer, compile_java
+
+    name = Path(prog_name).name
+    cases = load_examples(contest_dir_of_source(prog_name)).get(
+        Path(prog_name).stem, [])
+    cases = [c for c in cases if not limit or c["index"] in limit]
+    if not cases:
+        print(f"no samples for {name} in examples/")
+        return None
+
+    compiled = compile_java(prog_name)
+    if not compiled["ok"]:
+        result = {"verdict": "CE", "stderr": compiled["output"]}
+        if brief:
+            print(f"🔨 {name}  CE: {verdict_detail(result)}")
+        else:
+            print(compiled["output"])
+            print("🔨 CE")
+        return None
+
+    servers = queue.Queue()
+    try:
+        for _ in range(min(max(jobs, 1), len(cases))):
+            servers.put(JvmServer(compiled, memory_limit))
+        return run_cases(prog_name, cases, jobs=jobs, timeout=timeout,
+                         servers=servers, memory_limit=memory_limit,
+                         cache=cache, brief=brief, interpreter="java",
+                         judging=judging)
+    finally:
+        stop_fork_servers(servers)
+
+
+def stress(prog_name, generator, brute, iterations=None, time_budget=None,
+           jobs=1, timeout=None, seed=0, out_dir="stress", judging=None,
+           interpreter="python3"):
+    """
+    Run generator -> brute / prog_name on many random inputs until the
+    outputs differ. The generator gets the seed as its first argument.
+    All three run in fork servers of interpreter.
+    """
+    if iterations is None and time_budget is None:
+        iterations = 1000
+
+    servers = start_fork_servers(jobs, interpreter)
+    seeds = itertools.count(seed)
+    seeds_lock = threading.Lock()
+    stop = threading.Event()
+    done = [0]
+    failure = []
+    started = time.monotonic()
+
+    def next_seed():
+        with seeds_lock:
+            if stop.is_set():
+                return None
+            if iterations is not None and done[0] >= iterations:
+                return None
+            if time_budget is not None and \
+                    time.monotonic() - started >= time_budget:
+                return None
+            done[0] += 1
+            return next(seeds)
+
+    def worker():
+        server = servers.get()
+        try:
+            while (s := next_seed()) is not None:
+                gen = server.run(generator, "", timeout=timeout,
+                                 argv=[str(s)])
+                if gen["returncode"] != 0:
+                    failure.append((s, "generator failed", gen, None, None))
+                    stop.set()
+                    return
+                data = gen["stdout"]
+                want = server.run(brute, data, timeout=timeout)
+                if want["returncode"] != 0 or want["timed_out"]:
+                    failure.append((s, "brute force failed", want, data,
+                                    None))
+                    stop.set()
+                    return
+                got = server.run(prog_name, data, timeout=timeout)
+                if got["timed_out"]:
+                    reason = "TLE"
+                elif got["returncode"] != 0:
+                    reason = "RE"
+                elif (mismatch := check(got["stdout"], want["stdout"], data,
+                                        **(judging or {}))) is not None:
+                    reason = f"WA ({describe(mismatch)})"
+                else:
+                    continue
+                failure.append((s, reason, got, data, want))
+                stop.set()
+                return
+        finally:
+            servers.put(server)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+            for future in [pool.submit(worker) for _ in range(max(jobs, 1))]:
+                future.result()
+    finally:
+        stop_fork_servers(servers)
+
+    elapsed = time.monotonic() - started
+    rate = done[0] / elapsed * 60 if elapsed > 0 else 0
+    print(f"🏃 {done[0]} case(s) in {elapsed:.1f} s ({rate:.0f} cases/min)")
+
+    if not failure:
+        print("✅ no mismatch found")
+        return None
+
+    s, reason, result, data, want = min(failure, key=lambda f: f[0])
+    print(f"❌ {reason} on seed {s}")
+    if data is None:
+        print(result["stderr"])
+        return s
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    stem = Path(prog_name).stem
+    in_path = out / f"{stem}_seed{s}.in"
+    in_path.write_text(data, encoding="utf-8")
+    print(f"📁 input saved to {in_path}")
+    if want is not None:
+        (out / f"{stem}_seed{s}.expected").write_text(
+            want["stdout"], encoding="utf-8")
+        (out / f"{stem}_seed{s}.out").write_text(
+            result["stdout"], encoding="utf-8")
+    if len(data) <= 1000:
+        print("--- input ---")
+        print(data.rstrip("\n"))
+        if want is not None:
+            print("--- expected (brute) ---")
+            print(want["stdout"].rstrip("\n"))
+    print(f"--- {reason}: {stem} ---")
+    print(result["stdout"].rstrip("\n")[:1000], result["stderr"][-1000:])
+    return s
+
+
+# What the language is called in the AtCoder submit form
+def interpreter_language(interpreter):
+    """
+    Return e.g. "Python (CPython 3.11.4)" or "Python (PyPy 3.10-v7.3.12)"
+    for an interpreter command, or None if it is not installed.
+    """
+    if shutil.which(interpreter) is None:
+        return None
+    probe = ("import platform, sys; "
+             "v = getattr(sys, 'pypy_version_info', None); "
+             "print(platform.python_implementation(), "
+             "'%d.%d' % sys.version_info[:2], platform.python_version(), "
+             "'%d.%d.%d' % v[:3] if v else '')")
+    try:
+        out = subprocess.run([interpreter, "-c", probe], capture_output=True,
+                             text=True, timeout=30).stdout.split()
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if len(out) < 3:
+        return None
+    if out[0] == "PyPy" and len(out) >= 4:
+        return f"Python (PyPy {out[1]}-v{out[3]})"
+    return f"Python ({out[0]} {out[2]})"
+
+
+def generated_cases(prog_name):
+    """
+    Inputs written by maxcase.py next to the program
+    (examples/A_max1.in, examples/A_rand1.in, ...). They have no expected
+    output, so they are only timed.
+    """
+    prog = Path(prog_name).resolve()
+    examples = prog.parent / "examples"
+    paths = sorted(examples.glob(f"{prog.stem}_max*.in")) + \
+        sorted(examples.glob(f"{prog.stem}_rand*.in"))
+    return [{"index": p.stem.split("_", 1)[1],
+             "input": p.read_text(encoding="utf-8"),
+             "expected": None} for p in paths]
+
+
+def run_matrix(prog_name, cases, interpreters, debug=False, jobs=1,
+               timeout=None, memory_limit=None, cache=True, judging=None):
+    """
+    Run every case under every interpreter, print the timings side by
+    side and recommend the language to submit under.
+    """
+    languages = {}
+    for interpreter in interpreters:
+        language = interpreter_language(interpreter)
+        if language is None:
+            print(f"⚠️  {interpreter} not found, skipped")
+        else:
+            languages[interpreter] = language
+    interpreters = list(languages)
+    if not interpreters:
+        return None
+
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+        futures = {
+            (interpreter, str(case["index"])): pool.submit(
+                run_case, prog_name, case, debug, timeout, None,
+                memory_limit, interpreter, cache, judging)
+            for case in cases for interpreter in interpreters
+        }
+        results = {key: future.result() for key, future in futures.items()}
+
+    width = max(14, *(len(i) + 2 for i in interpreters))
+    print(f"{'case':<8}" + "".join(f"{i:>{width}}" for i in interpreters))
+    for case in cases:
+        row = f"{str(case['index']):<8}"
+        for interpreter in interpreters:
+            r = results[(interpreter, str(case["index"]))]
+            cell = f"{r['verdict']} {format_ms(r['wall'])}"
+            row += f"{cell:>{width}}"
+        print(row)
+
+    for (interpreter, index), r in results.items():
+        if r["verdict"] in ("WA", "RE"):
+            print(f"\n{VERDICT_MARKS[r['verdict']]} {interpreter}, "
+                  f"case {index}: {r['verdict']}")
+            print(r["output"][:500], r["stderr"][-1000:])
+
+    print()
+    passing = {}
+    name_width = max(len(i) for i in interpreters)
+    for interpreter in interpreters:
+        rs = [results[(interpreter, str(c["index"]))] for c in cases]
+        failed = [r for r in rs if r["verdict"] not in ("AC", "-")]
+        slowest = max((r["wall"] for r in rs), default=0)
+        print(f"{interpreter:<{name_width}}  {languages[interpreter]:<30} "
+              f"{len(rs) - len(failed)}/{len(rs)} ok, "
+              f"max time {format_ms(slowest)}")
+        if not failed:
+            passing[interpreter] = slowest
+
+    if not passing:
+        print("\n❌ no interpreter passes every case")
+        return None
+    # the slowest case decides whether the submission gets TLE
+    best = min(passing, key=passing.get)
+    others = ", ".join(f"{i} {format_ms(t)}" for i, t in passing.items()
+                       if i != best)
+    print(f"\n💡 submit as {languages[best]} "
+          f"(max {format_ms(passing[best])}"
+          + (f" vs {others})" if others else ")"))
+    return best
+
+
+def profile(prog_name, input_data, label, mode=None, lines=False,
+            max_time=None, interval=0.001, interpreter="python3"):
+    """
+    Run prog_name once under profiler.py and print where the time goes.
+    Files are written to profile/<stem>_<label>.* next to the program.
+    """
+    import profiler
+
+    mode = mode or ("sample" if profiler.CAN_SAMPLE else "cprofile")
+    if lines and mode != "sample":
+        print("⚠️  per-line times need the sampling profiler; "
+              "switching to --profiler sample")
+        mode = "sample"
+
+    prog = Path(prog_name).resolve()
+    out_dir = prog.parent / "profile"
+    out_dir.mkdir(exist_ok=True)
+    # examples/A_max1.in -> profile/A_max1.*, sample 1 -> profile/A_sample1.*
+    name = label if label.startswith(f"{prog.stem}_") else \
+        f"{prog.stem}_{label}"
+    out = out_dir / name
+
+    cmd = [interpreter, profiler.__file__, "--mode", mode, "--out", str(out),
+           "--interval", str(interval)]
+    if max_time:
+        cmd += ["--max-time", str(max_time)]
+    cmd.append(str(prog))
+    print(f"🔍 profiling {prog.name} on {label} ({mode}, {interpreter})")
+    result = run_measured(cmd, input_data,
+                          timeout=max_time + 30 if max_time else None)
+    if result["returncode"] != 0:
+        print(result["stderr"][-2000:])
+
+    collapsed = Path(f"{out}.collapsed")
+    if mode == "cprofile":
+        prof = Path(f"{out}.prof")
+        if not prof.exists():
+            print("❌ profiler did not write any stats")
+            return
+        profiler.print_cprofile_report(prof)
+        profiler.write_collapsed(
+            {"stacks": profiler.collapsed_from_cprofile(prof, str(prog))},
+            collapsed)
+        print(f"📁 {prof.relative_to(prog.parent)} "
+              "(open with snakeviz or python -m pstats)")
+        print(f"📁 {collapsed.relative_to(prog.parent)} "
+              "(collapsed stacks in microseconds, approximated from the "
+              "call graph)")
+        return
+
+    raw = Path(f"{out}.json")
+    if not raw.exists():
+        print("❌ profiler did not write any samples")
+        return
+    with open(raw, encoding="utf-8") as f:
+        data = json.load(f)
+    profiler.write_collapsed(data, collapsed)
+    profiler.print_sample_report(data, lines=lines)
+    print(f"\n📁 {collapsed.relative_to(prog.parent)} "
+          "(collapsed stacks for flamegraph.pl or speedscope)")
+
+
+def scaling(prog_name, steps=8, repeat=3, jobs=1, timeout=None,
+            memory_limit=None, seed=0, interpreter="python3"):
+    """
+    Run prog_name on generated inputs (see maxcase.py) whose sizes double
+    up to the constraint maximum, fit the growth of the running time and
+    project it to the maximum size. Returns False if the projection
+    exceeds the time limit.
+    """
+    import complexity
+    from maxcase import MaxCase, parse_input_format
+
+    data = load_problem(prog_name)
+    if not data.get("input_format"):
+        print("⚠️  no input format cached for this problem "
+              "(run setup.py, or setup.py --reparse)")
+        return True
+    spec = parse_input_format(data["input_format"])
+    constraints = data.get("constraints") or {}
+
+    def generate(scale, s):
+        case = MaxCase(spec, constraints, "rand", seed=s, scale=scale)
+        text = "".join(case.generate())
+        return case.n, text
+
+    n_max, _ = generate(1.0, seed)
+    print(f"📈 {prog_name} ({interpreter}): {repeat} run(s) per size, "
+          f"max size n = {n_max}")
+    print(f"{'n':>10} {'median':>9} {'min':>9} {'max':>9}")
+
+    # fit the CPU time: it is less disturbed than the wall time when
+    # --jobs runs the repeats side by side
+    def measure(r):
+        return r["cpu"] if r["cpu"] is not None else r["wall"]
+
+    points = []
+    timed_out_at = None
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+        for k in range(steps):
+            scale = 2.0 ** -(steps - 1 - k)
+            inputs = [generate(scale, seed + r) for r in range(repeat)]
+            n = inputs[0][0]
+            if n <= 0 or (points and n <= points[-1][0]):
+                continue
+            results = list(pool.map(
+                lambda text: run_measured([interpreter, prog_name], text,
+                                          timeout=timeout,
+                                          memory_limit_mb=memory_limit),
+                [text for _, text in inputs],
+            ))
+            times = sorted(measure(r) for r in results)
+            median = times[len(times) // 2]
+            print(f"{n:>10} {format_ms(median):>9} {format_ms(times[0]):>9} "
+                  f"{format_ms(times[-1]):>9}")
+            over = [r for r in results if is_mle(r, memory_limit)]
+            if over:
+                print(f"🧠 MLE at n = {n}, max memory "
+                      f"{format_mb(over[0]['max_rss_kb'])}")
+                return False
+            crashed = [r for r in results
+                       if r["returncode"] != 0 and not r["timed_out"]]
+            if crashed:
+                print(f"💥 RE at n = {n}")
+                print(crashed[0]["stderr"][-1000:])
+                return False
+            if any(r["timed_out"] for r in results):
+                # larger sizes would only time out too; fit what we have
+                print(f"⏱️  TLE at n = {n}, skipping larger sizes")
+                timed_out_at = n
+                break
+            points.append((n, median))
+
+    if len(points) < 3:
+        if timed_out_at is not None:
+            print(f"❌ too slow already at n = {timed_out_at} "
+                  "(try more --steps to start smaller)")
+            return False
+        print("⚠️  too few distinct sizes to estimate the complexity")
+        return True
+
+    fits = complexity.estimate(points)
+    best = fits[0]
+    slope = complexity.loglog_slope(points)
+    print(f"\n🧮 best fit: {best['model']}  "
+          f"(error {best['error'] * 100:.1f}%"
+          + (f", log-log slope {slope:.2f})" if slope is not None else ")"))
+    for other in fits[1:3]:
+        print(f"   then:     {other['model']}  "
+              f"(error {other['error'] * 100:.1f}%)")
+
+    projected = complexity.predict(best, n_max)
+    print(f"🔮 projected at n = {n_max}: {projected:.2f} s", end="")
+    if timed_out_at is not None or \
+            (timeout is not None and projected > timeout):
+        print(f"  ⚠️  exceeds the time limit ({timeout:.2f} s)")
+        return False
+    print(f"  ✅ within the time limit ({timeout:.2f} s)"
+          if timeout is not None else "")
+    return True
+
+
+def watch_target(contest_dir, path):
+    """
+    Map a saved file to ("python" | "java", problem), or None if it has no
+    samples to run.
+    """
+    try:
+        rel = path.resolve().relative_to(contest_dir)
+    except ValueError:
+        return None
+    if len(rel.parts) == 1 and rel.suffix == ".py":
+        try:
+            found = extract_test_data(path) is not None
+        except (OSError, UnicodeDecodeError):
+            found = False
+        return ("python", rel.stem) if found else None
+    if rel.suffix == ".java" and rel.parts[:3] == ("src", "main", "java"):
+        return "java", rel.stem
+    if rel.suffix == ".java" and rel.parts[:3] == ("src", "test", "java") \
+            and rel.stem.endswith("Test"):
+        return "java", rel.stem[:-len("Test")]
+    return None
+
+
+def watch_targets(contest_dir, paths):
+    """
+    Map saved files to the set of targets to re-run. The contest directory
+    itself means the watcher lost events (inotify queue overflow), so every
+    problem with samples is re-run.
+    """
+    if contest_dir in {Path(p).resolve() for p in paths}:
+        paths = [*contest_dir.glob("*.py"),
+                 *(contest_dir / "src" / "main" / "java").glob("**/*.java")]
+    targets = {watch_target(contest_dir, p) for p in paths}
+    targets.discard(None)
+    return targets
+
+
+def watch_command(contest_dir, target, options):
+    lang, problem = target
+    if lang == "python":
+        return [sys.executable, os.path.abspath(__file__), f"{problem}.py",
+                "--brief", *options]
+    source = next((contest_dir / "src" / "main" / "java").glob(
+        f"**/{problem}.java"), None)
+    if source is not None and shutil.which("javac"):
+        # javac + persistent JVM (run_java_prog) is much faster than Gradle
+        return [sys.executable, os.path.abspath(__file__), str(source),
+                "--brief", *options]
+    gradle = "./gradlew" if (contest_dir / "gradlew").exists() else "gradle"
+    return [gradle, "test", "--tests", f"{problem}Test", "--console=plain"]
+
+
+def java_brief(problem, returncode, output):
+    if returncode == 0:
+        return f"✅ {problem}.java  passed"
+    failed = re.findall(r"^\S*Test > (\w+)\S* FAILED", output, re.M)
+    if failed:
+        return f"❌ {problem}.java  failed: {', '.join(failed)}"
+    errors = re.findall(r"^\S+\.java:\d+: error: .*", output, re.M)
+    if errors:
+        return f"💥 {problem}.java  {shorten(errors[0], 80)}"
+    lines = output.strip().splitlines()
+    return f"💥 {problem}.java  {shorten(lines[-1], 80) if lines else ''}"
+
+
+def kill_group(proc):
+    # the check runs in its own session; take gradle / python children too
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def watch(contest_dir, options, debounce=0.1, polling=False):
+    """
+    Re-run the samples of a problem whenever its source is saved, printing
+    one line per run. A newer save of the same problem kills the run that
+    is still in flight.
+    """
+    from watcher import open_watcher, changes
+
+    contest_dir = Path(contest_dir).resolve()
+    watcher = open_watcher(contest_dir, polling=polling)
+    running = {}
+    lock = threading.Lock()
+
+    def report(target, proc, started):
+        output, _ = proc.communicate()
+        with lock:
+            if running.get(target) is not proc:
+                return  # superseded by a newer save
+            del running[target]
+        elapsed = time.perf_counter() - started
+        if proc.args[0] == sys.executable:
+            lines = output.strip().splitlines()
+            line = lines[-1] if lines else \
+                f"💥 {Path(proc.args[2]).name}  exit code {proc.returncode}"
+        else:
+            line = java_brief(target[1], proc.returncode, output)
+        print(f"[{time.strftime('%H:%M:%S')}] {line}  ({elapsed:.2f} s)",
+              flush=True)
+
+    def start(target):
+        with lock:
+            stale = running.pop(target, None)
+            if stale is not None:
+                kill_group(stale)
+            cmd = watch_command(contest_dir, target, options)
+            try:
+                proc = subprocess.Popen(
+                    cmd, cwd=contest_dir, stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                    text=True, start_new_session=True,
+                )
+            except OSError as e:
+                print(f"💥 {cmd[0]}: {e.strerror}", flush=True)
+                return
+            running[target] = proc
+        threading.Thread(target=report,
+                         args=(target, proc, time.perf_counter()),
+                         daemon=True).start()
+
+    print(f"👀 watching {contest_dir.name} ({watcher.method}), "
+          "Ctrl-C to stop", flush=True)
+    try:
+        for paths in changes(watcher, debounce):
+            for target in sorted(watch_targets(contest_dir, paths)):
+                start(target)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        with lock:
+            for proc in running.values():
+                kill_group(proc)
 
 
 if __name__ == "__main__":
@@ -62,14 +919,192 @@ if __name__ == "__main__":
                         help='limit validation sample. --limit 1,2,3')
     parser.add_argument('--debug', action='store_true',
                         help='set DEBUG=1 in subprocess')
-    parser.add_argument('filename', help='target code file')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='run N samples concurrently')
+    parser.add_argument('--timeout', type=float,
+                        help='kill a sample after this many seconds and '
+                             'report TLE (default: the cached time limit '
+                             'times --tl-factor, or 2.0)')
+    parser.add_argument('--tl-factor', type=float,
+                        default=float(os.environ.get('ATCODER_TL_FACTOR',
+                                                     '1.0')),
+                        help='multiply the cached time limit by this '
+                             '(default: $ATCODER_TL_FACTOR or 1.0)')
+    parser.add_argument('--memory-limit', type=int, metavar='MIB',
+                        help='report MLE when the peak RSS of a sample '
+                             'exceeds this (default: the cached memory '
+                             'limit)')
+    parser.add_argument('--fork-server', action='store_true',
+                        help='fork samples from a warm, pre-imported '
+                             'python3 instead of starting one per sample')
+    parser.add_argument('--stress', metavar='GENERATOR',
+                        help='stress test against --brute with random '
+                             'inputs from GENERATOR (gets the seed as argv[1])')
+    parser.add_argument('--brute', metavar='BRUTE',
+                        help='brute-force reference solution for --stress')
+    parser.add_argument('--iterations', '-n', type=int,
+                        help='number of --stress cases (default: 1000)')
+    parser.add_argument('--time-budget', type=float,
+                        help='stop --stress after this many seconds')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='first seed passed to the generator')
+    parser.add_argument('--scaling', action='store_true',
+                        help='run on generated inputs of doubling size, '
+                             'fit the complexity and project the time at '
+                             'the constraint maximum')
+    parser.add_argument('--steps', type=int, default=8,
+                        help='number of sizes for --scaling, each twice '
+                             'the previous one (default: 8)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per size for --scaling (default: 3)')
+    parser.add_argument('--profile', action='store_true',
+                        help='profile one sample (the first of --limit) or '
+                             'the --input file and print the hotspots')
+    parser.add_argument('--profiler', choices=('sample', 'cprofile'),
+                        help='sample: SIGPROF sampling with collapsed '
+                             'stacks (default where available); '
+                             'cprofile: every call via cProfile')
+    parser.add_argument('--profile-lines', action='store_true',
+                        help='also attribute time to lines of the program '
+                             '(implies --profile)')
+    parser.add_argument('--input', metavar='FILE',
+                        help='input for --profile instead of a sample '
+                             '(e.g. examples/A_max1.in)')
+    parser.add_argument('--interpreters', metavar='LIST',
+                        default=os.environ.get('ATCODER_INTERPRETERS'),
+                        help='run the samples and the maxcase.py inputs under '
+                             'each interpreter and compare, e.g. '
+                             'python3,pypy3 (default: $ATCODER_INTERPRETERS); '
+                             '--profile, --scaling and --stress use the '
+                             'first one')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='run every case even if the source, '
+                             'interpreter and input are unchanged')
+    parser.add_argument('--tolerance', type=float, metavar='EPS',
+                        help='accept numbers within this absolute or '
+                             'relative error, e.g. 1e-6 (default: '
+                             '$ATCODER_TOLERANCE or the error bound in the '
+                             'problem statement)')
+    parser.add_argument('--checker', metavar='CHECKER',
+                        help='special judge run as CHECKER input output '
+                             'expected; exit code 0 means AC')
+    parser.add_argument('--brief', action='store_true',
+                        help='print one verdict line instead of every sample')
+    parser.add_argument('--watch', metavar='CONTEST',
+                        help='watch the contest directory and re-run the '
+                             'samples of each problem when its Python or '
+                             'Java source is saved')
+    parser.add_argument('--debounce', type=float, default=0.1,
+                        help='seconds without further writes before --watch '
+                             'runs (default: 0.1)')
+    parser.add_argument('--poll', action='store_true',
+                        help='poll for changes instead of using inotify')
+    parser.add_argument('filename', nargs='?', help='target code file')
 
     args = parser.parse_args()
 
+    if args.watch:
+        if not Path(args.watch).is_dir():
+            parser.error(f'contest directory not found: {args.watch}')
+        # forward the options that change how a Python problem is checked
+        options = ['--jobs', str(args.jobs), '--tl-factor',
+                   str(args.tl_factor)]
+        if args.timeout is not None:
+            options += ['--timeout', str(args.timeout)]
+        if args.memory_limit is not None:
+            options += ['--memory-limit', str(args.memory_limit)]
+        if args.debug:
+            options.append('--debug')
+        if args.no_cache:
+            options.append('--no-cache')
+        if args.tolerance is not None:
+            options += ['--tolerance', str(args.tolerance)]
+        if args.checker:
+            options += ['--checker', str(Path(args.checker).resolve())]
+        watch(args.watch, options, debounce=args.debounce,
+              polling=args.poll)
+        raise SystemExit(0)
+    if args.filename is None:
+        parser.error('the following arguments are required: filename')
+
+    time_limit, memory_limit = load_limits(args.filename)
+    if args.timeout is None:
+        args.timeout = (time_limit or 2.0) * args.tl_factor
+    if args.memory_limit is None:
+        args.memory_limit = memory_limit
+    judging = judging_options(load_problem(args.filename), args.tolerance,
+                              args.checker)
+    interpreters = [i.strip() for i in (args.interpreters or '').split(',')
+                    if i.strip()]
+
+    if args.profile or args.profile_lines:
+        if args.input:
+            label = Path(args.input).stem
+            with open(args.input, encoding='utf-8') as f:
+                input_data = f.read()
+        else:
+            cases = parse_cases(extract_test_data(args.filename) or '',
+                                args.limit)
+            if not cases or not cases[0]["input"].strip():
+                parser.error('no sample to profile (use --input FILE)')
+            label = f'sample{cases[0]["index"]}'
+            input_data = cases[0]["input"]
+        # profiling slows the program down; still stop a runaway one
+        profile(args.filename, input_data, label, mode=args.profiler,
+                lines=args.profile_lines, max_time=args.timeout * 5,
+                interpreter=(interpreters or ['python3'])[0])
+        raise SystemExit(0)
+
+    if args.scaling:
+        ok = scaling(args.filename, steps=args.steps, repeat=args.repeat,
+                     jobs=args.jobs, timeout=args.timeout,
+                     memory_limit=args.memory_limit, seed=args.seed,
+                     interpreter=(interpreters or ['python3'])[0])
+        raise SystemExit(0 if ok else 1)
+
+    if args.stress:
+        if not args.brute:
+            parser.error('--stress requires --brute')
+        failed = stress(args.filename, args.stress, args.brute,
+                        iterations=args.iterations,
+                        time_budget=args.time_budget, jobs=args.jobs,
+                        timeout=args.timeout, seed=args.seed,
+                        judging=judging,
+                        interpreter=(interpreters or ['python3'])[0])
+        raise SystemExit(1 if failed is not None else 0)
+
+    if args.filename.endswith('.java'):
+        results = run_java_prog(args.filename, limit=args.limit,
+                                jobs=args.jobs, timeout=args.timeout,
+                                memory_limit=args.memory_limit,
+                                cache=not args.no_cache, brief=args.brief,
+                                judging=judging)
+        raise SystemExit(0 if results and all(
+            r["verdict"] == "AC" for r in results) else 1)
+
     # filename = sys.argv[1]
     extracted_data = extract_test_data(args.filename)
+    if interpreters:
+        cases = parse_cases(extracted_data or '', args.limit) \
+            if extracted_data is not None else []
+        cases += generated_cases(args.filename)
+        if not cases:
+            parser.error('no samples or generated inputs to run')
+        best = run_matrix(args.filename, cases, interpreters,
+                          debug=args.debug, jobs=args.jobs,
+                          timeout=args.timeout,
+                          memory_limit=args.memory_limit,
+                          cache=not args.no_cache, judging=judging)
+        raise SystemExit(0 if best else 1)
+
     if extracted_data is not None:
         # Use filename as program name
-        run_prog_with_data(args.filename, extracted_data, args.debug)
+        run_prog_with_data(args.filename, extracted_data, args.debug,
+                           limit=args.limit, jobs=args.jobs,
+                           timeout=args.timeout,
+                           fork_server=args.fork_server,
+                           memory_limit=args.memory_limit,
+                           cache=not args.no_cache, brief=args.brief,
+                           judging=judging)
     else:
         print("TEST_DATA not found.")
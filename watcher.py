@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+ディレクトリを監視して、保存されたファイルを通知する（validate.py --watch から使う）
+
+Linux では inotify（ctypes から呼ぶので追加のパッケージは不要）で、
+保存の直後に通知される。inotify が使えない環境ではポーリングになる
+
+    watcher = open_watcher("ABC439")
+    for paths in changes(watcher):
+        print(paths)  # {PosixPath('ABC439/A.py')}
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+# 監視しないディレクトリ（ビルド結果や、大量に書き込まれるもの）
+SKIP_DIRS = {"build", "out", "bin", "__pycache__", "node_modules"}
+
+# inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# 書き終わった・別名から置き換えられた（vim などは一時ファイルを rename する）
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _skip(name: str) -> bool:
+    return name.startswith(".") or name in SKIP_DIRS
+
+
+def _walk_dirs(root: Path):
+    yield root
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not _skip(d))
+        for d in dirnames:
+            yield Path(dirpath) / d
+
+
+# -----------------------------
+# inotify
+# -----------------------------
+
+
+class InotifyWatcher:
+    """
+    root 以下のディレクトリを全て inotify で監視する（新しいディレクトリも追加する）
+    """
+
+    method = "inotify"
+
+    def __init__(self, root):
+        self.root = Path(root)
+        name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(name, use_errno=True)
+        self._libc.inotify_add_watch.argtypes = [
+            ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._dirs: dict[int, Path] = {}
+        self._overflowed = False
+        for d in _walk_dirs(self.root):
+            self._add(d)
+
+    def _add(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(
+            self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            # 監視する前に消えたディレクトリは無視する
+            if err in (errno.ENOENT, errno.ENOTDIR):
+                return
+            raise OSError(err, f"inotify_add_watch {directory}: "
+                               f"{os.strerror(err)}")
+        self._dirs[wd] = directory
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """
+        timeout 秒まで待って、書き込まれたファイルを返す（無ければ空）
+        イベントを取りこぼした（IN_Q_OVERFLOW）場合は root 自体を含める
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        pos = 0
+        while pos + _EVENT.size <= len(buf):
+            wd, mask, _, length = _EVENT.unpack_from(buf, pos)
+            pos += _EVENT.size
+            name = buf[pos:pos + length].rstrip(b"\0")
+            pos += length
+
+            if mask & IN_Q_OVERFLOW:
+                # 取りこぼしたので、呼び出し側に全体の再確認を任せる
+                changed.add(self.root)
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not _skip(path.name):
+                    for d in _walk_dirs(path):
+                        self._add(d)
+                continue
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+# -----------------------------
+# ポーリング
+# -----------------------------
+
+
+class PollingWatcher:
+    """
+    interval 秒ごとに更新時刻とサイズを比べる
+    """
+
+    method = "polling"
+
+    def __init__(self, root, interval: float = 0.2):
+        self.root = Path(root)
+        self.interval = interval
+        self._state = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        state = {}
+        for d in _walk_dirs(self.root):
+            try:
+                entries = list(os.scandir(d))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        st = entry.stat()
+                        state[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+        return state
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            state = self._scan()
+            changed = {p for p, s in state.items()
+                       if self._state.get(p) != s}
+            self._state = state
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval if deadline is None else
+                       max(0.0, min(self.interval,
+                                    deadline - time.monotonic())))
+
+    def close(self) -> None:
+        pass
+
+
+# -----------------------------
+# 共通
+# -----------------------------
+
+
+def open_watcher(root, polling: bool = False):
+    """
+    使えれば inotify、使えなければポーリングで root を監視する
+    """
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            # inotify の上限（max_user_watches）に達した場合など
+            pass
+    return PollingWatcher(root)
+
+
+def changes(watcher, debounce: float = 0.1):
+    """
+    保存されたファイルの集合を yield する
+
+    エディタは 1 回の保存で複数回書き込むことがあるので、
+    debounce 秒間新しい書き込みが無くなるまでまとめる
+    """
+    while True:
+        paths = watcher.wait(None)
+        if not paths:
+            continue
+        while True:
+            more = watcher.wait(debounce)
+            if not more:
+                break
+            paths |= more
+        yield paths